@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the cache of the responses of the http client connection."""
+
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+
+# the header of the responses which tells whether they were served from the cache
+CACHE_RESPONSE_HEADER = "X-Http-Client-Cache"
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+CACHE_REVALIDATED = "REVALIDATED"
+CACHE_COALESCED = "COALESCED"
+
+CACHEABLE_STATUS_CODES = frozenset((200,))
+# the headers of a `304 Not Modified` response which update the cached response
+REFRESHED_HEADERS = ("Cache-Control", "Expires", "Date", "Age", "ETag", "Last-Modified")
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def get_cache_key(url: str, headers: Optional[Dict[str, str]]) -> CacheKey:
+    """Get the key of a request, i.e., its url and its headers, which may change the response."""
+    items = () if headers is None else headers.items()
+    return url, tuple(sorted((name.lower(), value) for name, value in items))
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse the directives of a `Cache-Control` header, e.g., `max-age=60, no-cache`."""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a number of seconds, e.g., of the `max-age` directive or of the `Age` header."""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parse an http date, e.g., of the `Expires` header, to a timestamp."""
+    if value is None:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def get_freshness_lifetime(headers: CIMultiDictProxy) -> Optional[float]:
+    """
+    Get the seconds for which a response can be served from the cache without revalidating it.
+
+    :param headers: the headers of the response.
+    :return: the freshness lifetime, or None if the response does not specify it.
+    """
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0.0
+    lifetime = _parse_seconds(directives.get("max-age"))
+    if lifetime is None:
+        expires = _parse_http_date(headers.get("Expires"))
+        if expires is None:
+            # an invalid `Expires` means that the response is already expired
+            return 0.0 if "Expires" in headers else None
+        date = _parse_http_date(headers.get("Date"))
+        lifetime = max(0.0, expires - (date if date is not None else time.time()))
+    age = _parse_seconds(headers.get("Age")) or 0.0
+    return max(0.0, lifetime - age)
+
+
+class CacheEntry:
+    """A response stored in the cache."""
+
+    def __init__(
+        self,
+        status: int,
+        reason: str,
+        headers: CIMultiDictProxy,
+        body: bytes,
+        freshness_lifetime: float,
+    ) -> None:
+        """Initialize the entry."""
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.expires_at = time.monotonic() + freshness_lifetime
+
+    @property
+    def size(self) -> int:
+        """Get the size of the entry, which is dominated by its body."""
+        return len(self.body)
+
+    @property
+    def is_fresh(self) -> bool:
+        """Check whether the entry can be served without revalidating it."""
+        return time.monotonic() < self.expires_at
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Get the headers which make a request conditional on the entry having changed."""
+        validators = {}
+        if "ETag" in self.headers:
+            validators["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def refresh(self, headers: CIMultiDictProxy) -> None:
+        """Refresh the entry with the headers of a `304 Not Modified` response."""
+        updated = CIMultiDict(self.headers)
+        for name in REFRESHED_HEADERS:
+            if name in headers:
+                updated[name] = headers[name]
+        self.headers = CIMultiDictProxy(updated)
+        self.expires_at = time.monotonic() + (
+            get_freshness_lifetime(self.headers) or 0.0
+        )
+
+    def get_response_headers(self, cache_status: str) -> CIMultiDictProxy:
+        """Get the headers of the entry, along with whether it was served from the cache."""
+        return with_cache_status(self.headers, cache_status)
+
+
+def with_cache_status(headers: CIMultiDictProxy, cache_status: str) -> CIMultiDictProxy:
+    """Add the cache status to the headers of a response."""
+    updated = CIMultiDict(headers)
+    updated[CACHE_RESPONSE_HEADER] = cache_status
+    return CIMultiDictProxy(updated)
+
+
+class ResponseCache:
+    """
+    A size bounded LRU cache of the responses to the GET requests.
+
+    The responses are stored according to their `Cache-Control`, or `Expires`, headers. A response without any
+    freshness information is stored only if it can be revalidated, i.e., it has an `ETag` or a `Last-Modified` header.
+    When the total size of the bodies exceeds `max_size`, the least recently used responses are evicted.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache."""
+        self._max_size = max_size
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_revalidated = 0
+        self.num_coalesced = 0
+        self.num_evicted = 0
+
+    def __len__(self) -> int:
+        """Get the number of the cached responses."""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Get the total size of the cached responses."""
+        return self._size
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of the requests which did not need to download the response."""
+        num_requests = (
+            self.num_hits + self.num_misses + self.num_revalidated + self.num_coalesced
+        )
+        if num_requests == 0:
+            return 0.0
+        num_saved = self.num_hits + self.num_revalidated + self.num_coalesced
+        return num_saved / num_requests
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Get the metrics of the cache."""
+        return {
+            "entries": len(self._entries),
+            "size": self._size,
+            "hits": self.num_hits,
+            "misses": self.num_misses,
+            "revalidated": self.num_revalidated,
+            "coalesced": self.num_coalesced,
+            "evicted": self.num_evicted,
+            "hit_rate": self.hit_rate,
+        }
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Get the cached response of a request, whether it is fresh or not."""
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(
+        self,
+        key: CacheKey,
+        status: int,
+        reason: str,
+        headers: CIMultiDictProxy,
+        body: bytes,
+    ) -> bool:
+        """
+        Store the response of a request, if it is cacheable.
+
+        :param key: the key of the request.
+        :param status: the status code of the response.
+        :param reason: the reason of the response.
+        :param headers: the headers of the response.
+        :param body: the body of the response.
+        :return: whether the response was stored.
+        """
+        self.remove(key)
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if (
+            status not in CACHEABLE_STATUS_CODES
+            or "no-store" in directives
+            or len(body) > self._max_size
+        ):
+            return False
+
+        freshness_lifetime = get_freshness_lifetime(headers)
+        can_revalidate = "ETag" in headers or "Last-Modified" in headers
+        if freshness_lifetime is None and not can_revalidate:
+            return False
+
+        entry = CacheEntry(status, reason, headers, body, freshness_lifetime or 0.0)
+        self._entries[key] = entry
+        self._size += entry.size
+        while self._size > self._max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self.num_evicted += 1
+        return True
+
+    def remove(self, key: CacheKey) -> None:
+        """Remove the cached response of a request, if any."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
@@ -22,13 +22,21 @@
 
 import asyncio
 import email
+import heapq
+import itertools
 import logging
+import os
+import random
 import ssl
+import tempfile
+import time
 from asyncio import CancelledError
 from asyncio.events import AbstractEventLoop
 from asyncio.tasks import Task
+from contextlib import asynccontextmanager
 from traceback import format_exc
-from typing import Any, Optional, Set, Tuple, Union, cast
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union, cast
+from urllib.parse import urlsplit
 
 import aiohttp
 import certifi  # pylint: disable=wrong-import-order
@@ -46,12 +54,23 @@ from aea.exceptions import enforce
 from aea.mail.base import Envelope, Message
 from aea.protocols.dialogue.base import Dialogue as BaseDialogue
 
+from packages.valory.connections.http_client.cache import (
+    CACHE_COALESCED,
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_REVALIDATED,
+    ResponseCache,
+    get_cache_key,
+    parse_cache_control,
+    with_cache_status,
+)
 from packages.valory.protocols.http.dialogues import HttpDialogue as BaseHttpDialogue
 from packages.valory.protocols.http.dialogues import HttpDialogues as BaseHttpDialogues
 from packages.valory.protocols.http.message import HttpMessage
 
 
 SUCCESS = 200
+NOT_MODIFIED = 304
 NOT_FOUND = 404
 REQUEST_TIMEOUT = 408
 SERVER_ERROR = 500
@@ -63,6 +82,200 @@ RequestId = str
 
 ssl_context = ssl.create_default_context(cafile=certifi.where())
 
+DEFAULT_CONNECTOR_LIMIT = 100
+DEFAULT_CONNECTOR_LIMIT_PER_HOST = 0
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+DEFAULT_TTL_DNS_CACHE = 10
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# a request with this header set gets its response body spooled to a file, instead of kept in memory;
+# the header is not sent to the server
+SPOOL_REQUEST_HEADER = "X-Http-Client-Spool"
+# the response header with the path of the file the body was spooled to, the receiver has to remove the file
+BODY_PATH_RESPONSE_HEADER = "X-Http-Client-Body-Path"
+
+
+# the priority of a request, the requests with higher priority are the first to get a free slot of their host;
+# the header is not sent to the server
+PRIORITY_REQUEST_HEADER = "X-Http-Client-Priority"
+CONTROL_REQUEST_HEADERS = (SPOOL_REQUEST_HEADER, PRIORITY_REQUEST_HEADER)
+
+DEFAULT_MAX_CONCURRENT_PER_HOST = 10
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 10.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+# the maximum size of the cached response bodies in bytes, 0 disables the cache
+DEFAULT_CACHE_MAX_SIZE = 0
+
+# the methods which can be retried, since repeating them has the same effect as performing them once
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when the body of a response exceeds the maximum body size."""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is not performed, because the circuit of its host is open."""
+
+
+class CollapsedRequestError(Exception):
+    """Raised when the in-flight request which identical requests were waiting for is cancelled."""
+
+
+def get_backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Get the delay before a retry, using exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * 2**attempt))  # nosec
+
+
+def parse_request_headers(
+    request_http_message: HttpMessage,
+) -> Tuple[Optional[Dict[str, str]], Dict[str, str]]:
+    """
+    Parse the headers of a request.
+
+    :param request_http_message: the request.
+    :return: the headers to send, and the headers which control the connection, by their lowercase name.
+    """
+    if not request_http_message.is_set("headers") or not request_http_message.headers:
+        return None, {}
+    headers = dict(email.message_from_string(request_http_message.headers).items())
+    control_headers = {}
+    for control_header in CONTROL_REQUEST_HEADERS:
+        for name in list(headers.keys()):
+            if name.lower() == control_header.lower():
+                control_headers[control_header.lower()] = headers.pop(name).strip()
+    return headers, control_headers
+
+
+def is_spool_requested(control_headers: Dict[str, str]) -> bool:
+    """Check whether the body of the response to a request is to be spooled to a file."""
+    return control_headers.get(SPOOL_REQUEST_HEADER.lower(), "").lower() in (
+        "1",
+        "true",
+    )
+
+
+class CircuitBreaker:
+    """
+    Fails fast the requests to a host which keeps failing.
+
+    The circuit opens after `failure_threshold` consecutive failures. While it is open, no requests are performed,
+    until `reset_timeout` seconds pass. Then a single trial request is let through: the circuit closes if it succeeds,
+    or opens again if it fails.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._num_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Check whether the circuit is open, i.e., the requests fail fast."""
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        """Check whether a request can be performed."""
+        if self._opened_at is None:
+            return True
+        if self._trial_in_flight:
+            return False
+        if time.monotonic() < self._opened_at + self._reset_timeout:
+            return False
+        # half open, let a single request through to check whether the host has recovered
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self._num_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self._num_failures += 1
+        if self._trial_in_flight or self._num_failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Let another trial request through, since the trial request ended without telling whether the host has recovered."""
+        self._trial_in_flight = False
+
+
+class HostLimiter:
+    """
+    Limits the concurrent requests to each host.
+
+    The requests that find all the slots of their host taken are queued, and are given the freed slots
+    in the order of their priority, and in the order they were queued for the same priority.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the limiter, a limit of 0 means that there is no limit."""
+        self._limit = limit
+        self._active: Dict[str, int] = {}
+        self._waiters: Dict[str, List[Tuple[int, int, asyncio.Future]]] = {}
+        self._counter = itertools.count()
+
+    def num_queued(self, host: str) -> int:
+        """Get the number of the requests that are waiting for a slot of a host."""
+        return len(self._waiters.get(host, []))
+
+    @asynccontextmanager
+    async def slot(self, host: str, priority: int = 0) -> AsyncIterator[None]:
+        """Hold a slot of the host."""
+        await self._acquire(host, priority)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    async def _acquire(self, host: str, priority: int) -> None:
+        """Acquire a slot of the host, waiting for one to be freed if needed."""
+        if self._limit <= 0:
+            return
+        active = self._active.get(host, 0)
+        if active < self._limit and len(self._waiters.get(host, [])) == 0:
+            self._active[host] = active + 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(host, [])
+        heapq.heappush(waiters, (-priority, next(self._counter), future))
+        try:
+            # the slot is handed over by the request which frees it
+            await future
+        except CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed over, but it is not going to be used
+                self._release(host)
+            raise
+
+    def _release(self, host: str) -> None:
+        """Release a slot of the host, handing it over to the next queued request, if any."""
+        if self._limit <= 0:
+            return
+        waiters = self._waiters.get(host, [])
+        while len(waiters) > 0:
+            _, _, future = heapq.heappop(waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._waiters.pop(host, None)
+        self._active[host] -= 1
+        if self._active[host] == 0:
+            del self._active[host]
+
 
 def headers_to_string(headers: CIMultiDictProxy) -> str:
     """
@@ -121,6 +334,20 @@ class HTTPClientAsyncChannel:  # pylint: disable=too-many-instance-attributes
         port: int,
         timeout: int,
         connection_id: PublicId,
+        connector_limit: int = DEFAULT_CONNECTOR_LIMIT,
+        connector_limit_per_host: int = DEFAULT_CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache: Optional[int] = DEFAULT_TTL_DNS_CACHE,
+        max_body_size: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        spool_dir: Optional[str] = None,
+        max_concurrent_per_host: int = DEFAULT_MAX_CONCURRENT_PER_HOST,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
     ):
         """
         Initialize an http client channel.
@@ -128,15 +355,47 @@ class HTTPClientAsyncChannel:  # pylint: disable=too-many-instance-attributes
         :param agent_address: the address of the agent.
         :param address: server hostname / IP address.
         :param port: server port number.
-        :param timeout: the time to wait for a response.
+        :param timeout: the time to wait for the response of each attempt of a request.
         :param connection_id: the id of the connection.
+        :param connector_limit: the maximum number of open connections, 0 for no limit.
+        :param connector_limit_per_host: the maximum number of open connections to the same host, 0 for no limit.
+        :param keepalive_timeout: the seconds an idle connection is kept open to be reused.
+        :param ttl_dns_cache: the seconds the resolved hosts are cached, None to cache them forever.
+        :param max_body_size: the maximum size of a response body in bytes, None for no limit.
+        :param chunk_size: the size of the chunks the response bodies are read in, when they are streamed.
+        :param spool_dir: the directory the response bodies are spooled to, None for the default temp directory.
+        :param max_concurrent_per_host: the maximum number of concurrent requests to the same host, 0 for no limit.
+        :param max_retries: the number of times a failed request with an idempotent method is retried.
+        :param backoff_base: the base delay in seconds between the retries.
+        :param backoff_max: the maximum delay in seconds between the retries.
+        :param failure_threshold: the consecutive failures after which the requests to a host fail fast.
+        :param reset_timeout: the seconds after which a request to a failing host is tried again.
+        :param cache_max_size: the maximum size of the cached responses in bytes, 0 to disable the cache.
         """
         self.agent_address = agent_address
         self.address = address
         self.port = port
         self.timeout = timeout
         self.connection_id = connection_id
+        self.connector_limit = connector_limit
+        self.connector_limit_per_host = connector_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.max_body_size = max_body_size
+        self.chunk_size = chunk_size
+        self.spool_dir = spool_dir
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._host_limiter = HostLimiter(max_concurrent_per_host)
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.cache = ResponseCache(cache_max_size) if cache_max_size > 0 else None
+        self._in_flight: Dict[Any, asyncio.Future] = {}
         self._dialogues = HttpDialogues()
+        # the session is shared by all the requests, so that the connections are kept alive and reused
+        self._session: Optional[aiohttp.ClientSession] = None
 
         self._in_queue = None  # type: Optional[asyncio.Queue]  # pragma: no cover
         self._loop = (
@@ -156,6 +415,16 @@ class HTTPClientAsyncChannel:  # pylint: disable=too-many-instance-attributes
         """
         self._loop = loop
         self._in_queue = asyncio.Queue()
+        connector = aiohttp.TCPConnector(
+            limit=self.connector_limit,
+            limit_per_host=self.connector_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            ssl=ssl_context,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=ClientTimeout(self.timeout)
+        )
         self.is_stopped = False
 
     def _get_message_and_dialogue(
@@ -192,18 +461,16 @@ class HTTPClientAsyncChannel:  # pylint: disable=too-many-instance-attributes
             return
 
         try:
-            resp = await asyncio.wait_for(
-                self._perform_http_request(request_http_message),
-                timeout=self.timeout,
+            # the timeout applies to each attempt, so the retries are not cut short by it
+            status, reason, headers, body = await self._perform_cached_http_request(
+                request_http_message
             )
             envelope = self.to_envelope(
                 request_http_message,
-                status_code=resp.status,
-                headers=resp.headers,
-                status_text=resp.reason,
-                body=resp._body  # pylint: disable=protected-access
-                if resp._body is not None  # pylint: disable=protected-access
-                else b"",
+                status_code=status,
+                headers=headers,
+                status_text=reason,
+                body=body,
                 dialogue=dialogue,
             )
         except Exception:  # pylint: disable=broad-except
@@ -219,40 +486,272 @@ class HTTPClientAsyncChannel:  # pylint: disable=too-many-instance-attributes
         if self._in_queue is not None:
             await self._in_queue.put(envelope)
 
-    async def _perform_http_request(
+    def _get_circuit_breaker(self, host: str) -> CircuitBreaker:
+        """Get the circuit breaker of a host."""
+        if host not in self._circuit_breakers:
+            self._circuit_breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout
+            )
+        return self._circuit_breakers[host]
+
+    async def _perform_cached_http_request(
         self, request_http_message: HttpMessage
-    ) -> ClientResponse:
+    ) -> Tuple[int, Optional[str], CIMultiDictProxy, bytes]:
         """
-        Perform http request and return response.
+        Perform http request, serving it from the cache if possible.
+
+        The GET requests are served from the cache while their response is fresh, and are revalidated once it is stale.
+        Identical GET requests which are sent while the same request is in flight wait for its response.
+        The `X-Http-Client-Cache` header of their response tells how they were served.
+
+        :param request_http_message: HttpMessage with http request constructed.
+
+        :return: the status code, the reason, the headers and the body of the response.
+        """
+        headers, control_headers = parse_request_headers(request_http_message)
+        directives = parse_cache_control((headers or {}).get("Cache-Control"))
+        if (
+            self.cache is None
+            or request_http_message.method.upper() != "GET"
+            or SPOOL_REQUEST_HEADER.lower() in control_headers
+            or "no-store" in directives
+        ):
+            resp, resp_headers, body = await self._perform_http_request_with_retries(
+                request_http_message
+            )
+            return resp.status, resp.reason, resp_headers, body
+
+        key = get_cache_key(request_http_message.url, headers)
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh and "no-cache" not in directives:
+            self.cache.num_hits += 1
+            return (
+                entry.status,
+                entry.reason,
+                entry.get_response_headers(CACHE_HIT),
+                entry.body,
+            )
+
+        in_flight = self._in_flight.get(key, None)
+        if in_flight is not None:
+            self.cache.num_coalesced += 1
+            status, reason, resp_headers, body = await asyncio.shield(in_flight)
+            return (
+                status,
+                reason,
+                with_cache_status(resp_headers, CACHE_COALESCED),
+                body,
+            )
+
+        future = cast(asyncio.AbstractEventLoop, self._loop).create_future()
+        # the waiting requests may have been cancelled, in which case nobody retrieves the error
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            result = await self._revalidate(request_http_message, key)
+            future.set_result(result)
+            return result
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+            raise
+        except CancelledError:
+            future.set_exception(
+                CollapsedRequestError(
+                    f"The request to {request_http_message.url} was cancelled."
+                )
+            )
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _revalidate(
+        self, request_http_message: HttpMessage, key: Any
+    ) -> Tuple[int, Optional[str], CIMultiDictProxy, bytes]:
+        """
+        Perform a GET request, conditional on the cached response having changed, and cache its response.
+
+        :param request_http_message: HttpMessage with http request constructed.
+        :param key: the key of the request in the cache.
+
+        :return: the status code, the reason, the headers and the body of the response.
+        """
+        cache = cast(ResponseCache, self.cache)
+        entry = cache.get(key)
+        validators = entry.validators if entry is not None else {}
+        resp, headers, body = await self._perform_http_request_with_retries(
+            request_http_message, validators
+        )
+        if entry is not None and len(validators) > 0 and resp.status == NOT_MODIFIED:
+            cache.num_revalidated += 1
+            entry.refresh(headers)
+            return (
+                entry.status,
+                entry.reason,
+                entry.get_response_headers(CACHE_REVALIDATED),
+                entry.body,
+            )
+
+        cache.num_misses += 1
+        cache.store(key, resp.status, resp.reason or "", headers, body)
+        return resp.status, resp.reason, with_cache_status(headers, CACHE_MISS), body
+
+    async def _perform_http_request_with_retries(
+        self,
+        request_http_message: HttpMessage,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[ClientResponse, CIMultiDictProxy, bytes]:
+        """
+        Perform http request, retrying it if it fails and its method is idempotent.
+
+        The request waits for a free slot of its host, and fails fast if the host keeps failing.
+        Each attempt is given `timeout` seconds, and a timed out attempt is retried like a failed one.
 
         :param request_http_message: HttpMessage with http request constructed.
+        :param extra_headers: the headers to send along with the ones of the request.
 
-        :return: aiohttp.ClientResponse
+        :return: the aiohttp.ClientResponse, along with the headers and the body of the response.
         """
+        host = urlsplit(request_http_message.url).hostname or ""
+        _, control_headers = parse_request_headers(request_http_message)
         try:
-            if request_http_message.is_set("headers") and request_http_message.headers:
-                headers: Optional[dict] = dict(
-                    email.message_from_string(request_http_message.headers).items()
+            priority = int(control_headers.get(PRIORITY_REQUEST_HEADER.lower(), 0))
+        except ValueError:
+            priority = 0
+        is_idempotent = request_http_message.method.upper() in IDEMPOTENT_METHODS
+        max_attempts = self.max_retries + 1 if is_idempotent else 1
+        circuit_breaker = self._get_circuit_breaker(host)
+
+        for attempt in range(max_attempts):
+            if not circuit_breaker.allow_request():
+                raise CircuitOpenError(
+                    f"The requests to {host} fail fast, since it has failed {self.failure_threshold} times in a row."
                 )
+            is_last_attempt = attempt + 1 == max_attempts
+            try:
+                async with self._host_limiter.slot(host, priority):
+                    resp, headers, body = await asyncio.wait_for(
+                        self._perform_http_request(request_http_message, extra_headers),
+                        timeout=self.timeout,
+                    )
+            except RETRY_EXCEPTIONS:
+                circuit_breaker.record_failure()
+                if is_last_attempt:
+                    raise
+            except BaseException:
+                # e.g., the body is too large, or the request is cancelled, which says nothing about the host
+                circuit_breaker.release_trial()
+                raise
             else:
-                headers = None
-            session_timeout = ClientTimeout(self.timeout)
-            async with aiohttp.ClientSession(timeout=session_timeout) as session:
-                async with session.request(
-                    method=request_http_message.method,
-                    url=request_http_message.url,
-                    headers=headers,
-                    data=request_http_message.body,
-                    ssl=ssl_context,
-                ) as resp:
+                if resp.status < SERVER_ERROR:
+                    circuit_breaker.record_success()
+                else:
+                    circuit_breaker.record_failure()
+                if is_last_attempt or resp.status not in RETRY_STATUS_CODES:
+                    return resp, headers, body
+                if is_spool_requested(control_headers):
+                    # the response is discarded, along with the file its body was spooled to
+                    os.remove(headers[BODY_PATH_RESPONSE_HEADER])
+
+            delay = get_backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            self.logger.debug(
+                f"Retrying {request_http_message.method} {request_http_message.url} in {delay:.2f}s."
+            )
+            await asyncio.sleep(delay)
+
+        raise ValueError("Unreachable")  # pragma: nocover
+
+    async def _perform_http_request(
+        self,
+        request_http_message: HttpMessage,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[ClientResponse, CIMultiDictProxy, bytes]:
+        """
+        Perform http request and return response.
+
+        :param request_http_message: HttpMessage with http request constructed.
+        :param extra_headers: the headers to send along with the ones of the request.
+
+        :return: the aiohttp.ClientResponse, along with the headers and the body of the response.
+        """
+        try:
+            headers, control_headers = parse_request_headers(request_http_message)
+            spool = is_spool_requested(control_headers)
+            if extra_headers:
+                headers = {**(headers or {}), **extra_headers}
+            if self._session is None:  # pragma: nocover
+                raise ValueError("Channel is not connected")
+            async with self._session.request(
+                method=request_http_message.method,
+                url=request_http_message.url,
+                headers=headers,
+                data=request_http_message.body,
+                ssl=ssl_context,
+            ) as resp:
+                if not spool and self.max_body_size is None:
                     await resp.read()
-                return resp
+                    body = resp._body  # pylint: disable=protected-access
+                    return resp, resp.headers, body if body is not None else b""
+                return await self._stream_body(resp, spool)
         except Exception as e:  # pragma: nocover # pylint: disable=broad-except
             self.logger.debug(
                 f"Exception raised during http call: {request_http_message.method} {request_http_message.url}, {e}"
             )
             raise
 
+    async def _stream_body(
+        self, resp: ClientResponse, spool: bool
+    ) -> Tuple[ClientResponse, CIMultiDictProxy, bytes]:
+        """
+        Read the body of a response in chunks, aborting as soon as it exceeds the maximum body size.
+
+        :param resp: the response.
+        :param spool: whether to write the body to a file, instead of keeping it in memory.
+
+        :return: the response, along with its headers and body. The body of a spooled response is empty,
+            and its path is in the `X-Http-Client-Body-Path` header.
+        """
+        if (
+            self.max_body_size is not None
+            and resp.content_length is not None
+            and resp.content_length > self.max_body_size
+        ):
+            raise ResponseTooLargeError(
+                f"The response body of {resp.content_length} bytes exceeds the maximum of {self.max_body_size} bytes."
+            )
+
+        spool_file = (
+            tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+                dir=self.spool_dir, prefix="http_client_", delete=False
+            )
+            if spool
+            else None
+        )
+        chunks, size = [], 0
+        try:
+            async for chunk in resp.content.iter_chunked(self.chunk_size):
+                size += len(chunk)
+                if self.max_body_size is not None and size > self.max_body_size:
+                    raise ResponseTooLargeError(
+                        f"The response body exceeds the maximum of {self.max_body_size} bytes."
+                    )
+                if spool_file is None:
+                    chunks.append(chunk)
+                else:
+                    spool_file.write(chunk)
+        except BaseException:
+            if spool_file is not None:
+                spool_file.close()
+                os.remove(spool_file.name)
+            raise
+
+        if spool_file is None:
+            return resp, resp.headers, b"".join(chunks)
+
+        spool_file.close()
+        headers = CIMultiDict(resp.headers)
+        headers[BODY_PATH_RESPONSE_HEADER] = spool_file.name
+        return resp, CIMultiDictProxy(headers), b""
+
     def send(self, request_envelope: Envelope) -> None:
         """
         Send an envelope with http request data to request.
@@ -374,6 +873,11 @@ class HTTPClientAsyncChannel:  # pylint: disable=too-many-instance-attributes
             self.is_stopped = True
 
             await self._cancel_tasks()
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+            if self.cache is not None:
+                self.logger.info(f"HTTP Client cache stats: {self.cache.stats}")
 
 
 class HTTPClientConnection(Connection):
@@ -394,12 +898,35 @@ class HTTPClientConnection(Connection):
         timeout = int(self.configuration.config.get("timeout", self.DEFAULT_TIMEOUT))
         if host is None or port is None:  # pragma: nocover
             raise ValueError("host and port must be set!")
+        config = self.configuration.config
         self.channel = HTTPClientAsyncChannel(
             self.address,
             host,
             port,
             timeout,
             connection_id=self.connection_id,
+            connector_limit=int(config.get("connector_limit", DEFAULT_CONNECTOR_LIMIT)),
+            connector_limit_per_host=int(
+                config.get("connector_limit_per_host", DEFAULT_CONNECTOR_LIMIT_PER_HOST)
+            ),
+            keepalive_timeout=float(
+                config.get("keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT)
+            ),
+            ttl_dns_cache=config.get("ttl_dns_cache", DEFAULT_TTL_DNS_CACHE),
+            max_body_size=config.get("max_body_size", None),
+            chunk_size=int(config.get("chunk_size", DEFAULT_CHUNK_SIZE)),
+            spool_dir=config.get("spool_dir", None),
+            max_concurrent_per_host=int(
+                config.get("max_concurrent_per_host", DEFAULT_MAX_CONCURRENT_PER_HOST)
+            ),
+            max_retries=int(config.get("max_retries", DEFAULT_MAX_RETRIES)),
+            backoff_base=float(config.get("backoff_base", DEFAULT_BACKOFF_BASE)),
+            backoff_max=float(config.get("backoff_max", DEFAULT_BACKOFF_MAX)),
+            failure_threshold=int(
+                config.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD)
+            ),
+            reset_timeout=float(config.get("reset_timeout", DEFAULT_RESET_TIMEOUT)),
+            cache_max_size=int(config.get("cache_max_size", DEFAULT_CACHE_MAX_SIZE)),
         )
 
     async def connect(self) -> None:
@@ -21,9 +21,12 @@
 # pylint: skip-file
 
 import asyncio
+import email
 import logging
+import os
+import tempfile
 from asyncio import CancelledError
-from typing import Any, cast
+from typing import Any, AsyncIterator, List, cast
 from unittest.mock import MagicMock, Mock, patch
 
 import aiohttp
@@ -37,8 +40,22 @@ from aea.protocols.dialogue.base import Dialogue as BaseDialogue
 from aea.test_tools.constants import UNKNOWN_PROTOCOL_PUBLIC_ID
 from aea.test_tools.mocks import AnyStringWith
 from aea.test_tools.network import get_host, get_unused_tcp_port
-
-from packages.valory.connections.http_client.connection import HTTPClientConnection
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from packages.valory.connections.http_client.cache import (
+    CACHE_RESPONSE_HEADER,
+    ResponseCache,
+    get_cache_key,
+)
+from packages.valory.connections.http_client.connection import (
+    BODY_PATH_RESPONSE_HEADER,
+    CircuitBreaker,
+    DEFAULT_CONNECTOR_LIMIT,
+    DEFAULT_CONNECTOR_LIMIT_PER_HOST,
+    HTTPClientConnection,
+    HostLimiter,
+    SPOOL_REQUEST_HEADER,
+)
 from packages.valory.protocols.http.dialogues import HttpDialogue
 from packages.valory.protocols.http.dialogues import HttpDialogues as BaseHttpDialogues
 from packages.valory.protocols.http.message import HttpMessage
@@ -137,6 +154,20 @@ class TestHTTPClientConnect:
         await self.http_client_connection.disconnect()
         assert self.http_client_connection.is_connected is False
 
+    @pytest.mark.asyncio
+    async def test_session_pooled(self) -> None:
+        """Test the session is created on connect and closed on disconnect."""
+        await self.http_client_connection.connect()
+        session = self.http_client_connection.channel._session
+        assert session is not None and not session.closed
+        connector = cast(aiohttp.TCPConnector, session.connector)
+        assert connector.limit == DEFAULT_CONNECTOR_LIMIT
+        assert connector.limit_per_host == DEFAULT_CONNECTOR_LIMIT_PER_HOST
+
+        await self.http_client_connection.disconnect()
+        assert session.closed
+        assert self.http_client_connection.channel._session is None
+
     @pytest.mark.asyncio
     async def test_http_send_error(self) -> None:
         """Test request fails and send back result with code 600."""
@@ -360,3 +391,352 @@ class TestHTTPClientConnect:
         message = cast(HttpMessage, envelope.message)
         assert message.performative == HttpMessage.Performative.RESPONSE
         assert b"expected exception" in message.body
+
+    def _make_request_envelope(self, headers: str = "") -> Envelope:
+        """Make a request envelope."""
+        request_http_message, _ = self.http_dialogs.create(
+            counterparty=self.connection_address,
+            performative=HttpMessage.Performative.REQUEST,  # type: ignore
+            method="get",
+            url="https://not-a-google.com",
+            headers=headers,
+            version="",
+            body=b"",
+        )
+        return Envelope(
+            to=self.connection_address,
+            sender=self.client_skill_id,
+            message=request_http_message,
+        )
+
+    @staticmethod
+    def _make_streamed_response_mock(chunks: List[bytes]) -> Mock:
+        """Make a response mock, whose body is streamed in the given chunks."""
+
+        async def iter_chunked(_: int) -> AsyncIterator[bytes]:
+            for chunk in chunks:
+                yield chunk
+
+        response_mock = Mock()
+        response_mock.status = 200
+        response_mock.headers = CIMultiDictProxy(CIMultiDict({"a": "b"}))
+        response_mock.reason = "OK"
+        response_mock.content_length = None
+        response_mock.content.iter_chunked = iter_chunked
+        return response_mock
+
+    @pytest.mark.asyncio
+    async def test_http_send_body_too_large(self) -> None:
+        """Test a response whose body exceeds the maximum body size is aborted."""
+        await self.http_client_connection.connect()
+        self.http_client_connection.channel.max_body_size = 10
+        response_mock = self._make_streamed_response_mock([b"x" * 8, b"x" * 8])
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            return_value=_MockRequest(response_mock),
+        ):
+            await self.http_client_connection.send(
+                envelope=self._make_request_envelope()
+            )
+            envelope = await asyncio.wait_for(
+                self.http_client_connection.receive(), timeout=10
+            )
+
+        message = cast(HttpMessage, envelope.message)
+        assert message.status_code == 600
+        assert b"ResponseTooLargeError" in message.body
+        await self.http_client_connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_http_send_spooled(self) -> None:
+        """Test the body of a response is spooled to a file, when requested."""
+        await self.http_client_connection.connect()
+        response_mock = self._make_streamed_response_mock([b"x" * 8, b"y" * 8])
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            return_value=_MockRequest(response_mock),
+        ) as request_mock:
+            await self.http_client_connection.send(
+                envelope=self._make_request_envelope(f"{SPOOL_REQUEST_HEADER}: true")
+            )
+            envelope = await asyncio.wait_for(
+                self.http_client_connection.receive(), timeout=10
+            )
+
+        assert SPOOL_REQUEST_HEADER not in request_mock.call_args.kwargs["headers"]
+        message = cast(HttpMessage, envelope.message)
+        assert message.status_code == 200
+        assert message.body == b""
+        headers = email.message_from_string(message.headers)
+        body_path = headers[BODY_PATH_RESPONSE_HEADER]
+        with open(body_path, "rb") as body_file:
+            assert body_file.read() == b"x" * 8 + b"y" * 8
+        os.remove(body_path)
+        await self.http_client_connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_http_send_retried(self) -> None:
+        """Test an idempotent request is retried when the connection fails."""
+        await self.http_client_connection.connect()
+        self.http_client_connection.channel.backoff_base = 0.0
+        response_mock = Mock()
+        response_mock.status = 200
+        response_mock.headers = CIMultiDictProxy(CIMultiDict({"a": "b"}))
+        response_mock.reason = "OK"
+        response_mock._body = b"Some content"
+        response_mock.read.return_value = asyncio.Future()
+        response_mock.read.return_value.set_result("")
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            side_effect=[
+                aiohttp.ClientConnectionError("expected exception"),
+                _MockRequest(response_mock),
+            ],
+        ) as request_mock:
+            await self.http_client_connection.send(
+                envelope=self._make_request_envelope()
+            )
+            envelope = await asyncio.wait_for(
+                self.http_client_connection.receive(), timeout=10
+            )
+
+        assert request_mock.call_count == 2
+        message = cast(HttpMessage, envelope.message)
+        assert message.status_code == 200
+        assert message.body == b"Some content"
+        await self.http_client_connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_http_send_circuit_open(self) -> None:
+        """Test the requests to a host which keeps failing fail fast."""
+        await self.http_client_connection.connect()
+        channel = self.http_client_connection.channel
+        channel.max_retries = 0
+        channel.failure_threshold = 1
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            side_effect=aiohttp.ClientConnectionError("expected exception"),
+        ) as request_mock:
+            for _ in range(2):
+                await self.http_client_connection.send(
+                    envelope=self._make_request_envelope()
+                )
+                envelope = await asyncio.wait_for(
+                    self.http_client_connection.receive(), timeout=10
+                )
+
+        assert request_mock.call_count == 1
+        message = cast(HttpMessage, envelope.message)
+        assert message.status_code == 600
+        assert b"CircuitOpenError" in message.body
+        await self.http_client_connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_http_send_circuit_trial_released(self) -> None:
+        """Test a trial request which fails without telling whether the host has recovered does not keep the circuit open."""
+        await self.http_client_connection.connect()
+        channel = self.http_client_connection.channel
+        channel.max_retries = 0
+        channel.failure_threshold = 1
+        channel.reset_timeout = 0.0
+        channel.max_body_size = 10
+        too_large_response_mock = self._make_streamed_response_mock([b"x" * 16])
+        response_mock = self._make_streamed_response_mock([b"x" * 8])
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            side_effect=[
+                aiohttp.ClientConnectionError("expected exception"),
+                _MockRequest(too_large_response_mock),
+                _MockRequest(response_mock),
+            ],
+        ) as request_mock:
+            messages = [await self._send_and_receive() for _ in range(3)]
+
+        assert request_mock.call_count == 3
+        assert [message.status_code for message in messages] == [600, 600, 200]
+        assert b"ResponseTooLargeError" in messages[1].body
+        await self.http_client_connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_http_send_spooled_retried(self) -> None:
+        """Test the spooled body of a response which is retried is removed."""
+        await self.http_client_connection.connect()
+        channel = self.http_client_connection.channel
+        channel.backoff_base = 0.0
+        unavailable_response_mock = self._make_streamed_response_mock([b"x" * 8])
+        unavailable_response_mock.status = 503
+        response_mock = self._make_streamed_response_mock([b"y" * 8])
+
+        with tempfile.TemporaryDirectory() as spool_dir, patch.object(
+            aiohttp.ClientSession,
+            "request",
+            side_effect=[
+                _MockRequest(unavailable_response_mock),
+                _MockRequest(response_mock),
+            ],
+        ):
+            channel.spool_dir = spool_dir
+            await self.http_client_connection.send(
+                envelope=self._make_request_envelope(f"{SPOOL_REQUEST_HEADER}: true")
+            )
+            envelope = await asyncio.wait_for(
+                self.http_client_connection.receive(), timeout=10
+            )
+            message = cast(HttpMessage, envelope.message)
+            body_path = email.message_from_string(message.headers)[
+                BODY_PATH_RESPONSE_HEADER
+            ]
+            assert message.status_code == 200
+            assert os.listdir(spool_dir) == [os.path.basename(body_path)]
+
+        await self.http_client_connection.disconnect()
+
+    @staticmethod
+    def _make_cacheable_response_mock(status: int, headers: dict) -> Mock:
+        """Make a response mock, with the given status and headers."""
+        response_mock = Mock()
+        response_mock.status = status
+        response_mock.headers = CIMultiDictProxy(CIMultiDict(headers))
+        response_mock.reason = "OK"
+        response_mock._body = b"Some content" if status == 200 else b""
+        response_mock.read.return_value = asyncio.Future()
+        response_mock.read.return_value.set_result("")
+        return response_mock
+
+    async def _send_and_receive(self) -> HttpMessage:
+        """Send a GET request and receive its response."""
+        await self.http_client_connection.send(envelope=self._make_request_envelope())
+        envelope = await asyncio.wait_for(
+            self.http_client_connection.receive(), timeout=10
+        )
+        return cast(HttpMessage, envelope.message)
+
+    @pytest.mark.asyncio
+    async def test_http_send_cached(self) -> None:
+        """Test a fresh response is served from the cache."""
+        await self.http_client_connection.connect()
+        channel = self.http_client_connection.channel
+        channel.cache = ResponseCache(max_size=1024)
+        response_mock = self._make_cacheable_response_mock(
+            200, {"Cache-Control": "max-age=60"}
+        )
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            return_value=_MockRequest(response_mock),
+        ) as request_mock:
+            messages = [await self._send_and_receive() for _ in range(2)]
+
+        assert request_mock.call_count == 1
+        assert [message.body for message in messages] == [b"Some content"] * 2
+        cache_statuses = [
+            email.message_from_string(message.headers)[CACHE_RESPONSE_HEADER]
+            for message in messages
+        ]
+        assert cache_statuses == ["MISS", "HIT"]
+        assert channel.cache.hit_rate == 0.5
+        await self.http_client_connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_http_send_revalidated(self) -> None:
+        """Test a stale response is revalidated with its ETag."""
+        await self.http_client_connection.connect()
+        channel = self.http_client_connection.channel
+        channel.cache = ResponseCache(max_size=1024)
+        responses = [
+            _MockRequest(self._make_cacheable_response_mock(200, {"ETag": '"v1"'})),
+            _MockRequest(self._make_cacheable_response_mock(304, {"ETag": '"v1"'})),
+        ]
+
+        with patch.object(
+            aiohttp.ClientSession,
+            "request",
+            side_effect=responses,
+        ) as request_mock:
+            messages = [await self._send_and_receive() for _ in range(2)]
+
+        assert request_mock.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert messages[1].status_code == 200
+        assert messages[1].body == b"Some content"
+        assert channel.cache.num_revalidated == 1
+        await self.http_client_connection.disconnect()
+
+
+def test_response_cache_lru() -> None:
+    """Test the least recently used responses are evicted when the cache is full."""
+    cache = ResponseCache(max_size=20)
+    headers = CIMultiDictProxy(CIMultiDict({"Cache-Control": "max-age=60"}))
+    keys = [get_cache_key(f"https://host/{i}", None) for i in range(3)]
+    assert cache.store(keys[0], 200, "OK", headers, b"x" * 8)
+    assert cache.store(keys[1], 200, "OK", headers, b"x" * 8)
+    assert cache.get(keys[0]) is not None
+    assert cache.store(keys[2], 200, "OK", headers, b"x" * 8)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.size == 16 and cache.num_evicted == 1
+
+    no_store = CIMultiDictProxy(CIMultiDict({"Cache-Control": "no-store"}))
+    assert not cache.store(keys[1], 200, "OK", no_store, b"x")
+    assert not cache.store(keys[1], 200, "OK", CIMultiDictProxy(CIMultiDict()), b"x")
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_priority() -> None:
+    """Test the freed slots of a host are given to the queued requests by priority."""
+    limiter = HostLimiter(limit=1)
+    order: List[str] = []
+    release = asyncio.Event()
+
+    async def request(name: str, host: str, priority: int) -> None:
+        async with limiter.slot(host, priority):
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.ensure_future(request("first", "a", 0))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.ensure_future(request(name, "a", priority))
+        for name, priority in (("low", 0), ("high", 5), ("mid", 1))
+    ]
+    other_host = asyncio.ensure_future(request("other host", "b", 0))
+    await asyncio.sleep(0)
+    assert order == ["first", "other host"]
+    assert limiter.num_queued("a") == 3
+
+    release.set()
+    await asyncio.gather(first, other_host, *queued)
+    assert order == ["first", "other host", "high", "mid", "low"]
+    assert limiter.num_queued("a") == 0
+
+
+def test_circuit_breaker() -> None:
+    """Test the circuit breaker opens, and lets a single trial request through after the reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow_request()
+
+    with patch("time.monotonic", return_value=1e12):
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        # the trial ended without a response, so another one is let through
+        breaker.release_trial()
+        assert breaker.is_open
+        assert breaker.allow_request()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow_request()
@@ -21,11 +21,12 @@
 """Websocket client connection."""
 
 import asyncio
+import json
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, Optional, cast
+import random
+from typing import Any, Callable, Dict, Optional, Tuple, cast
 
-import websocket
+import aiohttp
 from aea.configurations.base import PublicId
 from aea.connections.base import Connection, ConnectionStates
 from aea.mail.base import Envelope
@@ -42,6 +43,15 @@ from packages.valory.protocols.websocket_client.message import WebsocketClientMe
 PUBLIC_ID = PublicId.from_str("valory/websocket_client:0.1.0")
 
 DEFAULT_MAX_RETRIES = 5
+DEFAULT_PING_INTERVAL = 20.0  # seconds
+DEFAULT_BACKOFF_BASE = 1.0  # seconds
+DEFAULT_BACKOFF_MAX = 60.0  # seconds
+DEFAULT_QUEUE_SIZE = 1000
+
+
+def get_backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Get the delay before the next attempt, using exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * 2**attempt))  # nosec
 
 
 class WebsocketClientDialogues(BaseWebsocketClientDialogues):
@@ -74,35 +84,36 @@ class WebsocketClientDialogues(BaseWebsocketClientDialogues):
 
 
 class WebsocketSubcription:
-    """Websocket subscription."""
+    """
+    Websocket subscription.
 
-    _wss: websocket.WebSocket
-    _outbox: Optional[asyncio.Queue]
-    _envelope: Envelope
-    _dialogue: WebsocketClientDialogue
+    A subscription is a logical stream on the websocket of its URL, which it may share with other subscriptions.
+    """
 
     def __init__(
         self,
         subscription_id: str,
+        url: str,
         outbox: asyncio.Queue,
         to: str,
         sender: str,
         logger: Optional[logging.Logger] = None,
-        loop: Optional[asyncio.AbstractEventLoop] = None,
-        executor: Optional[ThreadPoolExecutor] = None,
     ) -> None:
         """Create a websocket subscription."""
 
         self._id = subscription_id
-        self._url = None
+        self._url = url
         self._status = ConnectionStates.disconnected
+        self._connection: Optional["WebsocketConnection"] = None
 
         self._to = to
         self._sender = sender
 
         self._outbox = outbox
-        self._executor = executor or ThreadPoolExecutor()
-        self._loop = loop or asyncio.get_running_loop()
+        # the notifications that were dropped because the outbox was full,
+        # and the notification of the agent about the latest drops, until it is in the outbox
+        self.num_dropped = 0
+        self._drop_notification: Optional[asyncio.Task] = None
 
         self.logger = logger or logging.getLogger()
 
@@ -114,8 +125,6 @@ class WebsocketSubcription:
     @property
     def url(self) -> str:
         """Returns the URL"""
-        if self._url is None:
-            raise ValueError(f"URL not set for websocket subscription {self.id}")
         return self._url
 
     @property
@@ -123,81 +132,327 @@ class WebsocketSubcription:
         """Current status of the subscription."""
         return self._status
 
-    def send(self, payload: str) -> int:
-        """Send and return send length."""
+    def attach(self, connection: "WebsocketConnection") -> None:
+        """Attach the subscription to the websocket of its URL."""
+        self._connection = connection
+        self._status = connection.status
 
-        try:
-            return self._wss.send(payload=payload)
-        except websocket.WebSocketConnectionClosedException:
+    def detach(self) -> None:
+        """Detach the subscription from its websocket."""
+        self._connection = None
+        self._status = ConnectionStates.disconnected
+        if self._drop_notification is not None:
+            # the agent subscribes again, and recovers the dropped notifications along with the missed ones
+            self._drop_notification.cancel()
+
+    async def send(self, payload: str) -> int:
+        """Send and return send length."""
+        if self._connection is None:
             self._status = ConnectionStates.disconnected
             return -1
+        return await self._connection.send(self, payload)
 
-    async def recv(self) -> None:
-        """Run recv loop."""
-        while self.status == ConnectionStates.connected:
-            try:
-                data = await self._loop.run_in_executor(
-                    self._executor,
-                    self._wss.recv,
+    async def receive(self, data: str, is_notification: bool = False) -> None:
+        """
+        Forward data received from the websocket to the agent.
+
+        The responses, and anything else that the agent cannot recover, wait for room in the outbox.
+        The notifications are dropped when the outbox is full instead, so that a slow agent does not stall the reading,
+        and with it the keepalive of the websocket and the other subscriptions which share it.
+        The agent is then notified about the drops with an error, once there is room for it,
+        so that it recovers the dropped notifications, e.g., by polling.
+
+        :param data: the received data.
+        :param is_notification: whether the data is a notification of the subscription.
+        """
+        message = WebsocketClientMessage(
+            performative=WebsocketClientMessage.Performative.RECV,
+            subscription_id=self.id,
+            data=data,
+        )
+        if not is_notification:
+            await self._put(message)
+            return
+        try:
+            self._outbox.put_nowait(self._to_envelope(message))
+        except asyncio.QueueFull:
+            self.num_dropped += 1
+            if self._drop_notification is None:
+                self.logger.warning(
+                    f"The outbox is full, dropping the notifications of the subscription {self.id}; "
+                    f"dropped so far: {self.num_dropped}"
                 )
-                message = WebsocketClientMessage(
-                    performative=WebsocketClientMessage.Performative.RECV,
-                    subscription_id=self.id,
-                    data=data,
+                self._drop_notification = asyncio.get_running_loop().create_task(
+                    self._notify_dropped()
                 )
-            except (websocket.WebSocketConnectionClosedException, OSError) as e:
-                self._status = ConnectionStates.disconnected
-                message = WebsocketClientMessage(
+
+    async def _notify_dropped(self) -> None:
+        """Notify the agent that notifications of the subscription have been dropped."""
+        try:
+            await self._put(
+                WebsocketClientMessage(
                     performative=WebsocketClientMessage.Performative.ERROR,
-                    message=f"Websocket connection disconnected with error {e}",
+                    message=f"The outbox was full, notifications of the subscription {self.id} have been dropped",
                     subscription_id=self.id,
-                    alive=False,
-                )
-
-            await self._outbox.put(
-                Envelope(
-                    to=self._to,  # self._envelope.sender,
-                    sender=self._sender,  # self._envelope.to,
-                    message=message,
+                    alive=True,
                 )
             )
+        finally:
+            # the notifications which are dropped from now on are notified again
+            self._drop_notification = None
+
+    async def disconnected(self, error: str) -> None:
+        """Notify the agent that the websocket of the subscription was disconnected."""
+        self.detach()
+        await self._put(
+            WebsocketClientMessage(
+                performative=WebsocketClientMessage.Performative.ERROR,
+                message=f"Websocket connection disconnected with error {error}",
+                subscription_id=self.id,
+                alive=False,
+            )
+        )
+
+    def _to_envelope(self, message: WebsocketClientMessage) -> Envelope:
+        """Wrap a message in an envelope to the agent."""
+        return Envelope(
+            to=self._to,
+            sender=self._sender,
+            message=message,
+        )
+
+    async def _put(self, message: WebsocketClientMessage) -> None:
+        """Put a message in the outbox, waiting for room in it."""
+        await self._outbox.put(self._to_envelope(message))
+
+
+class WebsocketConnection:
+    """
+    A websocket to a single URL, which carries the streams of multiple subscriptions.
+
+    The JSON-RPC requests of each subscription are sent with ids which are unique on the websocket,
+    so that the responses can be routed back to the subscription that sent them, with their original id.
+    The `eth_subscription` notifications are routed using the subscription id that the server assigned
+    in the response of the corresponding `eth_subscribe` request.
+    Anything that cannot be attributed to a single subscription is forwarded to all of them.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        url: str,
+        session: aiohttp.ClientSession,
+        logger: Optional[logging.Logger] = None,
+        ping_interval: float = DEFAULT_PING_INTERVAL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        on_disconnected: Optional[Callable[["WebsocketConnection"], None]] = None,
+    ) -> None:
+        """Create a websocket connection."""
+        self._url = url
+        self._session = session
+        self._on_disconnected = on_disconnected
+        self._status = ConnectionStates.disconnected
+        self._wss: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._recv_task: Optional[asyncio.Task] = None
+
+        self._ping_interval = ping_interval
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        self._subscriptions: Dict[str, WebsocketSubcription] = {}
+        # maps the ids of the requests in flight to the subscription id and the original request id
+        self._requests: Dict[int, Tuple[str, Any, Optional[str]]] = {}
+        self._next_request_id = 0
+        # maps the subscription ids assigned by the server to our subscription ids
+        self._server_subscriptions: Dict[str, str] = {}
+
+        self.logger = logger or logging.getLogger()
+
+    @property
+    def url(self) -> str:
+        """Returns the URL"""
+        return self._url
+
+    @property
+    def status(self) -> ConnectionStates:
+        """Current status of the websocket."""
+        return self._status
+
+    @property
+    def num_subscriptions(self) -> int:
+        """The number of subscriptions which use the websocket."""
+        return len(self._subscriptions)
+
+    def __contains__(self, subscription_id: str) -> bool:
+        """Check whether a subscription uses the websocket."""
+        return subscription_id in self._subscriptions
 
-    async def subscribe(self, url: str) -> "WebsocketSubcription":
-        """Subscribe to websocket."""
-        # TODO: make these configurable
-        tries = 0
-        sleep = 3
-        while tries < DEFAULT_MAX_RETRIES:
+    async def connect(self) -> "WebsocketConnection":
+        """Connect to the websocket and start receiving from it."""
+        for attempt in range(self._max_retries):
             try:
                 self._status = ConnectionStates.connecting
-                self._url = url
-                self._wss = await self._loop.run_in_executor(
-                    self._executor,
-                    websocket.create_connection,
-                    self.url,
+                self._wss = await self._session.ws_connect(
+                    self.url, heartbeat=self._ping_interval
                 )
                 self._status = ConnectionStates.connected
+                self._recv_task = asyncio.get_running_loop().create_task(self.recv())
                 return self
             except Exception as exception:  # pylint: disable=W0718
-                tries += 1
                 self.logger.error(
                     f"Failed to establish WebSocket connection: {exception}; "
-                    f"URL: {self.url}; Try: {tries}; Will retry in {sleep} ..."
+                    f"URL: {self.url}; Try: {attempt + 1}"
                 )
-                await asyncio.sleep(sleep)
+                if attempt + 1 < self._max_retries:
+                    await asyncio.sleep(
+                        get_backoff_delay(
+                            attempt, self._backoff_base, self._backoff_max
+                        )
+                    )
 
         self._status = ConnectionStates.disconnected
         return self
 
-    async def unsubscribe(self, payload: str = "") -> "WebsocketSubcription":
-        """Unsubscribe from websocket."""
+    def add(self, subscription: WebsocketSubcription) -> None:
+        """Add a subscription to the websocket."""
+        self._subscriptions[subscription.id] = subscription
+        subscription.attach(self)
+
+    async def remove(self, subscription: WebsocketSubcription) -> None:
+        """Remove a subscription from the websocket, and unsubscribe from its streams."""
+        self._subscriptions.pop(subscription.id, None)
+        subscription.detach()
+        server_subscriptions = [
+            server_subscription
+            for server_subscription, subscription_id in self._server_subscriptions.items()
+            if subscription_id == subscription.id
+        ]
+        for server_subscription in server_subscriptions:
+            del self._server_subscriptions[server_subscription]
+            if self.status == ConnectionStates.connected:
+                # the response is routed to the removed subscription, i.e., it is dropped
+                request_id = self._get_request_id()
+                self._requests[request_id] = (subscription.id, None, None)
+                await self._send_str(
+                    json.dumps(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": "eth_unsubscribe",
+                            "params": [server_subscription],
+                        }
+                    )
+                )
+
+    def _get_request_id(self) -> int:
+        """Get a request id which is unique on the websocket."""
+        self._next_request_id += 1
+        return self._next_request_id
+
+    async def send(self, subscription: WebsocketSubcription, payload: str) -> int:
+        """Send a payload on behalf of a subscription and return send length."""
+        try:
+            request = json.loads(payload)
+        except json.JSONDecodeError:
+            request = None
+
+        if isinstance(request, dict) and "id" in request:
+            request_id = self._get_request_id()
+            self._requests[request_id] = (
+                subscription.id,
+                request["id"],
+                request.get("method", None),
+            )
+            payload = json.dumps({**request, "id": request_id})
+
+        return await self._send_str(payload)
+
+    async def _send_str(self, payload: str) -> int:
+        """Send a payload and return send length."""
+        if self._wss is None or self._wss.closed:
+            return -1
+        try:
+            await self._wss.send_str(payload)
+        except (ConnectionError, RuntimeError):
+            return -1
+        return len(payload.encode())
+
+    async def recv(self) -> None:
+        """Run recv loop."""
+        wss = cast(aiohttp.ClientWebSocketResponse, self._wss)
+        while self.status == ConnectionStates.connected:
+            # the ping/pong keepalive is handled by the websocket itself,
+            # a missed pong closes the websocket, which ends the loop
+            ws_message = await wss.receive()
+            if ws_message.type == aiohttp.WSMsgType.TEXT:
+                await self._route(ws_message.data)
+            elif ws_message.type == aiohttp.WSMsgType.BINARY:
+                await self._route(ws_message.data.decode())
+            elif self.status == ConnectionStates.connected:
+                await self._disconnected(str(wss.exception() or ws_message.type))
+
+    async def _route(self, data: str) -> None:
+        """Route the received data to the subscriptions it concerns."""
+        try:
+            response = json.loads(data)
+        except json.JSONDecodeError:
+            response = None
+
+        if isinstance(response, dict):
+            request = self._requests.pop(response.get("id", None), None)
+            if request is not None:
+                subscription_id, original_id, method = request
+                result = response.get("result", None)
+                if method == "eth_subscribe" and isinstance(result, str):
+                    self._server_subscriptions[result] = subscription_id
+                subscription = self._subscriptions.get(subscription_id, None)
+                if subscription is not None:
+                    await subscription.receive(
+                        json.dumps({**response, "id": original_id})
+                    )
+                return
+
+            if response.get("method", None) == "eth_subscription":
+                params = response.get("params", None)
+                server_subscription = (
+                    params.get("subscription", None)
+                    if isinstance(params, dict)
+                    else None
+                )
+                subscription_id = self._server_subscriptions.get(
+                    server_subscription, None
+                )
+                subscription = self._subscriptions.get(subscription_id, None)
+                if subscription is not None:
+                    await subscription.receive(data, is_notification=True)
+                return
+
+        for subscription in list(self._subscriptions.values()):
+            await subscription.receive(data)
+
+    async def _disconnected(self, error: str) -> None:
+        """Handle the disconnection of the websocket."""
+        self._status = ConnectionStates.disconnected
+        if self._on_disconnected is not None:
+            self._on_disconnected(self)
+        self._requests = {}
+        self._server_subscriptions = {}
+        subscriptions, self._subscriptions = self._subscriptions, {}
+        for subscription in subscriptions.values():
+            await subscription.disconnected(error)
+
+    async def close(self) -> None:
+        """Close the websocket."""
         self._status = ConnectionStates.disconnecting
-        await self._loop.run_in_executor(
-            self._executor,
-            self._wss.close,
-            websocket.STATUS_NORMAL,
-            payload.encode(),
-        )
+        if self._wss is not None:
+            await self._wss.close(code=aiohttp.WSCloseCode.OK)
+        if self._recv_task is not None:
+            self._recv_task.cancel()
+        for subscription in self._subscriptions.values():
+            subscription.detach()
+        self._subscriptions = {}
         self._status = ConnectionStates.disconnected
 
 
@@ -210,15 +465,17 @@ class SubscriptionManager:
         self,
         outbox: asyncio.Queue,
         logger: Optional[logging.Logger] = None,
-        loop: Optional[asyncio.AbstractEventLoop] = None,
-        executor: Optional[ThreadPoolExecutor] = None,
+        **connection_kwargs: Any,
     ) -> None:
         """Websocket subscription manager."""
 
         self._subscriptions = {}
-        self._executor = executor or ThreadPoolExecutor()
-        self._loop = loop or asyncio.get_running_loop()
+        # there is a single websocket per URL, which is shared by all the subscriptions to the URL
+        self._connections: Dict[str, WebsocketConnection] = {}
+        self._connections_lock: Optional[asyncio.Lock] = None
+        self._session: Optional[aiohttp.ClientSession] = None
         self._outbox = outbox
+        self._connection_kwargs = connection_kwargs
 
         self.logger = logger or logging.getLogger()
 
@@ -227,12 +484,42 @@ class SubscriptionManager:
         """Outbox."""
         return self._outbox
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The session which is shared by all the websockets."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
     def get(self, subscription_id: str) -> Optional[WebsocketSubcription]:
         """Returns a subscription by id"""
         return self._subscriptions.get(
             subscription_id,
         )
 
+    async def _get_connection(self, url: str) -> WebsocketConnection:
+        """Get the websocket of a URL, connecting to it if there is not one already."""
+        if self._connections_lock is None:
+            self._connections_lock = asyncio.Lock()
+        async with self._connections_lock:
+            connection = self._connections.get(url, None)
+            if connection is None or connection.status != ConnectionStates.connected:
+                connection = await WebsocketConnection(
+                    url=url,
+                    session=self.session,
+                    logger=self.logger,
+                    on_disconnected=self._drop_connection,
+                    **self._connection_kwargs,
+                ).connect()
+                if connection.status == ConnectionStates.connected:
+                    self._connections[url] = connection
+            return connection
+
+    def _drop_connection(self, connection: WebsocketConnection) -> None:
+        """Forget a websocket which has been disconnected, so that the next subscription to its URL reconnects."""
+        if self._connections.get(connection.url, None) is connection:
+            del self._connections[connection.url]
+
     async def create_subscription(
         self,
         url: str,
@@ -241,35 +528,50 @@ class SubscriptionManager:
         sender: str,
     ) -> "WebsocketSubcription":
         """Create a websocket subscription."""
-        self._subscriptions[subscription_id] = await WebsocketSubcription(
+        # a subscription with the same id is replaced, e.g., when re-subscribing after a disconnection
+        await self.remove_subscription(subscription_id)
+        subscription = WebsocketSubcription(
             subscription_id=subscription_id,
+            url=url,
             to=to,
             sender=sender,
             outbox=self._outbox,
             logger=self.logger,
-            loop=self._loop,
-            executor=self._executor,
-        ).subscribe(
-            url=url,
         )
-        return self._subscriptions[subscription_id]
+        connection = await self._get_connection(url)
+        if connection.status == ConnectionStates.connected:
+            connection.add(subscription)
+        self._subscriptions[subscription_id] = subscription
+        return subscription
 
     async def remove_subscription(
         self,
-        subscription_id: int,
-        payload: str = "",
+        subscription_id: str,
+        payload: str = "",  # pylint: disable=unused-argument
     ) -> None:
-        """Create a websocket subscription."""
+        """Remove a websocket subscription, and close its websocket if no other subscription uses it."""
         subscription = self._subscriptions.pop(subscription_id, None)
         if subscription is None:
             return
-        await subscription.unsubscribe(payload=payload)
+        connection = self._connections.get(subscription.url, None)
+        if connection is None or subscription.id not in connection:
+            return
+        await connection.remove(subscription)
+        if connection.num_subscriptions == 0:
+            del self._connections[subscription.url]
+            await connection.close()
 
     async def remove_all_subscriptions(self) -> None:
         """Remove all subscriptions"""
-        for sid, wss in self._subscriptions.items():
+        for sid in list(self._subscriptions.keys()):
             self.logger.info(f"Unsubscribing from {sid}")
-            await wss.unsubscribe()
+            await self.remove_subscription(sid)
+        for connection in self._connections.values():
+            await connection.close()
+        self._connections = {}
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
 
 class WebSocketClient(Connection):  # pylint: disable=Too many instance attributes
@@ -277,7 +579,6 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
 
     connection_id = PUBLIC_ID
 
-    _executor: ThreadPoolExecutor
     _manager: SubscriptionManager
     _outbox: asyncio.Queue
 
@@ -302,13 +603,17 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
         In the implementation, remember to update 'connection_status' accordingly.
         """
 
-        self._executor = ThreadPoolExecutor()
-        self._outbox = asyncio.Queue()
+        config = self.configuration.config
+        self._outbox = asyncio.Queue(
+            maxsize=config.get("queue_size", DEFAULT_QUEUE_SIZE)
+        )
         self._manager = SubscriptionManager(
             outbox=self._outbox,
             logger=self.logger,
-            loop=self.loop,
-            executor=self._executor,
+            ping_interval=config.get("ping_interval", DEFAULT_PING_INTERVAL),
+            max_retries=config.get("max_retries", DEFAULT_MAX_RETRIES),
+            backoff_base=config.get("backoff_base", DEFAULT_BACKOFF_BASE),
+            backoff_max=config.get("backoff_max", DEFAULT_BACKOFF_MAX),
         )
 
         self.state = ConnectionStates.connected
@@ -322,7 +627,6 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
         """
 
         await self._manager.remove_all_subscriptions()
-        self._outbox.empty()
         self.state = ConnectionStates.disconnected
 
     async def send(self, envelope: Envelope) -> None:
@@ -342,7 +646,7 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
         ):
             response = self.ws_check_subscription(message=message, dialogue=dialogue)
         elif message.performative == WebsocketClientMessage.Performative.SEND:
-            response = self.ws_send(message=message, dialogue=dialogue)
+            response = await self.ws_send(message=message, dialogue=dialogue)
         else:
             raise ValueError(f"Invalid performative {message.performative}")
 
@@ -374,9 +678,8 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
                 error=f"Error subscribing to the websocket with id {message.subscription_id}",
             )
 
-        self.loop.create_task(wss.recv())
         if message.subscription_payload is not None:
-            wss.send(payload=message.subscription_payload)
+            await wss.send(payload=message.subscription_payload)
 
         return cast(
             WebsocketClientMessage,
@@ -410,7 +713,7 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
             ),
         )
 
-    def ws_send(
+    async def ws_send(
         self,
         message: WebsocketClientMessage,
         dialogue: WebsocketClientDialogue,
@@ -422,7 +725,7 @@ class WebSocketClient(Connection):  # pylint: disable=Too many instance attribut
                 message=message, dialogue=dialogue
             )
 
-        send_length = wss.send(payload=message.payload)
+        send_length = await wss.send(payload=message.payload)
         if send_length > -1:
             return cast(
                 WebsocketClientMessage,
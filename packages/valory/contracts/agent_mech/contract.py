@@ -30,6 +30,8 @@ from aea_ledger_ethereum import EthereumApi
 from web3 import Web3
 from web3.types import BlockIdentifier, TxReceipt
 
+from packages.valory.contracts.multicall3.contract import Multicall3Contract
+
 
 PUBLIC_ID = PublicId.from_str("valory/agent_mech:0.1.0")
 
@@ -293,6 +295,7 @@ class AgentMechContract(Contract):
             {
                 "tx_hash": entry.transactionHash.hex(),
                 "block_number": entry.blockNumber,
+                "log_index": entry.logIndex,
                 **entry["args"],
                 "contract_address": contract_address,
             }
@@ -434,6 +437,49 @@ class AgentMechContract(Contract):
         token_id = contract_instance.functions.subscriptionTokenId().call()
         return {"nft": nft, "token_id": token_id}
 
+    @classmethod
+    def get_subscriptions(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        mech_addresses: List[str],
+    ) -> JSONLike:
+        """
+        Get the subscriptions of multiple mechs in a single call.
+
+        :param ledger_api: LedgerApi object
+        :param contract_address: the address of the multicall3 contract
+        :param mech_addresses: the addresses of the mechs.
+        :return: the subscription of each mech. The mechs whose subscription could not be read are omitted.
+        """
+        ledger_api = cast(EthereumApi, ledger_api)
+        if len(mech_addresses) == 0:
+            return {"subscriptions": {}}
+
+        # the getters take no arguments, so their calldata is only the selector
+        nft_call_data = bytes(Web3.keccak(text="subscriptionNFT()")[:4])
+        token_id_call_data = bytes(Web3.keccak(text="subscriptionTokenId()")[:4])
+        calls = []
+        for mech_address in mech_addresses:
+            calls.append((mech_address, nft_call_data))
+            calls.append((mech_address, token_id_call_data))
+        results = Multicall3Contract.aggregate(ledger_api, contract_address, calls)
+
+        subscriptions: Dict[str, Dict[str, Any]] = {}
+        for i, mech_address in enumerate(mech_addresses):
+            (nft_success, nft_data), (token_id_success, token_id_data) = results[
+                2 * i : 2 * i + 2
+            ]
+            if not nft_success or not token_id_success:
+                continue
+            (nft,) = ledger_api.api.codec.decode(["address"], nft_data)
+            (token_id,) = ledger_api.api.codec.decode(["uint256"], token_id_data)
+            subscriptions[mech_address] = {
+                "nft": Web3.to_checksum_address(nft),
+                "token_id": token_id,
+            }
+        return {"subscriptions": subscriptions}
+
     @classmethod
     def get_set_subscription_tx_data(
         cls,
@@ -30,6 +30,8 @@ from aea_ledger_ethereum import EthereumApi
 from web3 import Web3
 from web3.types import BlockIdentifier, TxReceipt
 
+from packages.valory.contracts.multicall3.contract import Multicall3Contract
+
 
 PUBLIC_ID = PublicId.from_str("valory/agent_mech:0.1.0")
 
@@ -37,6 +39,9 @@ _logger = logging.getLogger(
     f"aea.packages.{PUBLIC_ID.author}.contracts.{PUBLIC_ID.name}.contract"
 )
 
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+# the maximum number of request ids that are checked in a single call
+DEFAULT_CHUNK_SIZE = 250
 
 BATCH_PRIORITY_PASSED_DATA = {
   "abi": [
@@ -190,6 +195,7 @@ class MechMarketplaceContract(Contract):
             {
                 "tx_hash": entry.transactionHash.hex(),
                 "block_number": entry.blockNumber,
+                "log_index": entry.logIndex,
                 **entry["args"],
                 "sender": entry["args"]["requester"],
             }
@@ -246,6 +252,7 @@ class MechMarketplaceContract(Contract):
         contract_address: str,
         my_mech: str,
         request_ids: List[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> Dict[str, Any]:
         """Check if requests are ready to be delivered."""
         # BatchPriorityData contract is a special contract used specifically for checking if the requests have passed
@@ -254,26 +261,87 @@ class MechMarketplaceContract(Contract):
             abi=BATCH_PRIORITY_PASSED_DATA["abi"], bytecode=BATCH_PRIORITY_PASSED_DATA["bytecode"]
         )
 
-        # Encode the input data (constructor params)
-        encoded_input_data = ledger_api.api.codec.encode(
-            ["address", "address", "uint256[]"], [contract_address, my_mech, request_ids]
-        )
+        eligible_request_ids: List[int] = []
+        # the ids are checked in chunks, so that a single call cannot exceed the gas or the calldata limits
+        for i in range(0, len(request_ids), chunk_size):
+            # Encode the input data (constructor params)
+            encoded_input_data = ledger_api.api.codec.encode(
+                ["address", "address", "uint256[]"],
+                [contract_address, my_mech, request_ids[i : i + chunk_size]],
+            )
 
-        # Concatenate the bytecode with the encoded input data to create the contract creation code
-        contract_creation_code = batch_workable_contract.bytecode + encoded_input_data
+            # Concatenate the bytecode with the encoded input data to create the contract creation code
+            contract_creation_code = batch_workable_contract.bytecode + encoded_input_data
 
-        # Call the function with the contract creation code
-        # Note that we are not sending any transaction, we are just calling the function
-        # This is a special contract creation code that will return some result
-        encoded_req_ids = ledger_api.api.eth.call({"data": contract_creation_code})
+            # Call the function with the contract creation code
+            # Note that we are not sending any transaction, we are just calling the function
+            # This is a special contract creation code that will return some result
+            encoded_req_ids = ledger_api.api.eth.call({"data": contract_creation_code})
 
-        # Decode the raw response
-        # the decoding returns a Tuple with a single element so we need to access the first element of the tuple,
-        request_ids = ledger_api.api.codec.decode(
-            ["uint256[]"], encoded_req_ids
-        )[0]
-        return dict(request_ids=request_ids)
+            # Decode the raw response
+            # the decoding returns a Tuple with a single element so we need to access the first element of the tuple,
+            eligible_request_ids.extend(
+                ledger_api.api.codec.decode(["uint256[]"], encoded_req_ids)[0]
+            )
+        return dict(request_ids=eligible_request_ids)
 
+    @classmethod
+    def get_request_deliveries(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        multicall_address: str,
+        request_ids: List[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the delivery info of the provided requests, using chunked multicalls.
+
+        :param ledger_api: LedgerApi object
+        :param contract_address: the address of the marketplace
+        :param multicall_address: the address of the multicall3 contract
+        :param request_ids: the ids of the requests.
+        :param chunk_size: the maximum number of requests to read in a single call.
+        :return: the priority mech, the delivery mech and the response timeout of each request that could be read.
+        """
+        ledger_api = cast(EthereumApi, ledger_api)
+        contract_instance = cls.get_instance(ledger_api, contract_address)
+        output_types = [
+            output["type"]
+            for output in contract_instance.get_function_by_name(
+                "mapRequestIdDeliveries"
+            ).abi["outputs"]
+        ]
+        deliveries: Dict[int, Dict[str, Any]] = {}
+        for i in range(0, len(request_ids), chunk_size):
+            chunk = request_ids[i : i + chunk_size]
+            calls = [
+                (
+                    contract_address,
+                    bytes.fromhex(
+                        contract_instance.encodeABI(
+                            fn_name="mapRequestIdDeliveries", args=[request_id]
+                        )[2:]
+                    ),
+                )
+                for request_id in chunk
+            ]
+            results = Multicall3Contract.aggregate(ledger_api, multicall_address, calls)
+            for request_id, (success, return_data) in zip(chunk, results):
+                if not success:
+                    continue
+                (
+                    priority_mech,
+                    delivery_mech,
+                    _requester,
+                    response_timeout,
+                ) = ledger_api.api.codec.decode(output_types, return_data)
+                deliveries[request_id] = {
+                    "priority_mech": Web3.to_checksum_address(priority_mech),
+                    "delivery_mech": Web3.to_checksum_address(delivery_mech),
+                    "response_timeout": response_timeout,
+                }
+        return deliveries
 
     @classmethod
     def get_undelivered_reqs(
@@ -284,9 +352,17 @@ class MechMarketplaceContract(Contract):
         from_block: BlockIdentifier = "earliest",
         to_block: BlockIdentifier = "latest",
         max_block_window: int = 1000,
+        multicall_address: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
         **kwargs: Any,
     ) -> JSONLike:
-        """Get the requests that are not delivered."""
+        """
+        Get the requests that are not delivered.
+
+        If a multicall address is provided, every undelivered request is returned along with its priority deadline,
+        so that the caller can schedule it, instead of having to check it again on every poll.
+        Otherwise, only the requests that are eligible right now are returned.
+        """
         if from_block == "earliest":
             from_block = 0
 
@@ -304,19 +380,45 @@ class MechMarketplaceContract(Contract):
             )["data"]
             requests.extend(requests_batch)
             delivers.extend(delivers_batch)
-        pending_tasks: List[Dict[str, Any]] = []
-        for request in requests:
-            if request["requestId"] not in [
-                deliver["requestId"] for deliver in delivers
-            ]:
-                # store each requests in the pending_tasks list, make sure each req is stored once
-                pending_tasks.append(request)
+        delivered_request_ids = {deliver["requestId"] for deliver in delivers}
+        pending_tasks: List[Dict[str, Any]] = [
+            request
+            for request in requests
+            if request["requestId"] not in delivered_request_ids
+        ]
 
         request_ids = [req["requestId"] for req in pending_tasks]
-        eligible_request_ids = cls.has_priority_passed(ledger_api, contract_address, my_mech, request_ids).pop("request_ids")
-        pending_tasks = [req for req in pending_tasks if req["requestId"] in eligible_request_ids]
-        return {"data": pending_tasks}
+        if multicall_address is None:
+            eligible_request_ids = set(
+                cls.has_priority_passed(
+                    ledger_api, contract_address, my_mech, request_ids, chunk_size
+                ).pop("request_ids")
+            )
+            pending_tasks = [
+                req for req in pending_tasks if req["requestId"] in eligible_request_ids
+            ]
+            return {"data": pending_tasks}
 
+        deliveries = cls.get_request_deliveries(
+            ledger_api, contract_address, multicall_address, request_ids, chunk_size
+        )
+        scheduled_tasks = []
+        for req in pending_tasks:
+            delivery = deliveries.get(req["requestId"], None)
+            if delivery is None or delivery["delivery_mech"] != ZERO_ADDRESS:
+                # either it could not be read, or it has been delivered in the meantime
+                continue
+            scheduled_tasks.append(
+                {
+                    **req,
+                    "priority_mech": delivery["priority_mech"],
+                    "response_timeout": delivery["response_timeout"],
+                }
+            )
+        return {
+            "data": scheduled_tasks,
+            "delivered_request_ids": list(delivered_request_ids),
+        }
 
     @classmethod
     def simulate_tx(
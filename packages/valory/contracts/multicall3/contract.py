@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the multicall3 contract definition."""
+from typing import Any, List, Tuple, cast
+
+from aea.common import JSONLike
+from aea.configurations.base import PublicId
+from aea.contracts.base import Contract
+from aea.crypto.base import LedgerApi
+from aea_ledger_ethereum import EthereumApi
+
+
+class Multicall3Contract(Contract):
+    """The Multicall3 contract, used to batch multiple reads into a single call."""
+
+    contract_id = PublicId.from_str("valory/multicall3:0.1.0")
+
+    @classmethod
+    def get_raw_transaction(
+        cls, ledger_api: LedgerApi, contract_address: str, **kwargs: Any
+    ) -> JSONLike:
+        """
+        Handler method for the 'GET_RAW_TRANSACTION' requests.
+
+        Implement this method in the sub class if you want
+        to handle the contract requests manually.
+
+        :param ledger_api: the ledger apis.
+        :param contract_address: the contract address.
+        :param kwargs: the keyword arguments.
+        :return: the tx  # noqa: DAR202
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_raw_message(
+        cls, ledger_api: LedgerApi, contract_address: str, **kwargs: Any
+    ) -> bytes:
+        """
+        Handler method for the 'GET_RAW_MESSAGE' requests.
+
+        Implement this method in the sub class if you want
+        to handle the contract requests manually.
+
+        :param ledger_api: the ledger apis.
+        :param contract_address: the contract address.
+        :param kwargs: the keyword arguments.
+        :return: the tx  # noqa: DAR202
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_state(
+        cls, ledger_api: LedgerApi, contract_address: str, **kwargs: Any
+    ) -> JSONLike:
+        """
+        Handler method for the 'GET_STATE' requests.
+
+        Implement this method in the sub class if you want
+        to handle the contract requests manually.
+
+        :param ledger_api: the ledger apis.
+        :param contract_address: the contract address.
+        :param kwargs: the keyword arguments.
+        :return: the tx  # noqa: DAR202
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def aggregate(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        calls: List[Tuple[str, bytes]],
+    ) -> List[Tuple[bool, bytes]]:
+        """
+        Perform the provided calls in a single `eth_call`.
+
+        The calls are allowed to fail individually, so that a single failing read does not fail the whole batch.
+
+        :param ledger_api: LedgerApi object
+        :param contract_address: the address of the multicall3 contract
+        :param calls: the calls to perform, as (target, calldata) pairs.
+        :return: the (success, return data) of each call, in the order of the calls.
+        """
+        ledger_api = cast(EthereumApi, ledger_api)
+
+        if not isinstance(ledger_api, EthereumApi):
+            raise ValueError(f"Only EthereumApi is supported, got {type(ledger_api)}")
+
+        if len(calls) == 0:
+            return []
+
+        contract_instance = cls.get_instance(ledger_api, contract_address)
+        call3s = [
+            (ledger_api.api.to_checksum_address(target), True, call_data)
+            for target, call_data in calls
+        ]
+        results = contract_instance.functions.aggregate3(call3s).call()
+        return [(success, bytes(return_data)) for success, return_data in results]
+
+    @classmethod
+    def get_eth_balances(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        accounts: List[str],
+    ) -> JSONLike:
+        """
+        Get the native balances of the provided accounts in a single call.
+
+        :param ledger_api: LedgerApi object
+        :param contract_address: the address of the multicall3 contract
+        :param accounts: the accounts to get the balances for.
+        :return: the balances by account. The accounts whose balance could not be read are omitted.
+        """
+        ledger_api = cast(EthereumApi, ledger_api)
+        contract_instance = cls.get_instance(ledger_api, contract_address)
+        calls = [
+            (
+                contract_address,
+                bytes.fromhex(
+                    contract_instance.encodeABI(
+                        fn_name="getEthBalance",
+                        args=[ledger_api.api.to_checksum_address(account)],
+                    )[2:]
+                ),
+            )
+            for account in accounts
+        ]
+        results = cls.aggregate(ledger_api, contract_address, calls)
+        balances = {}
+        for account, (success, return_data) in zip(accounts, results):
+            if success:
+                (balances[account],) = ledger_api.api.codec.decode(
+                    ["uint256"], return_data
+                )
+        return {"balances": balances}
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x14\x61\x63n_data_share.proto\x12 aea.valory.acn_data_share.v0_1_0"\xb8\x01\n\x13\x41\x63nDataShareMessage\x12W\n\x04\x64\x61ta\x18\x05 \x01(\x0b\x32G.aea.valory.acn_data_share.v0_1_0.AcnDataShareMessage.Data_PerformativeH\x00\x1a\x38\n\x11\x44\x61ta_Performative\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\tB\x0e\n\x0cperformativeb\x06proto3'
+    b'\n\x14\x61\x63n_data_share.proto\x12 aea.valory.acn_data_share.v0_1_0"\xd9\x03\n\x13\x41\x63nDataShareMessage\x12W\n\x04\x64\x61ta\x18\x05 \x01(\x0b\x32G.aea.valory.acn_data_share.v0_1_0.AcnDataShareMessage.Data_PerformativeH\x00\x12\x63\n\ndata_batch\x18\x06 \x01(\x0b\x32M.aea.valory.acn_data_share.v0_1_0.AcnDataShareMessage.Data_Batch_PerformativeH\x00\x1a\x38\n\x11\x44\x61ta_Performative\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\x1a\xb9\x01\n\x17\x44\x61ta_Batch_Performative\x12m\n\x08\x63ontents\x18\x01 \x03(\x0b\x32[.aea.valory.acn_data_share.v0_1_0.AcnDataShareMessage.Data_Batch_Performative.ContentsEntry\x1a/\n\rContentsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\x0e\n\x0cperformativeb\x06proto3'
 )
 
 _globals = globals()
@@ -22,8 +22,22 @@ _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "acn_data_share_pb2", _globals)
 if _descriptor._USE_C_DESCRIPTORS == False:
     DESCRIPTOR._options = None
+    _globals[
+        "_ACNDATASHAREMESSAGE_DATA_BATCH_PERFORMATIVE_CONTENTSENTRY"
+    ]._options = None
+    _globals[
+        "_ACNDATASHAREMESSAGE_DATA_BATCH_PERFORMATIVE_CONTENTSENTRY"
+    ]._serialized_options = b"8\001"
     _globals["_ACNDATASHAREMESSAGE"]._serialized_start = 59
-    _globals["_ACNDATASHAREMESSAGE"]._serialized_end = 243
-    _globals["_ACNDATASHAREMESSAGE_DATA_PERFORMATIVE"]._serialized_start = 171
-    _globals["_ACNDATASHAREMESSAGE_DATA_PERFORMATIVE"]._serialized_end = 227
+    _globals["_ACNDATASHAREMESSAGE"]._serialized_end = 532
+    _globals["_ACNDATASHAREMESSAGE_DATA_PERFORMATIVE"]._serialized_start = 272
+    _globals["_ACNDATASHAREMESSAGE_DATA_PERFORMATIVE"]._serialized_end = 328
+    _globals["_ACNDATASHAREMESSAGE_DATA_BATCH_PERFORMATIVE"]._serialized_start = 331
+    _globals["_ACNDATASHAREMESSAGE_DATA_BATCH_PERFORMATIVE"]._serialized_end = 516
+    _globals[
+        "_ACNDATASHAREMESSAGE_DATA_BATCH_PERFORMATIVE_CONTENTSENTRY"
+    ]._serialized_start = 469
+    _globals[
+        "_ACNDATASHAREMESSAGE_DATA_BATCH_PERFORMATIVE_CONTENTSENTRY"
+    ]._serialized_end = 516
 # @@protoc_insertion_point(module_scope)
@@ -38,13 +38,20 @@ class AcnDataShareDialogue(Dialogue):
     """The acn_data_share dialogue class maintains state of a dialogue and manages it."""
 
     INITIAL_PERFORMATIVES: FrozenSet[Message.Performative] = frozenset(
-        {AcnDataShareMessage.Performative.DATA}
+        {
+            AcnDataShareMessage.Performative.DATA,
+            AcnDataShareMessage.Performative.DATA_BATCH,
+        }
     )
     TERMINAL_PERFORMATIVES: FrozenSet[Message.Performative] = frozenset(
-        {AcnDataShareMessage.Performative.DATA}
+        {
+            AcnDataShareMessage.Performative.DATA,
+            AcnDataShareMessage.Performative.DATA_BATCH,
+        }
     )
     VALID_REPLIES: Dict[Message.Performative, FrozenSet[Message.Performative]] = {
         AcnDataShareMessage.Performative.DATA: frozenset(),
+        AcnDataShareMessage.Performative.DATA_BATCH: frozenset(),
     }
 
     class Role(Dialogue.Role):
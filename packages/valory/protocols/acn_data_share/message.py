@@ -21,7 +21,7 @@
 
 # pylint: disable=too-many-statements,too-many-locals,no-member,too-few-public-methods,too-many-branches,not-an-iterable,unidiomatic-typecheck,unsubscriptable-object
 import logging
-from typing import Any, Set, Tuple, cast
+from typing import Any, Dict, Set, Tuple, cast
 
 from aea.configurations.base import PublicId
 from aea.exceptions import AEAEnforceError, enforce
@@ -45,17 +45,19 @@ class AcnDataShareMessage(Message):
         """Performatives for the acn_data_share protocol."""
 
         DATA = "data"
+        DATA_BATCH = "data_batch"
 
         def __str__(self) -> str:
             """Get the string representation."""
             return str(self.value)
 
-    _performatives = {"data"}
+    _performatives = {"data", "data_batch"}
     __slots__: Tuple[str, ...] = tuple()
 
     class _SlotsCls:
         __slots__ = (
             "content",
+            "contents",
             "dialogue_reference",
             "message_id",
             "performative",
@@ -123,6 +125,12 @@ class AcnDataShareMessage(Message):
         enforce(self.is_set("content"), "'content' content is not set.")
         return cast(str, self.get("content"))
 
+    @property
+    def contents(self) -> Dict[str, str]:
+        """Get the 'contents' content from the message."""
+        enforce(self.is_set("contents"), "'contents' content is not set.")
+        return cast(Dict[str, str], self.get("contents"))
+
     @property
     def request_id(self) -> str:
         """Get the 'request_id' content from the message."""
@@ -189,6 +197,27 @@ class AcnDataShareMessage(Message):
                         type(self.content)
                     ),
                 )
+            elif self.performative == AcnDataShareMessage.Performative.DATA_BATCH:
+                expected_nb_of_contents = 1
+                enforce(
+                    isinstance(self.contents, dict),
+                    "Invalid type for content 'contents'. Expected 'dict'. Found '{}'.".format(
+                        type(self.contents)
+                    ),
+                )
+                for key_of_contents, value_of_contents in self.contents.items():
+                    enforce(
+                        isinstance(key_of_contents, str),
+                        "Invalid type for dictionary keys in content 'contents'. Expected 'str'. Found '{}'.".format(
+                            type(key_of_contents)
+                        ),
+                    )
+                    enforce(
+                        isinstance(value_of_contents, str),
+                        "Invalid type for dictionary values in content 'contents'. Expected 'str'. Found '{}'.".format(
+                            type(value_of_contents)
+                        ),
+                    )
 
             # Check correct content count
             enforce(
@@ -63,6 +63,11 @@ class AcnDataShareSerializer(Serializer):
             content = msg.content
             performative.content = content
             acn_data_share_msg.data.CopyFrom(performative)
+        elif performative_id == AcnDataShareMessage.Performative.DATA_BATCH:
+            performative = acn_data_share_pb2.AcnDataShareMessage.Data_Batch_Performative()  # type: ignore
+            contents = msg.contents
+            performative.contents.update(contents)
+            acn_data_share_msg.data_batch.CopyFrom(performative)
         else:
             raise ValueError("Performative not valid: {}".format(performative_id))
 
@@ -99,6 +104,10 @@ class AcnDataShareSerializer(Serializer):
             performative_content["request_id"] = request_id
             content = acn_data_share_pb.data.content
             performative_content["content"] = content
+        elif performative_id == AcnDataShareMessage.Performative.DATA_BATCH:
+            contents = acn_data_share_pb.data_batch.contents
+            contents_dict = dict(contents)
+            performative_content["contents"] = contents_dict
         else:
             raise ValueError("Performative not valid: {}.".format(performative_id))
 
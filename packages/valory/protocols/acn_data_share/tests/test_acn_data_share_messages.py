@@ -40,6 +40,10 @@ class TestMessageAcnDataShare(BaseProtocolMessagesTestCase):
                 request_id="some str",
                 content="some str",
             ),
+            AcnDataShareMessage(
+                performative=AcnDataShareMessage.Performative.DATA_BATCH,
+                contents={"some str": "some str"},
+            ),
         ]
 
     def build_inconsistent(self) -> List[AcnDataShareMessage]:  # type: ignore[override]
@@ -50,4 +54,8 @@ class TestMessageAcnDataShare(BaseProtocolMessagesTestCase):
                 # skip content: request_id
                 content="some str",
             ),
+            AcnDataShareMessage(
+                performative=AcnDataShareMessage.Performative.DATA_BATCH,
+                # skip content: contents
+            ),
         ]
@@ -21,10 +21,14 @@
 """This package contains a scaffold of a behaviour."""
 
 import json
-from typing import Any, cast
+from typing import Any, List, cast
 
 from packages.valory.connections.websocket_client.connection import WebSocketClient
-from packages.valory.skills.contract_subscription.handlers import DISCONNECTION_POINT
+from packages.valory.skills.contract_subscription.events import (
+    MARKETPLACE_REQUEST_TOPICS,
+    REQUEST_TOPICS,
+    to_topic,
+)
 from packages.valory.skills.contract_subscription.models import Params
 from packages.valory.skills.websocket_client.behaviours import (
     SubscriptionBehaviour as BaseSubscriptionBehaviour,
@@ -55,6 +59,7 @@ class ContractSubscriptionBehaviour(BaseSubscriptionBehaviour):
     def setup(self) -> None:
         """Implement the setup."""
         self._last_subscription_check = None
+        self._pending_payloads: List[str] = []
 
         # if we are using polling, then we don't set up an contract subscription
         if self.params.use_polling:
@@ -64,32 +69,47 @@ class ContractSubscriptionBehaviour(BaseSubscriptionBehaviour):
             if connection.component_id.name == WEBSOCKET_CLIENT_CONNECTION_NAME:
                 self._ws_client_connection = cast(WebSocketClient, connection)
 
-    def create_contract_subscription_payload(self) -> str:
-        """Create subscription payload."""
-        return json.dumps(
-            {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "eth_subscribe",
-                "params": ["logs", {"address": self.params.contract_address}],
-            }
-        )
-
-    def create_contract_filter_payload(self, disconnection_point: int) -> str:
-        """Create subscription payload."""
-        return json.dumps(
-            {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "eth_newFilter",
-                "params": [
-                    {
-                        "fromBlock": disconnection_point,
-                        "address": self.params.contract_address,
-                    }
-                ],
-            }
-        )
+    def create_contract_subscription_payloads(self) -> List[str]:
+        """
+        Create the subscription payloads.
+
+        The logs are filtered by topic, so that only the requests reach the agent:
+        - the `Request` events of the mechs which receive their requests directly, and
+        - the `MarketplaceRequest` events of the marketplace, which are addressed to our marketplace mechs.
+        """
+        filters = []
+        if len(self.params.agent_mech_addresses) > 0:
+            filters.append(
+                {
+                    "address": self.params.agent_mech_addresses,
+                    "topics": [REQUEST_TOPICS],
+                }
+            )
+        if len(self.params.marketplace_mech_addresses) > 0:
+            filters.append(
+                {
+                    "address": self.params.mech_marketplace_address,
+                    "topics": [
+                        MARKETPLACE_REQUEST_TOPICS,
+                        None,
+                        [
+                            to_topic(mech)
+                            for mech in self.params.marketplace_mech_addresses
+                        ],
+                    ],
+                }
+            )
+        return [
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "eth_subscribe",
+                    "params": ["logs", logs_filter],
+                }
+            )
+            for request_id, logs_filter in enumerate(filters, start=1)
+        ]
 
     def act(self) -> None:
         """Perform subcription."""
@@ -101,29 +121,29 @@ class ContractSubscriptionBehaviour(BaseSubscriptionBehaviour):
         if self.subscribing or self.checking_subscription:
             return
 
-        disconnection_point = self.context.shared_state.get(DISCONNECTION_POINT, None)
-        if self.subscribed and disconnection_point is not None:
-            self.context.logger.info(
-                f"Requesting block filter for {disconnection_point}"
-            )
-            self._ws_send(
-                payload=self.create_contract_filter_payload(
-                    disconnection_point=disconnection_point
-                ),
-                subscription_id=self.params.subscription_id,
-            )
-            self.context.shared_state[DISCONNECTION_POINT] = None
+        if self.subscribed and len(self._pending_payloads) > 0:
+            # the rest of the filters are subscribed to over the same websocket
+            for payload in self._pending_payloads:
+                self._ws_send(
+                    payload=payload, subscription_id=self.params.subscription_id
+                )
+            self._pending_payloads = []
 
         if self.subscribed:
             self.check_subscription()
             return
 
         if self.unsubscribed:
+            payloads = self.create_contract_subscription_payloads()
+            if len(payloads) == 0:
+                self.context.logger.warning("There are no contracts to subscribe to.")
+                return
             self._create_subscription(
                 provider=self.params.websocket_provider,
                 subscription_id=self.params.subscription_id,
-                subscription_payload=self.create_contract_subscription_payload(),
+                subscription_payload=payloads[0],
             )
+            self._pending_payloads = payloads[1:]
             self.context.shared_state[WEBSOCKET_SUBSCRIPTION_STATUS][
                 self.params.subscription_id
             ] = SubscriptionStatus.SUBSCRIBING
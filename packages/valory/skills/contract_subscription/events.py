@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the decoding of the request events from the logs of the subscriptions."""
+from typing import Any, Dict, List, Optional
+
+from eth_abi import decode
+from eth_utils import keccak, to_checksum_address
+
+from packages.valory.contracts.agent_mech.contract import partial_abis
+
+
+REQUEST_EVENT_NAME = "Request"
+MARKETPLACE_REQUEST_EVENT_NAME = "MarketplaceRequest"
+MARKETPLACE_REQUEST_EVENT_ABI = {
+    "anonymous": False,
+    "inputs": [
+        {
+            "indexed": True,
+            "internalType": "address",
+            "name": "requester",
+            "type": "address",
+        },
+        {
+            "indexed": True,
+            "internalType": "address",
+            "name": "requestedMech",
+            "type": "address",
+        },
+        {
+            "indexed": False,
+            "internalType": "uint256",
+            "name": "requestId",
+            "type": "uint256",
+        },
+        {
+            "indexed": False,
+            "internalType": "bytes",
+            "name": "data",
+            "type": "bytes",
+        },
+    ],
+    "name": MARKETPLACE_REQUEST_EVENT_NAME,
+    "type": "event",
+}
+
+
+def get_event_signature(event_abi: Dict[str, Any]) -> str:
+    """Get the signature of an event, e.g., `Request(address,uint256,bytes)`."""
+    types = ",".join(event_input["type"] for event_input in event_abi["inputs"])
+    return f"{event_abi['name']}({types})"
+
+
+def get_event_topic(event_abi: Dict[str, Any]) -> str:
+    """Get the topic0 of an event, i.e., the hash of its signature."""
+    return "0x" + keccak(text=get_event_signature(event_abi)).hex()
+
+
+def build_event_abis(
+    abis: List[List[Dict[str, Any]]], event_names: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """Build the ABIs of the given events by topic0, from all the versions of the provided ABIs."""
+    event_abis = {}
+    for abi in abis:
+        for entry in abi:
+            if entry["type"] == "event" and entry["name"] in event_names:
+                event_abis[get_event_topic(entry)] = entry
+    return event_abis
+
+
+# all the versions of the events are cached by topic0, so that a log is decoded with a single lookup
+REQUEST_EVENT_ABIS = build_event_abis(partial_abis, [REQUEST_EVENT_NAME])
+MARKETPLACE_REQUEST_EVENT_ABIS = build_event_abis(
+    [[MARKETPLACE_REQUEST_EVENT_ABI]], [MARKETPLACE_REQUEST_EVENT_NAME]
+)
+REQUEST_TOPICS = list(REQUEST_EVENT_ABIS.keys())
+MARKETPLACE_REQUEST_TOPICS = list(MARKETPLACE_REQUEST_EVENT_ABIS.keys())
+
+
+def to_topic(address: str) -> str:
+    """Encode an address as a topic, i.e., left padded to 32 bytes."""
+    return "0x" + address[2:].lower().rjust(64, "0")
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert a quantity of a log, given either as a hex string or as an int, to int."""
+    if value is None or isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+def _decode_topic(abi_type: str, topic: str) -> Any:
+    """Decode an indexed argument from its topic."""
+    (value,) = decode([abi_type], bytes.fromhex(topic[2:]))
+    return value
+
+
+def decode_log(
+    log: Dict[str, Any], event_abis: Dict[str, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Decode a log of one of the provided events.
+
+    The log is decoded from its topics and data, as it was received in the notification.
+
+    :param log: the log, in the format of `eth_getLogs` and of the `logs` subscriptions.
+    :param event_abis: the ABIs of the events to decode, by topic0.
+    :return: the event, in the format of the `get_request_events` of the contracts, or None if the log is not one of the events.
+    """
+    topics = log.get("topics", [])
+    if len(topics) == 0 or log.get("removed", False):
+        return None
+
+    event_abi = event_abis.get(topics[0].lower(), None)
+    if event_abi is None:
+        return None
+
+    indexed_inputs = [arg for arg in event_abi["inputs"] if arg["indexed"]]
+    non_indexed_inputs = [arg for arg in event_abi["inputs"] if not arg["indexed"]]
+    if len(indexed_inputs) != len(topics) - 1:
+        # same signature, but not the same indexed arguments
+        return None
+
+    args = {
+        arg["name"]: _decode_topic(arg["type"], topic)
+        for arg, topic in zip(indexed_inputs, topics[1:])
+    }
+    values = decode(
+        [arg["type"] for arg in non_indexed_inputs],
+        bytes.fromhex(log.get("data", "0x")[2:]),
+    )
+    args.update({arg["name"]: value for arg, value in zip(non_indexed_inputs, values)})
+    for arg in event_abi["inputs"]:
+        if arg["type"] == "address":
+            args[arg["name"]] = to_checksum_address(args[arg["name"]])
+
+    return {
+        "tx_hash": log.get("transactionHash", None),
+        "block_number": _to_int(log.get("blockNumber", None)),
+        "log_index": _to_int(log.get("logIndex", None)),
+        **args,
+        "contract_address": to_checksum_address(log["address"]),
+    }
+
+
+def decode_request_log(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a log of a `Request` of a mech, or of a `MarketplaceRequest` of the marketplace.
+
+    :param log: the log, in the format of `eth_getLogs` and of the `logs` subscriptions.
+    :return: the request, in the format of the `get_request_events` of the corresponding contract, or None if the log is not a request.
+    """
+    event = decode_log(log, REQUEST_EVENT_ABIS)
+    if event is not None:
+        return event
+
+    event = decode_log(log, MARKETPLACE_REQUEST_EVENT_ABIS)
+    if event is None:
+        return None
+    # the marketplace requests are not bound to a mech contract, the designated mech delivers them
+    del event["contract_address"]
+    event["sender"] = event["requester"]
+    return event
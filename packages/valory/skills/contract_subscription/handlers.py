@@ -21,13 +21,12 @@
 """This package contains a scaffold of a handler."""
 
 import json
-import time
-from typing import Any
-
-from web3 import Web3
-from web3.types import TxReceipt
+from typing import cast
 
 from packages.valory.protocols.websocket_client.message import WebsocketClientMessage
+from packages.valory.skills.contract_subscription.events import decode_request_log
+from packages.valory.skills.contract_subscription.models import Params
+from packages.valory.skills.websocket_client.buffer import SubscriptionBuffer
 from packages.valory.skills.websocket_client.handlers import (
     SubscriptionStatus,
     WEBSOCKET_SUBSCRIPTION_STATUS,
@@ -37,54 +36,43 @@ from packages.valory.skills.websocket_client.handlers import (
 )
 
 
-JOB_QUEUE = "pending_tasks"
-DISCONNECTION_POINT = "disconnection_point"
+# the requests are ingested by the task execution skill, along with the polled ones
+JOB_QUEUE = "pushed_requests"
+BACKFILL_REQUIRED = "backfill_required"
 
 
 class WebSocketHandler(BaseWebSocketHandler):
     """This class scaffolds a handler."""
 
     SUPPORTED_PROTOCOL = WebsocketClientMessage.protocol_id
-    w3: Web3 = None
-    contract = None
-
-    def __init__(self, **kwargs: Any) -> None:
-        """Initialize the handler."""
-        self.websocket_provider = kwargs.pop("websocket_provider")
-        self.contract_to_monitor = kwargs.pop("contract_to_monitor")
-        super().__init__(**kwargs)
 
     def setup(self) -> None:
         """Implement the setup."""
         super().setup()
 
-        self.context.shared_state[JOB_QUEUE] = []
-        self.context.shared_state[DISCONNECTION_POINT] = None
-        self._last_processed_block = None
-
-        # loads the contracts from the config file
-        with open(
-            "vendor/valory/contracts/agent_mech/build/AgentMech.json",
-            "r",
-            encoding="utf-8",
-        ) as file:
-            abi = json.load(file)["abi"]
-
-        self.w3 = Web3(  # pylint: disable=C0103
-            Web3.HTTPProvider(self.websocket_provider)
+        # the requests are bounded like the data of any other subscription, until they are ingested
+        params = cast(Params, self.context.params)
+        self.context.shared_state[JOB_QUEUE] = SubscriptionBuffer(
+            capacity=params.subscription_buffer_capacity,
+            drop_policy=params.subscription_buffer_drop_policy,
         )
-        self.contract = self.w3.eth.contract(address=self.contract_to_monitor, abi=abi)
 
     def handle(self, message: WebsocketClientMessage) -> None:
         """Handle message."""
+        subscription_status = self.context.shared_state[
+            WEBSOCKET_SUBSCRIPTION_STATUS
+        ].get(message.subscription_id, None)
         super().handle(message)
-        if self.context.shared_state[WEBSOCKET_SUBSCRIPTION_STATUS][
-            message.subscription_id
-        ] in (SubscriptionStatus.UNSUBSCRIBED, SubscriptionStatus.SUBSCRIBING):
-            self.context.logger.info(
-                f"Setting disconnection point to {self._last_processed_block}"
+        if (
+            subscription_status == SubscriptionStatus.SUBSCRIBING
+            and self.context.shared_state[WEBSOCKET_SUBSCRIPTION_STATUS].get(
+                message.subscription_id, None
             )
-            self.context.shared_state[DISCONNECTION_POINT] = self._last_processed_block
+            == SubscriptionStatus.SUBSCRIBED
+        ):
+            # the requests that were made while (re)subscribing are backfilled by polling
+            self.context.logger.info("Subscribed, requesting a backfill.")
+            self.context.shared_state[BACKFILL_REQUIRED] = True
 
     def handle_recv(self, message: WebsocketClientMessage) -> None:
         """Handler `RECV` performative"""
@@ -99,44 +87,44 @@ class WebSocketHandler(BaseWebSocketHandler):
             ] = SubscriptionStatus.UNSUBSCRIBED
             return
 
-        self.context.logger.info(
-            f"Received {data} from subscription {message.subscription_id}"
-        )
-
         if set(data.keys()) == {"id", "result", "jsonrpc"}:
             self.context.logger.info(f"Received response: {data}")
             return
 
-        self.context.logger.info("Extracting data")
-        tx_hash = data["params"]["result"]["transactionHash"]
-        no_args = True
-        limit = 0
-        while no_args and limit < 10:
-            event_args, no_request = self._get_tx_args(tx_hash)
-            if no_request:
-                self.context.logger.info("Event not a Request.")
-                break
-            if len(event_args) == 0:
-                self.context.logger.info(f"Could not get event args. tx_hash={tx_hash}")
-                time.sleep(1)
-                limit += 1
-                return
-            no_args = False
-
-        if len(event_args) != 0:
-            self.context.shared_state[JOB_QUEUE].append(event_args)
-            self.context.logger.info(f"Added job to queue: {event_args}")
-
-    def _get_tx_args(self, tx_hash: str) -> Any:
-        """Get the transaction arguments."""
+        # the notification carries the full log, so the event is decoded from it directly
+        log = data.get("params", {}).get("result", {})
         try:
-            tx_receipt: TxReceipt = self.w3.eth.get_transaction_receipt(tx_hash)
-            self._last_processed_block = tx_receipt["blockNumber"]
-            rich_logs = self.contract.events.Request().processReceipt(tx_receipt)  # type: ignore
-            return dict(rich_logs[0]["args"]), False
-
+            event_args = decode_request_log(log)
         except Exception as exc:  # pylint: disable=W0718
             self.context.logger.error(
-                f"An exception occurred while trying to get the transaction arguments for {tx_hash}: {exc}"
+                f"An exception occurred while trying to decode the log {log}: {exc}"
+            )
+            return
+
+        if event_args is None:
+            self.context.logger.debug(
+                f"Event not a Request. tx_hash={log.get('transactionHash', None)}"
+            )
+            return
+
+        buffer = cast(SubscriptionBuffer, self.context.shared_state[JOB_QUEUE])
+        if buffer.append(event_args):
+            self.context.logger.warning(
+                f"The queue of the pushed requests is full, requests are being dropped; "
+                f"received: {buffer.num_received}, dropped: {buffer.num_dropped}"
+            )
+            # the dropped requests are backfilled by polling
+            self.context.shared_state[BACKFILL_REQUIRED] = True
+        self.context.logger.info(
+            f"Added job to queue: requestId={event_args['requestId']}, tx_hash={event_args['tx_hash']}"
+        )
+
+    def handle_error(self, message: WebsocketClientMessage) -> None:
+        """Handler `ERROR` performative"""
+        super().handle_error(message)
+        if message.alive:
+            # e.g., the notifications were dropped since the agent did not keep up, their requests are backfilled by polling
+            self.context.logger.info(
+                f"The subscription {message.subscription_id} may have missed requests, requesting a backfill."
             )
-            return {}, True
+            self.context.shared_state[BACKFILL_REQUIRED] = True
@@ -18,13 +18,14 @@
 # ------------------------------------------------------------------------------
 
 """This module contains the shared state for the abci skill of Mech."""
-from typing import Any
+from typing import Any, Dict, List
 
 from packages.valory.skills.websocket_client.models import Params as BaseParams
 
 
 DEFAULT_WEBSOCKET_PROVIDER = "ws://localhost:8001"
 DEFAULT_CONTRACT_ADDRESS = "0xFf82123dFB52ab75C417195c5fDB87630145ae81"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 
 
 class Params(BaseParams):
@@ -35,4 +36,29 @@ class Params(BaseParams):
         super().__init__(*args, **kwargs)
 
         self.use_polling = kwargs.get("use_polling", False)
-        self.contract_address = kwargs.get("contract_address", DEFAULT_CONTRACT_ADDRESS)
+        self.mech_to_config: Dict[str, Dict[str, bool]] = kwargs.get(
+            "mech_to_config", {DEFAULT_CONTRACT_ADDRESS: {}}
+        )
+        self.mech_marketplace_address: str = kwargs.get(
+            "mech_marketplace_address", ZERO_ADDRESS
+        )
+
+    @property
+    def agent_mech_addresses(self) -> List[str]:
+        """The addresses of the mechs which receive their requests directly."""
+        return [
+            mech
+            for mech, config in self.mech_to_config.items()
+            if not config.get("is_marketplace_mech", False)
+        ]
+
+    @property
+    def marketplace_mech_addresses(self) -> List[str]:
+        """The addresses of the mechs which receive their requests through the marketplace."""
+        if self.mech_marketplace_address == ZERO_ADDRESS:
+            return []
+        return [
+            mech
+            for mech, config in self.mech_to_config.items()
+            if config.get("is_marketplace_mech", False)
+        ]
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the decoding of the request events from the logs of the subscriptions."""
+
+from typing import Any, Dict
+
+from packages.valory.skills.contract_subscription.events import decode_request_log
+
+
+MECH_ADDRESS = "0x77af31De935740567Cf4fF1986D04B2c964A786a"
+MARKETPLACE_ADDRESS = "0x4554fE75c1f5576c1d7F765B2A036c199Adae329"
+SENDER_ADDRESS = "0x9e7Ee5fbAe0e3B4dFB6e3b82F8F3B6b2C5a2b5E0"
+TX_HASH = "0x" + "5f" * 32
+REQUEST_DATA = bytes.fromhex("1220" + "ab" * 32)
+
+# the topic0 of `Request(address,uint256,bytes)`, of the legacy mechs
+REQUEST_TOPIC = "0x4bda649efe6b98b0f9c1d5e859c29e20910f45c66dabfe6fad4a4881f7faf9cc"
+# the topic0 of `Request(address,uint256,uint256,bytes)`, of the mechs with nonces
+REQUEST_WITH_NONCE_TOPIC = (
+    "0x415baea36dd0457eaf27cbe8dd3691cb1d0b387aac1539c4d118198aba024db3"
+)
+# the topic0 of `MarketplaceRequest(address,address,uint256,bytes)`
+MARKETPLACE_REQUEST_TOPIC = (
+    "0x4827c9fc8074fe94dd4939d4228739ff43d7072a6504a6f413ffa4967c120175"
+)
+SENDER_TOPIC = "0x0000000000000000000000009e7ee5fbae0e3b4dfb6e3b82f8f3b6b2c5a2b5e0"
+MECH_TOPIC = "0x00000000000000000000000077af31de935740567cf4ff1986d04b2c964a786a"
+
+# the non indexed arguments of a request with the id 123
+REQUEST_LOG_DATA = (
+    "0x"
+    "000000000000000000000000000000000000000000000000000000000000007b"
+    "0000000000000000000000000000000000000000000000000000000000000040"
+    "0000000000000000000000000000000000000000000000000000000000000022"
+    "1220abababababababababababababababababababababababababababababab"
+    "abab000000000000000000000000000000000000000000000000000000000000"
+)
+# the non indexed arguments of a request with the id 123, and the id with nonce 456
+REQUEST_WITH_NONCE_LOG_DATA = (
+    "0x"
+    "000000000000000000000000000000000000000000000000000000000000007b"
+    "00000000000000000000000000000000000000000000000000000000000001c8"
+    "0000000000000000000000000000000000000000000000000000000000000060"
+    "0000000000000000000000000000000000000000000000000000000000000022"
+    "1220abababababababababababababababababababababababababababababab"
+    "abab000000000000000000000000000000000000000000000000000000000000"
+)
+
+
+def get_log(address: str, *topics: str, data: str) -> Dict[str, Any]:
+    """Get a log, as it is received in the notifications of the `logs` subscriptions."""
+    return {
+        "address": address.lower(),
+        "topics": list(topics),
+        "data": data,
+        "blockNumber": "0x2183f2c",
+        "transactionHash": TX_HASH,
+        "transactionIndex": "0x3",
+        "blockHash": "0x" + "c4" * 32,
+        "logIndex": "0x1a",
+        "removed": False,
+    }
+
+
+def test_decode_request_log() -> None:
+    """Test the decoding of a `Request` of a legacy mech."""
+    log = get_log(MECH_ADDRESS, REQUEST_TOPIC, SENDER_TOPIC, data=REQUEST_LOG_DATA)
+    assert decode_request_log(log) == {
+        "tx_hash": TX_HASH,
+        "block_number": 35143468,
+        "log_index": 26,
+        "sender": SENDER_ADDRESS,
+        "requestId": 123,
+        "data": REQUEST_DATA,
+        "contract_address": MECH_ADDRESS,
+    }
+
+
+def test_decode_request_log_with_nonce() -> None:
+    """Test the decoding of a `Request` of a mech with nonces."""
+    log = get_log(
+        MECH_ADDRESS,
+        REQUEST_WITH_NONCE_TOPIC,
+        SENDER_TOPIC,
+        data=REQUEST_WITH_NONCE_LOG_DATA,
+    )
+    event = decode_request_log(log)
+    assert event is not None
+    assert event["requestId"] == 123
+    assert event["requestIdWithNonce"] == 456
+    assert event["sender"] == SENDER_ADDRESS
+    assert event["data"] == REQUEST_DATA
+    assert event["contract_address"] == MECH_ADDRESS
+
+
+def test_decode_marketplace_request_log() -> None:
+    """Test that a `MarketplaceRequest` is decoded as a request of its requester, which is not bound to a mech."""
+    log = get_log(
+        MARKETPLACE_ADDRESS,
+        MARKETPLACE_REQUEST_TOPIC,
+        SENDER_TOPIC,
+        MECH_TOPIC,
+        data=REQUEST_LOG_DATA,
+    )
+    assert decode_request_log(log) == {
+        "tx_hash": TX_HASH,
+        "block_number": 35143468,
+        "log_index": 26,
+        "requester": SENDER_ADDRESS,
+        "requestedMech": MECH_ADDRESS,
+        "requestId": 123,
+        "data": REQUEST_DATA,
+        "sender": SENDER_ADDRESS,
+    }
+
+
+def test_decode_request_log_of_other_event() -> None:
+    """Test that the logs of the other events are not decoded."""
+    deliver_topic = "0x" + "3e" * 32
+    log = get_log(MECH_ADDRESS, deliver_topic, SENDER_TOPIC, data=REQUEST_LOG_DATA)
+    assert decode_request_log(log) is None
+    assert decode_request_log({**log, "topics": []}) is None
+
+
+def test_decode_request_log_removed() -> None:
+    """Test that the logs which are removed by a reorg are not decoded."""
+    log = get_log(MECH_ADDRESS, REQUEST_TOPIC, SENDER_TOPIC, data=REQUEST_LOG_DATA)
+    assert decode_request_log({**log, "removed": True}) is None
+
+
+def test_decode_request_log_with_other_indexed_arguments() -> None:
+    """Test that an event with the same signature, but other indexed arguments, is not decoded."""
+    log = get_log(MECH_ADDRESS, REQUEST_TOPIC, data=REQUEST_LOG_DATA)
+    assert decode_request_log(log) is None
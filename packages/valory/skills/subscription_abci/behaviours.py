@@ -83,32 +83,27 @@ class UpdateSubscriptionBehaviour(BaseSubscriptionBehaviour):
             yield from self.wait_until_round_end()
         self.set_done()
 
-    def _should_update_subscription(
-        self,
-        mech_address: str,
-        expected_subscription: str,
-        expected_token_id: int,
-    ) -> Generator[None, None, Optional[bool]]:
-        """Check if the agent should update the subscription."""
+    def _get_subscriptions(
+        self, mech_addresses: List[str]
+    ) -> Generator[None, None, Optional[Dict[str, Dict[str, Any]]]]:
+        """Get the subscriptions of the provided mechs in a single multicall."""
         contract_api_msg = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-            contract_address=mech_address,
+            contract_address=self.params.multicall_address,
             contract_id=str(AgentMechContract.contract_id),
-            contract_callable="get_subscription",
+            contract_callable="get_subscriptions",
+            mech_addresses=mech_addresses,
         )
         if (
             contract_api_msg.performative != ContractApiMessage.Performative.STATE
         ):  # pragma: nocover
             self.context.logger.warning(
-                f"get_subscription unsuccessful!: {contract_api_msg}"
+                f"get_subscriptions unsuccessful!: {contract_api_msg}"
             )
             return None
 
-        actual_subscription_address = cast(str, contract_api_msg.state.body["nft"])
-        actual_token_id = cast(int, contract_api_msg.state.body["token_id"])
-        return (
-            actual_subscription_address != expected_subscription
-            or actual_token_id != expected_token_id
+        return cast(
+            Dict[str, Dict[str, Any]], contract_api_msg.state.body["subscriptions"]
         )
 
     def _get_subscription_update_tx(
@@ -146,18 +141,31 @@ class UpdateSubscriptionBehaviour(BaseSubscriptionBehaviour):
     ) -> Generator[None, None, List[Dict[str, Any]]]:
         """Get the mech update hash tx."""
         txs = []
-        for mech_address, subscription in self.params.mech_to_subscription.items():
+        mech_to_subscription = self.params.mech_to_subscription
+        actual_subscriptions = yield from self._get_subscriptions(
+            list(mech_to_subscription.keys())
+        )
+        if actual_subscriptions is None:
+            # something went wrong
+            self.context.logger.warning(
+                "Could not check if the subscriptions should be updated."
+            )
+            return txs
+
+        for mech_address, subscription in mech_to_subscription.items():
             subscription_address = subscription.get("tokenAddress")
             token_id = subscription.get("tokenId")
-            should_update = yield from self._should_update_subscription(
-                mech_address, subscription_address, token_id
-            )
-            if should_update is None:
+            actual_subscription = actual_subscriptions.get(mech_address, None)
+            if actual_subscription is None:
                 # something went wrong
                 self.context.logger.warning(
                     f"Could not check if subscription should be updated for {mech_address}."
                 )
                 continue
+            should_update = (
+                actual_subscription["nft"] != subscription_address
+                or actual_subscription["token_id"] != token_id
+            )
             if not should_update:
                 # no need to update
                 self.context.logger.info(
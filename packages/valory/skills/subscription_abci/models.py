@@ -61,6 +61,7 @@ class Params(BaseParams):
         )
         self.manual_gas_limit = self._ensure_get("manual_gas_limit", kwargs, int)
         self.multisend_address = self._ensure_get("multisend_address", kwargs, str)
+        self.multicall_address = self._ensure_get("multicall_address", kwargs, str)
         super().__init__(*args, **kwargs)
 
     @classmethod
@@ -21,10 +21,8 @@
 import json
 import threading
 import time
-from asyncio import Future
-from concurrent.futures import ProcessPoolExecutor
-from concurrent.futures.process import BrokenProcessPool
-from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, cast
 
 from aea.helpers.cid import to_v1
 from aea.mail.base import EnvelopeContext
@@ -52,6 +50,12 @@ from packages.valory.protocols.ledger_api import LedgerApiMessage
 from packages.valory.skills.task_execution.handlers import LAST_SUCCESSFUL_EXECUTED_TASK
 from packages.valory.skills.task_execution.models import Params
 from packages.valory.skills.task_execution.utils.apis import KeyChain
+from packages.valory.skills.task_execution.utils.batch import (
+    BATCH_CALLABLE_KEY,
+    ToolBatch,
+    get_max_batch_size,
+    split_batch_result,
+)
 from packages.valory.skills.task_execution.utils.benchmarks import TokenCounterCallback
 from packages.valory.skills.task_execution.utils.cost_calculation import (
     get_cost_for_done_task,
@@ -59,17 +63,36 @@ from packages.valory.skills.task_execution.utils.cost_calculation import (
 from packages.valory.skills.task_execution.utils.ipfs import (
     ComponentPackageLoader,
     get_ipfs_file_hash,
+    get_ipfs_hash_of_files,
     to_multihash,
 )
-from packages.valory.skills.task_execution.utils.task import AnyToolAsTask
+from packages.valory.skills.task_execution.utils.registry import RequestRegistry
+from packages.valory.skills.task_execution.utils.shared import (
+    load_shared_values,
+    remove_shared_values,
+)
+from packages.valory.skills.task_execution.utils.supervisor import (
+    TaskFuture,
+    TaskSupervisor,
+)
+from packages.valory.skills.task_execution.utils.task import (
+    AnyToolAsTask,
+    TIMEOUT_ERRORS,
+    is_async_callable,
+)
+from packages.valory.skills.task_execution.utils.upload import Upload
 
 
 PENDING_TASKS = "pending_tasks"
+PUSHED_REQUESTS = "pushed_requests"
+BACKFILL_REQUIRED = "backfill_required"
 DONE_TASKS = "ready_tasks"
 DONE_TASKS_LOCK = "lock"
 GNOSIS_CHAIN = "gnosis"
 
 LEDGER_API_ADDRESS = str(LEDGER_CONNECTION_PUBLIC_ID)
+# the extra time that an async task is given, so that it is cancelled by its worker rather than by restarting the pool
+ASYNC_DEADLINE_GRACE = 5.0
 
 
 class TaskExecutionBehaviour(SimpleBehaviour):
@@ -78,16 +101,21 @@ class TaskExecutionBehaviour(SimpleBehaviour):
     def __init__(self, **kwargs: Any):
         """Initialise the agent."""
         super().__init__(**kwargs)
-        # we only want to execute one task at a time, for the time being
-        self._executor = ProcessPoolExecutor(max_workers=1)
+        # we only want to execute one task at a time, for the time being.
+        # the resource limits of the tasks are set in the setup, once the params are available
+        self._supervisor = TaskSupervisor()
         self._executing_task: Optional[Dict[str, Any]] = None
+        # the tasks of a tool which are collected to be executed in a single call
+        self._tool_batch: Optional[ToolBatch] = None
         self._tools_to_package_hash: Dict[str, str] = {}
         self._all_tools: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+        # the tools with an async entry point, which run as coroutines in their worker
+        self._async_tools: Set[str] = set()
         self._inflight_tool_req: Optional[str] = None
         self._done_task: Optional[Dict[str, Any]] = None
         self._last_polling: Optional[float] = None
         self._invalid_request = False
-        self._async_result: Optional[Future] = None
+        self._async_result: Optional[TaskFuture] = None
         self._keychain: Optional[KeyChain] = None
 
     def setup(self) -> None:
@@ -95,11 +123,33 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         self.context.logger.info("Setting up TaskExecutionBehaviour")
         self._tools_to_package_hash = self.params.tools_to_package_hash
         self._keychain = KeyChain(self.params.api_keys)
+        self._supervisor = TaskSupervisor(
+            max_cpu_time=self.params.max_task_cpu_time,
+            max_memory=self.params.max_task_memory,
+        )
+
+    def teardown(self) -> None:
+        """Implement the teardown."""
+        # deliver the data which is still waiting to be batched
+        self._flush_acn_batches(flush_all=True)
+        num_uploads = len(self.params.upload_queue)
+        if num_uploads > 0:
+            self.context.logger.warning(
+                f"{num_uploads} responses were not confirmed to be stored on IPFS, so their tasks are not delivered."
+            )
+        self._supervisor.shutdown()
+        # the results of the tasks which timed out are never loaded
+        remove_shared_values()
 
     def act(self) -> None:
         """Implement the act."""
+        self._expire_requests()
         self._download_tools()
+        self._ingest_reqs()
+        self._release_scheduled_reqs()
         self._execute_task()
+        self._upload_results()
+        self._flush_acn_batches()
         self._check_for_new_reqs()
 
     @property
@@ -113,7 +163,7 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         return cast(Params, self.context.params)
 
     @property
-    def request_id_to_num_timeouts(self) -> Dict[int, int]:
+    def request_id_to_num_timeouts(self) -> RequestRegistry:
         """Maps the request id to the number of times it has timed out."""
         return self.params.request_id_to_num_timeouts
 
@@ -126,11 +176,15 @@ class TaskExecutionBehaviour(SimpleBehaviour):
 
     def count_timeout(self, request_id: int) -> None:
         """Increase the timeout for a request."""
-        self.request_id_to_num_timeouts[request_id] += 1
+        num_timeouts = self.request_id_to_num_timeouts.get(request_id, 0) + 1
+        self.request_id_to_num_timeouts.register(
+            request_id, num_timeouts, timeout=self.params.timeout_count_ttl
+        )
 
     def timeout_limit_reached(self, request_id: int) -> bool:
         """Check if the timeout limit has been reached."""
-        return self.params.timeout_limit <= self.request_id_to_num_timeouts[request_id]
+        num_timeouts = self.request_id_to_num_timeouts.get(request_id, 0)
+        return self.params.timeout_limit <= num_timeouts
 
     @property
     def pending_tasks(self) -> List[Dict[str, Any]]:
@@ -146,6 +200,9 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         """If we should poll the contract."""
         if self._last_polling is None:
             return True
+        if self.context.shared_state.pop(BACKFILL_REQUIRED, False):
+            # the websocket subscription was re-established, or dropped requests, which are backfilled right away
+            return True
         return self._last_polling + self.params.polling_interval <= time.time()
 
     def _is_executing_task_ready(self) -> bool:
@@ -170,14 +227,65 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         if self._invalid_request:
             return None
         try:
-            async_result = cast(Future, self._async_result)
-            return async_result.result()
+            async_result = cast(TaskFuture, self._async_result)
+            return load_shared_values(async_result.result())
+        except TIMEOUT_ERRORS as e:
+            # an async task which was cancelled by its worker, handled as timed out
+            return e
         except Exception as e:  # pylint: disable=broad-except
             self.context.logger.error(
                 "Exception raised while executing task: {}".format(str(e))
             )
             return None
 
+    def _get_executing_task_usage(self) -> Optional[Dict[str, Any]]:
+        """Get the resources that the executing task used, if it was executed."""
+        if self._invalid_request or self._async_result is None:
+            return None
+        return self._async_result.usage
+
+    def _expire_requests(self) -> None:
+        """Expire the ipfs requests whose response has not arrived in time, and the stale timeout counts."""
+        now = time.time()
+        num_lost = self.params.req_to_callback.expire(now)
+        num_lost += self.params.upload_to_callback.expire(now)
+        self.request_id_to_num_timeouts.expire(now)
+        if num_lost > 0:
+            self.context.logger.info(
+                f"Tracked ipfs requests: {self.params.req_to_callback.stats}, "
+                f"tracked uploads: {self.params.upload_to_callback.stats}, "
+                f"tracked timeout counts: {self.request_id_to_num_timeouts.stats}"
+            )
+
+    def _handle_lost_response(self, nonce: Any, _callback: Callable) -> None:
+        """Handle an ipfs request whose response has not arrived in time, or has failed."""
+        self.context.logger.warning(
+            f"The response to the ipfs request with nonce {nonce} was not received "
+            f"within {self.params.response_timeout}s, or has failed."
+        )
+        self.params.in_flight_req = False
+
+    def _handle_lost_tool(self, nonce: Any, callback: Callable) -> None:
+        """Handle a lost response to a tool download, so that the tool is downloaded again."""
+        self._handle_lost_response(nonce, callback)
+        self._inflight_tool_req = None
+
+    def _handle_lost_task(self, nonce: Any, callback: Callable) -> None:
+        """Handle a lost response to a task download, as if the task had timed out."""
+        self._handle_lost_response(nonce, callback)
+        executing_task = cast(Dict[str, Any], self._executing_task)
+        req_id = executing_task.get("requestId", None)
+        self.count_timeout(req_id)
+        if not self.timeout_limit_reached(req_id):
+            self.context.logger.info(f"Adding task {req_id} to the end of the queue")
+            self.pending_tasks.append(executing_task)
+            self._executing_task = None
+            return
+        self.context.logger.warning(
+            f"The data of task {req_id} could not be downloaded {self.params.timeout_limit} times."
+        )
+        self._invalid_request = True
+
     def _download_tools(self) -> None:
         """Download tools."""
         if self._inflight_tool_req is not None:
@@ -192,7 +300,9 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             # read one at a time
             ipfs_msg, message = self._build_ipfs_get_file_req(file_hash)
             self._inflight_tool_req = tool
-            self.send_message(ipfs_msg, message, self._handle_get_tool)
+            self.send_message(
+                ipfs_msg, message, self._handle_get_tool, self._handle_lost_tool
+            )
             return
 
     def _handle_get_tool(self, message: IpfsMessage, dialogue: Dialogue) -> None:
@@ -202,6 +312,9 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         )
         tool_req = cast(str, self._inflight_tool_req)
         self._all_tools[tool_req] = tool_py, callable_method, component_yaml
+        entry_points = (callable_method, component_yaml.get(BATCH_CALLABLE_KEY, None))
+        if any(is_async_callable(tool_py, method) for method in entry_points):
+            self._async_tools.add(tool_req)
         self._inflight_tool_req = None
 
     def _populate_from_block(self) -> None:
@@ -273,6 +386,8 @@ class TaskExecutionBehaviour(SimpleBehaviour):
                     my_mech=self._get_designated_marketplace_mech_address(),
                     chain_id=GNOSIS_CHAIN,
                     max_block_window=self.params.max_block_window,
+                    multicall_address=self.params.multicall_address,
+                    chunk_size=self.params.priority_check_chunk_size,
                 )
             ),
             counterparty=LEDGER_API_ADDRESS,
@@ -280,6 +395,70 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         )
         self.context.outbox.put_message(message=contract_api_msg)
 
+    def _ingest_reqs(self) -> None:
+        """Move the new reqs, both the pushed and the polled ones, to the pending tasks."""
+        ingestion = self.params.request_ingestion
+        # the pushed reqs are buffered by the contract subscription skill, if it is used
+        pushed_reqs = self.context.shared_state.get(PUSHED_REQUESTS, None)
+        if pushed_reqs is not None and len(pushed_reqs) > 0:
+            ingestion.push(pushed_reqs.drain())
+
+        reqs = ingestion.drain()
+        if len(reqs) == 0:
+            return
+        reqs = [
+            req
+            for req in reqs
+            if req["block_number"] % self.params.num_agents == self.params.agent_index
+        ]
+        self.context.logger.info(f"Processing only {len(reqs)} of the new requests.")
+        reqs = self._schedule_marketplace_reqs(reqs)
+        self.pending_tasks.extend(reqs)
+
+    def _schedule_marketplace_reqs(
+        self, reqs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Schedule the marketplace reqs until their priority window passes, and return the rest."""
+        my_mech = next(
+            (
+                mech
+                for mech, config in self.params.mech_to_config.items()
+                if config.is_marketplace_mech
+            ),
+            None,
+        )
+        scheduler = self.params.marketplace_scheduler
+        ready_reqs, num_scheduled = [], 0
+        for req in reqs:
+            response_timeout = req.get("response_timeout", None)
+            if response_timeout is None:
+                # not a marketplace req, or its eligibility has already been checked
+                ready_reqs.append(req)
+                continue
+            is_priority_mech = (
+                my_mech is not None and req["priority_mech"].lower() == my_mech.lower()
+            )
+            # the priority mech can deliver right away, the rest have to wait for the timeout
+            deadline = 0 if is_priority_mech else response_timeout
+            num_scheduled += int(scheduler.schedule(req, deadline))
+
+        if num_scheduled > 0:
+            self.context.logger.info(
+                f"Scheduled {num_scheduled} marketplace requests, {len(scheduler)} "
+                f"are waiting. The next priority window ends at {scheduler.next_deadline()}."
+            )
+        return ready_reqs
+
+    def _release_scheduled_reqs(self) -> None:
+        """Move the marketplace reqs whose priority window has passed to the pending tasks."""
+        due_reqs = self.params.marketplace_scheduler.pop_due(time.time())
+        if len(due_reqs) == 0:
+            return
+        self.context.logger.info(
+            f"Priority window passed for {len(due_reqs)} marketplace requests."
+        )
+        self.pending_tasks.extend(due_reqs)
+
     def _execute_task(self) -> None:
         """Execute tasks."""
         # check if there is a task already executing
@@ -290,11 +469,18 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         if self._executing_task is not None:
             if self._is_executing_task_ready() or self._invalid_request:
                 task_result = self._get_executing_task_result()
-                self._handle_done_task(task_result)
+                self._handle_done_batch(task_result, self._get_executing_task_usage())
             elif self._has_executing_task_timed_out():
                 self._handle_timeout_task()
             return
 
+        batch = self._tool_batch
+        if batch is not None and batch.is_due(
+            time.time(), self.params.tool_batch_window
+        ):
+            self._execute_batch()
+            return
+
         if len(self.pending_tasks) == 0:
             # not tasks (requests) to execute
             return
@@ -303,6 +489,11 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         task_data = self.pending_tasks.pop(0)
         self.context.logger.info(f"Preparing task with data: {task_data}")
         self._executing_task = task_data
+        prefetched_data = task_data.pop("prefetched_data", None)
+        if prefetched_data is not None:
+            # the data was downloaded while the task waited for a batch of another tool
+            self._handle_task_data(prefetched_data)
+            return
         task_data_ = task_data["data"]
         ipfs_hash = get_ipfs_file_hash(task_data_)
         if ipfs_hash is None:
@@ -311,15 +502,26 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             return
         self.context.logger.info(f"IPFS hash: {ipfs_hash}")
         ipfs_msg, message = self._build_ipfs_get_file_req(ipfs_hash)
-        self.send_message(ipfs_msg, message, self._handle_get_task)
+        self.send_message(
+            ipfs_msg, message, self._handle_get_task, self._handle_lost_task
+        )
 
     def send_message(
-        self, msg: Message, dialogue: Dialogue, callback: Callable
+        self,
+        msg: Message,
+        dialogue: Dialogue,
+        callback: Callable,
+        on_lost: Optional[Callable] = None,
     ) -> None:
-        """Send message."""
+        """Send message, and track its response until it arrives, or is lost."""
         self.context.outbox.put_message(message=msg)
         nonce = dialogue.dialogue_label.dialogue_reference[0]
-        self.params.req_to_callback[nonce] = callback
+        self.params.req_to_callback.register(
+            nonce,
+            callback,
+            timeout=self.params.response_timeout,
+            on_expire=on_lost or self._handle_lost_response,
+        )
         self.params.in_flight_req = True
 
     def _get_designated_marketplace_mech_address(self) -> str:
@@ -330,8 +532,45 @@ class TaskExecutionBehaviour(SimpleBehaviour):
 
         raise ValueError("No marketplace mech address found")
 
-    def _handle_done_task(self, task_result: Any) -> None:
-        """Handle done tasks"""
+    def _handle_done_batch(
+        self, task_result: Any, usage: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Handle the executing task, or every task of the executing batch, as done."""
+        executing_task = cast(Dict[str, Any], self._executing_task)
+        batch_tasks = executing_task.pop("batch_tasks", None)
+        if batch_tasks is None:
+            self._handle_task_result(task_result, usage)
+            return
+        task_results = split_batch_result(task_result, len(batch_tasks))
+        if task_results is None:
+            self.context.logger.error(
+                f"The batch of {len(batch_tasks)} tasks did not return a result per task."
+            )
+            task_results = [None] * len(batch_tasks)
+        for batch_task, batch_task_result in zip(batch_tasks, task_results):
+            self._executing_task = batch_task
+            self._invalid_request = False
+            # the tasks of a batch are executed by the same call, so they share its usage
+            self._handle_task_result(batch_task_result, usage)
+
+    def _handle_task_result(
+        self, task_result: Any, usage: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Handle the result of the executing task, which may be the error it raised."""
+        if isinstance(task_result, TIMEOUT_ERRORS):
+            self._handle_timed_out_task()
+            return
+        if isinstance(task_result, Exception):
+            self.context.logger.error(
+                "Exception raised while executing task: {}".format(str(task_result))
+            )
+            task_result = None
+        self._handle_done_task(task_result, usage)
+
+    def _handle_done_task(
+        self, task_result: Any, usage: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Handle done tasks, along with the resources that their execution used."""
         executing_task = cast(Dict[str, Any], self._executing_task)
         req_id = executing_task.get("requestId", None)
         request_id_nonce = executing_task.get("requestIdWithNonce", None)
@@ -350,6 +589,8 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             "task_executor_address": task_executor,
             "tool": tool,
             "request_id_nonce": request_id_nonce,
+            "block_number": executing_task.get("block_number", None),
+            "resource_usage": usage,
         }
         if task_result is not None and len(task_result) == 5:
             # task succeeded
@@ -376,34 +617,110 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             self._keychain = keychain
 
         self.context.logger.info(f"Task result for request {req_id}: {task_result}")
-        msg, dialogue = self._build_ipfs_store_file_req(
-            {str(req_id): json.dumps(response)}
+        # the large artifacts of the result are stored as separate files, next to the response
+        response["result"], artifacts = self.params.artifact_extractor.extract(
+            response["result"], str(req_id)
+        )
+        self._store_response({str(req_id): json.dumps(response), **artifacts})
+
+    def _store_response(self, filename_to_obj: Dict[str, str]) -> None:
+        """
+        Share the hash of the response of the executing task via ACN, and upload the response to ipfs in the background.
+
+        The hash is computed locally, so the executor is free to take the next task right away.
+        The task is delivered on-chain only once the upload is confirmed, see `_handle_store_response`.
+
+        :param filename_to_obj: the response, under the name of the request id, and its artifacts.
+        """
+        executing_task = cast(Dict[str, Any], self._executing_task)
+        req_id, sender = (
+            executing_task["requestId"],
+            executing_task["sender"],
+        )
+        ipfs_hash = get_ipfs_hash_of_files(filename_to_obj)
+        self.context.logger.info(
+            f"Response for request {req_id} has IPFS hash {ipfs_hash}, uploading it in the background."
+        )
+        self.send_data_via_acn(
+            sender_address=sender,
+            request_id=str(req_id),
+            data=ipfs_hash,
         )
-        self.send_message(msg, dialogue, self._handle_store_response)
+        # for health check metrics
+        self.set_last_executed_task(req_id)
+        done_task = cast(Dict[str, Any], self._done_task)
+        upload = Upload(ipfs_hash, filename_to_obj, done_task, sender, executing_task)
+        if not self.params.upload_queue.add(upload):
+            self.context.logger.warning(
+                f"Response for request {req_id} is already being uploaded."
+            )
+        # reset tasks
+        self.request_id_to_num_timeouts.pop(req_id)
+        self._executing_task = None
+        self._done_task = None
+        self._invalid_request = False
+        self._upload_results()
+
+    def _upload_results(self) -> None:
+        """Upload the responses which are due to ipfs, without blocking the other requests."""
+        for upload in self.params.upload_queue.pop_due(time.time()):
+            msg, dialogue = self._build_ipfs_store_file_req(upload.files)
+            self.context.outbox.put_message(message=msg)
+            nonce = dialogue.dialogue_label.dialogue_reference[0]
+            self.params.upload_to_callback.register(
+                nonce,
+                partial(self._handle_store_response, upload),
+                timeout=self.params.response_timeout,
+                on_expire=partial(self._handle_failed_upload, upload),
+            )
+
+    def _handle_failed_upload(
+        self, upload: Upload, nonce: Any, _callback: Callable
+    ) -> None:
+        """
+        Handle an upload whose response has not arrived in time, or has failed, by attempting it again later.
 
-    def _restart_executor(self) -> None:
-        """Restarts the executor."""
-        self._executor.shutdown(wait=False)
-        # create a new executor
-        self._executor = ProcessPoolExecutor(max_workers=1)
+        Once the upload has run out of attempts, it is dropped, and its task is added to the end of the queue,
+        to be executed, and uploaded, again. Otherwise, the request would never be delivered,
+        since it has already been ingested, and it is not polled again.
+        """
+        req_id = upload.done_task["request_id"]
+        if self.params.upload_queue.fail(upload.cid, time.time()):
+            self.context.logger.warning(
+                f"Upload {nonce} of the response for request {req_id} failed, or was not confirmed "
+                f"within {self.params.response_timeout}s. It will be attempted again."
+            )
+            return
+        self.context.logger.error(
+            f"Upload of the response for request {req_id} failed {upload.num_attempts} times, and was dropped. "
+            f"Adding task {req_id} to the end of the queue. Uploads: {self.params.upload_queue.stats}"
+        )
+        self.pending_tasks.append(upload.task)
 
     def _handle_timeout_task(self) -> None:
         """Handle timeout tasks"""
         executing_task = cast(Dict[str, Any], self._executing_task)
+        batch_tasks = executing_task.pop("batch_tasks", [executing_task])
+        # the worker of the task is killed, as the task may never return, or ignore a cancellation.
+        # only then a new worker is started, for the next task.
+        pid = self._supervisor.kill()
+        self.context.logger.warning(
+            f"Killed the worker {pid} of the timed out task {executing_task.get('requestId', None)}."
+        )
+
+        for batch_task in batch_tasks:
+            self._executing_task = batch_task
+            self._handle_timed_out_task()
+
+    def _handle_timed_out_task(self) -> None:
+        """Add the executing task, which has timed out, to the end of the queue, or handle it as done."""
+        executing_task = cast(Dict[str, Any], self._executing_task)
         req_id = executing_task.get("requestId", None)
         self.count_timeout(req_id)
         self.context.logger.info(f"Task timed out for request {req_id}")
         self.context.logger.info(
-            f"Task {req_id} has timed out {self.request_id_to_num_timeouts[req_id]} times"
+            f"Task {req_id} has timed out {self.request_id_to_num_timeouts.get(req_id, 0)} times"
         )
-        async_result = cast(Future, self._async_result)
-        async_result.cancel()
-
-        # we restart the executor in case of a timeout.
-        # we do this because its possible the .cancel() call above is not respected
-        # by the executor. Since we only have 1 process running at a time, this would
-        # mean that the task being executed next would be queued. We want to avoid this.
-        self._restart_executor()
 
         # check if we can add the task to the end of the queue
         if not self.timeout_limit_reached(req_id):
@@ -450,7 +767,7 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             and task_data is not None
             and task_data["tool"] in self._tools_to_package_hash
         ):
-            self._prepare_task(task_data)
+            self._handle_task_data(task_data)
         elif is_data_valid and task_data is not None:
             tool = task_data["tool"]
             executing_task = cast(Dict[str, Any], self._executing_task)
@@ -461,38 +778,130 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             self.context.logger.warning("Data for task is not valid.")
             self._invalid_request = True
 
-    def _submit_task(self, fn: Any, *args: Any, **kwargs: Any) -> Future:
-        """Submit a task."""
-        try:
-            return self._executor.submit(fn, *args, **kwargs)  # type: ignore
-        except BrokenProcessPool:
-            self.context.logger.warning("Executor is broken. Restarting...")
-            # restart the executor
-            self._restart_executor()
-            # try to run the task again
-            return self._executor.submit(fn, *args, **kwargs)  # type: ignore
+    def _submit_task(self, fn: Any, *args: Any, **kwargs: Any) -> TaskFuture:
+        """Submit a task, to a new worker if the previous one has died."""
+        return self._supervisor.submit(fn, *args, **kwargs)
 
-    def _prepare_task(self, task_data: Dict[str, Any]) -> None:
-        """Prepare the task."""
-        tool_task = AnyToolAsTask()
-        tool_py, callable_method, component_yaml = self._all_tools[task_data["tool"]]
+    def _handle_task_data(self, task_data: Dict[str, Any]) -> None:
+        """Execute the task right away, or add it to the batch of its tool."""
+        executing_task = cast(Dict[str, Any], self._executing_task)
+        tool = task_data["tool"]
+        batch = self._tool_batch
+        if batch is not None and batch.tool != tool:
+            # the batch is executed first, and the task waits for it at the front of the queue
+            executing_task["prefetched_data"] = task_data
+            self.pending_tasks.insert(0, executing_task)
+            self._executing_task = None
+            self._execute_batch()
+            return
+
+        max_batch_size = self._get_max_batch_size(tool)
+        if max_batch_size <= 1:
+            self._prepare_task(task_data)
+            return
+
+        if batch is None:
+            batch = self._tool_batch = ToolBatch(tool, max_batch_size, time.time())
+        batch.add(executing_task, task_data)
+        self._executing_task = None
+        self.context.logger.info(
+            f"Added task {executing_task.get('requestId', None)} to the batch of {len(batch)} tasks of tool {tool}."
+        )
+        if batch.is_full:
+            self._execute_batch()
+
+    def _get_max_batch_size(self, tool: str) -> int:
+        """Get the max number of the tasks of a tool which are executed together."""
+        _, _, component_yaml = self._all_tools[tool]
+        if component_yaml.get(BATCH_CALLABLE_KEY, None) is not None:
+            return get_max_batch_size(component_yaml, self.params.max_tool_batch_size)
+        if tool in self._async_tools:
+            # the tasks are executed as concurrent coroutines of the same worker
+            return self.params.max_concurrent_async_tasks
+        return 1
+
+    def _get_task_deadline(self, tool: str) -> float:
+        """Get the deadline of a task, or a batch of tasks, of a tool which is submitted now."""
+        deadline = time.time() + self.params.task_deadline
+        if tool in self._async_tools:
+            return deadline + ASYNC_DEADLINE_GRACE
+        return deadline
+
+    def _execute_batch(self) -> None:
+        """Execute the collected tasks in a single call of the `batch_callable` of their tool, or concurrently."""
+        batch = cast(ToolBatch, self._tool_batch)
+        self._tool_batch = None
+        if len(batch) == 1:
+            # a single task is executed as usual
+            self._executing_task, task_data = batch.tasks[0]
+            self._prepare_task(task_data)
+            return
+
+        tool_py, callable_method, component_yaml = self._all_tools[batch.tool]
+        requests = [
+            self._prepare_task_kwargs(executing_task, task_data)
+            for executing_task, task_data in batch.tasks
+        ]
+        batch_tasks = [executing_task for executing_task, _ in batch.tasks]
+        self.context.logger.info(
+            f"Executing the batch of tasks {[task.get('requestId', None) for task in batch_tasks]} of tool {batch.tool}."
+        )
+        batch_callable = component_yaml.get(BATCH_CALLABLE_KEY, None)
+        if batch_callable is not None:
+            future = self._submit_task(
+                AnyToolAsTask().execute,
+                tool_py=tool_py,
+                callable_method=batch_callable,
+                shared_value_threshold=self.params.shared_value_threshold,
+                timeout=self.params.task_deadline,
+                requests=requests,
+            )
+        else:
+            future = self._submit_task(
+                AnyToolAsTask().execute_concurrently,
+                tool_py=tool_py,
+                callable_method=callable_method,
+                requests=requests,
+                timeout=self.params.task_deadline,
+                shared_value_threshold=self.params.shared_value_threshold,
+            )
+        # the batch is tracked as the first of its tasks, which holds all of them
+        self._executing_task = {
+            **batch_tasks[0],
+            "timeout_deadline": self._get_task_deadline(batch.tool),
+            "batch_tasks": batch_tasks,
+        }
+        self._async_result = future
+
+    def _prepare_task_kwargs(
+        self, executing_task: Dict[str, Any], task_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Prepare the kwargs of the tool for a task, and record the tool, the model and the params of the task."""
+        _, _, component_yaml = self._all_tools[task_data["tool"]]
         tool_params = component_yaml.get("params", {})
-        task_data["tool_py"] = tool_py
-        task_data["callable_method"] = callable_method
         task_data["api_keys"] = self._keychain
         task_data["counter_callback"] = TokenCounterCallback()
         task_data["model"] = task_data.get(
             "model", tool_params.get("default_model", None)
         )
-        future = self._submit_task(tool_task.execute, **task_data)
-        executing_task = cast(Dict[str, Any], self._executing_task)
-        executing_task["timeout_deadline"] = time.time() + self.params.task_deadline
         executing_task["tool"] = task_data["tool"]
-        executing_task["model"] = task_data.get(
-            "model", tool_params.get("default_model", None)
-        )
+        executing_task["model"] = task_data["model"]
         executing_task["params"] = tool_params
-        self._async_result = cast(Optional[Future], future)
+        return task_data
+
+    def _prepare_task(self, task_data: Dict[str, Any]) -> None:
+        """Prepare the task."""
+        tool_task = AnyToolAsTask()
+        tool_py, callable_method, _ = self._all_tools[task_data["tool"]]
+        executing_task = cast(Dict[str, Any], self._executing_task)
+        task_data = self._prepare_task_kwargs(executing_task, task_data)
+        task_data["tool_py"] = tool_py
+        task_data["shared_value_threshold"] = self.params.shared_value_threshold
+        task_data["callable_method"] = callable_method
+        task_data["timeout"] = self.params.task_deadline
+        future = self._submit_task(tool_task.execute, **task_data)
+        executing_task["timeout_deadline"] = self._get_task_deadline(task_data["tool"])
+        self._async_result = future
 
     def _build_ipfs_message(
         self,
@@ -544,25 +953,27 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         )
         return message, dialogue
 
-    def _handle_store_response(self, message: IpfsMessage, dialogue: Dialogue) -> None:
-        """Handle the response from ipfs for a store response request."""
-        executing_task = cast(Dict[str, Any], self._executing_task)
-        req_id, sender = (
-            executing_task["requestId"],
-            executing_task["sender"],
-        )
+    def _handle_store_response(
+        self, upload: Upload, message: IpfsMessage, dialogue: Dialogue
+    ) -> None:
+        """Handle the response from ipfs for a store response request, and deliver the task."""
+        self.params.upload_queue.confirm(upload.cid)
+        done_task = upload.done_task
+        req_id = done_task["request_id"]
         ipfs_hash = to_v1(message.ipfs_hash)
         self.context.logger.info(
             f"Response for request {req_id} stored on IPFS with hash {ipfs_hash}."
         )
-        self.send_data_via_acn(
-            sender_address=sender,
-            request_id=str(req_id),
-            data=ipfs_hash,
-        )
-        # for health check metrics
-        self.set_last_executed_task(req_id)
-        done_task = cast(Dict[str, Any], self._done_task)
+        if ipfs_hash != upload.cid:
+            # the requester has to be able to find the response under the hash that is delivered
+            self.context.logger.warning(
+                f"Response for request {req_id} was stored with a different hash than {upload.cid}."
+            )
+            self.send_data_via_acn(
+                sender_address=upload.sender_address,
+                request_id=str(req_id),
+                data=ipfs_hash,
+            )
         task_result = to_multihash(ipfs_hash)
         cost = get_cost_for_done_task(done_task)
         self.context.logger.info(f"Cost for task {req_id}: {cost}")
@@ -578,10 +989,6 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         # add to done tasks, in thread safe way
         with self.done_tasks_lock:
             self.done_tasks.append(done_task)
-        # reset tasks
-        self._executing_task = None
-        self._done_task = None
-        self._invalid_request = False
 
     def send_data_via_acn(
         self,
@@ -590,6 +997,20 @@ class TaskExecutionBehaviour(SimpleBehaviour):
         data: Any,
     ) -> None:
         """Handle callbacks."""
+        acn_batcher = self.params.acn_batcher
+        if acn_batcher.is_enabled:
+            self.context.logger.info(
+                f"Batching data to {sender_address} via ACN for request ID {request_id}"
+            )
+            acn_batcher.add(sender_address, request_id, data, time.time())
+            self._flush_acn_batches()
+            return
+        self._send_data_message(sender_address, request_id, data)
+
+    def _send_data_message(
+        self, sender_address: str, request_id: str, data: Any
+    ) -> None:
+        """Send the data of a request in a message."""
         self.context.logger.info(
             f"Sending data to {sender_address} via ACN for request ID {request_id}"
         )
@@ -605,3 +1026,37 @@ class TaskExecutionBehaviour(SimpleBehaviour):
             message=response,
             context=EnvelopeContext(connection_id=P2P_CLIENT_PUBLIC_ID),
         )
+
+    def _flush_acn_batches(self, flush_all: bool = False) -> None:
+        """Send the batches of data which are full, or have waited long enough, via ACN."""
+        acn_batcher = self.params.acn_batcher
+        batches = (
+            acn_batcher.pop_all() if flush_all else acn_batcher.pop_ready(time.time())
+        )
+        for sender_address, contents in batches:
+            self.send_data_batch_via_acn(sender_address, contents)
+
+    def send_data_batch_via_acn(
+        self, sender_address: str, contents: Dict[str, str]
+    ) -> None:
+        """Send the data of multiple requests of the same requester in a single message."""
+        if len(contents) == 1:
+            # a single piece of data is sent as before, so that it reaches the requesters which do not support batches
+            ((request_id, data),) = contents.items()
+            self._send_data_message(sender_address, request_id, data)
+            return
+
+        self.context.logger.info(
+            f"Sending data to {sender_address} via ACN for request IDs {list(contents.keys())}"
+        )
+        response, _ = cast(
+            AcnDataShareDialogues, self.context.acn_data_share_dialogues
+        ).create(
+            counterparty=sender_address,
+            performative=AcnDataShareMessage.Performative.DATA_BATCH,
+            contents=contents,
+        )
+        self.context.outbox.put_message(
+            message=response,
+            context=EnvelopeContext(connection_id=P2P_CLIENT_PUBLIC_ID),
+        )
@@ -18,11 +18,15 @@
 # ------------------------------------------------------------------------------
 """This module contains dialogues."""
 
-from typing import Any
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from aea.common import Address
 from aea.protocols.base import Message
 from aea.protocols.dialogue.base import Dialogue as BaseDialogue
+from aea.protocols.dialogue.base import DialogueLabel
+from aea.protocols.dialogue.base import Dialogues as BaseDialogues
 from aea.skills.base import Model
 
 from packages.valory.protocols.acn_data_share.dialogues import (
@@ -60,7 +64,102 @@ AcnDataShareDialogue = BaseAcnDataShareDialogue
 LedgerDialogue = BaseLedgerApiDialogue
 
 
-class IpfsDialogues(Model, BaseIpfsDialogues):
+class EvictableDialogues(BaseDialogues):
+    """
+    Dialogues which are evicted incrementally, by age.
+
+    The last activity of every dialogue, i.e., when it was created or updated with a message, is tracked in order.
+    Each call to `evict` checks at most `batch_size` of the least recently active dialogues, and removes the ones
+    which are either completed, or have been inactive for longer than the ttl. The live dialogues are skipped, and
+    moved to the back of the queue, so that the dialogues behind them are checked by the next calls.
+    This keeps the cost of each eviction constant, instead of periodically sweeping all the dialogues,
+    and never drops an active dialogue.
+    """
+
+    def _init_eviction(self) -> None:
+        """Initialize the tracking of the dialogues."""
+        # maps the incomplete label of each dialogue to its last activity and its number of messages
+        self._activity: "OrderedDict[DialogueLabel, Tuple[float, int]]" = OrderedDict()
+        self._num_messages = 0
+        self.num_evicted = 0
+
+    def create(self, *args: Any, **kwargs: Any) -> Tuple[Message, BaseDialogue]:
+        """Create a dialogue, and track it."""
+        message, dialogue = super().create(*args, **kwargs)
+        self._touch(dialogue)
+        return message, dialogue
+
+    def update(self, message: Message) -> Optional[BaseDialogue]:
+        """Update a dialogue with a message, and track it."""
+        dialogue = super().update(message)
+        if dialogue is not None:
+            self._touch(dialogue)
+        return dialogue
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the number of the tracked dialogues and of their messages, which is what their memory depends on."""
+        return {
+            "dialogues": len(self._activity),
+            "messages": self._num_messages,
+            "evicted": self.num_evicted,
+        }
+
+    def evict(self, ttl: float, batch_size: int, now: Optional[float] = None) -> int:
+        """
+        Remove the least recently active dialogues, if they are completed or expired.
+
+        :param ttl: the seconds after the last activity of a dialogue after which it expires.
+        :param batch_size: the maximum number of dialogues to check.
+        :param now: the current timestamp, defaults to the current time.
+        :return: the number of the removed dialogues.
+        """
+        now = time.time() if now is None else now
+        num_evicted = 0
+        for _ in range(min(batch_size, len(self._activity))):
+            label, (last_activity, num_messages) = next(iter(self._activity.items()))
+            if last_activity + ttl > now and not self._is_completed(label):
+                # a live dialogue does not hold back the completed ones which were active more recently
+                self._activity.move_to_end(label)
+                continue
+            del self._activity[label]
+            self._num_messages -= num_messages
+            num_evicted += int(self._remove(label))
+        self.num_evicted += num_evicted
+        return num_evicted
+
+    def _touch(self, dialogue: BaseDialogue) -> None:
+        """Record the activity of a dialogue."""
+        label = dialogue.dialogue_label.get_incomplete_version()
+        _, num_messages = self._activity.pop(label, (0.0, 0))
+        self._activity[label] = (time.time(), num_messages + 1)
+        self._num_messages += 1
+
+    def _is_completed(self, label: DialogueLabel) -> bool:
+        """Check whether a dialogue is completed, i.e., its last message is terminal, or it is already removed."""
+        # the storage indexes a dialogue by its complete label, once it has one
+        latest_label = self._dialogues_storage.get_latest_label(label)
+        dialogue = self.get_dialogue_from_label(latest_label)
+        if dialogue is None:
+            return True
+        last_message = dialogue.last_message
+        terminal_performatives = getattr(dialogue, "TERMINAL_PERFORMATIVES", ())
+        return (
+            last_message is not None
+            and last_message.performative in terminal_performatives
+        )
+
+    def _remove(self, label: DialogueLabel) -> bool:
+        """Remove a dialogue from the storage, if it is still there."""
+        storage = self._dialogues_storage
+        latest_label = storage.get_latest_label(label)
+        if not storage.is_dialogue_present(latest_label):
+            return False
+        storage.remove(latest_label)
+        return True
+
+
+class IpfsDialogues(Model, EvictableDialogues, BaseIpfsDialogues):
     """A class to keep track of IPFS dialogues."""
 
     def __init__(self, **kwargs: Any) -> None:
@@ -70,6 +169,7 @@ class IpfsDialogues(Model, BaseIpfsDialogues):
         :param kwargs: keyword arguments
         """
         Model.__init__(self, **kwargs)
+        self._init_eviction()
 
         def role_from_first_message(  # pylint: disable=unused-argument
             message: Message, receiver_address: Address
@@ -89,12 +189,13 @@ class IpfsDialogues(Model, BaseIpfsDialogues):
         )
 
 
-class ContractDialogues(Model, BaseContractApiDialogues):
+class ContractDialogues(Model, EvictableDialogues, BaseContractApiDialogues):
     """The dialogues class keeps track of all dialogues."""
 
     def __init__(self, **kwargs: Any) -> None:
         """Initialize dialogues."""
         Model.__init__(self, **kwargs)
+        self._init_eviction()
 
         def role_from_first_message(  # pylint: disable=unused-argument
             message: Message, receiver_address: Address
@@ -115,12 +216,13 @@ class ContractDialogues(Model, BaseContractApiDialogues):
         )
 
 
-class LedgerDialogues(Model, BaseLedgerApiDialogues):
+class LedgerDialogues(Model, EvictableDialogues, BaseLedgerApiDialogues):
     """The dialogues class keeps track of all dialogues."""
 
     def __init__(self, **kwargs: Any) -> None:
         """Initialize dialogues."""
         Model.__init__(self, **kwargs)
+        self._init_eviction()
 
         def role_from_first_message(  # pylint: disable=unused-argument
             message: Message, receiver_address: Address
@@ -141,12 +243,13 @@ class LedgerDialogues(Model, BaseLedgerApiDialogues):
         )
 
 
-class DefaultDialogues(Model, BaseDefaultDialogues):
+class DefaultDialogues(Model, EvictableDialogues, BaseDefaultDialogues):
     """The dialogues class keeps track of all dialogues."""
 
     def __init__(self, **kwargs: Any) -> None:
         """Initialize dialogues."""
         Model.__init__(self, **kwargs)
+        self._init_eviction()
 
         def role_from_first_message(
             message: Message, receiver_address: Address
@@ -167,7 +270,7 @@ class DefaultDialogues(Model, BaseDefaultDialogues):
         )
 
 
-class AcnDataShareDialogues(Model, BaseAcnDataShareDialogues):
+class AcnDataShareDialogues(Model, EvictableDialogues, BaseAcnDataShareDialogues):
     """The dialogues class keeps track of all dialogues."""
 
     def __init__(self, **kwargs: Any) -> None:
@@ -177,6 +280,7 @@ class AcnDataShareDialogues(Model, BaseAcnDataShareDialogues):
         :param kwargs: keyword arguments
         """
         Model.__init__(self, **kwargs)
+        self._init_eviction()
 
         def role_from_first_message(  # pylint: disable=unused-argument
             message: Message, receiver_address: Address
@@ -32,6 +32,7 @@ from packages.valory.protocols.acn_data_share import AcnDataShareMessage
 from packages.valory.protocols.contract_api import ContractApiMessage
 from packages.valory.protocols.ipfs import IpfsMessage
 from packages.valory.protocols.ledger_api import LedgerApiMessage
+from packages.valory.skills.task_execution.dialogues import EvictableDialogues
 from packages.valory.skills.task_execution.models import Params
 
 
@@ -52,12 +53,24 @@ class BaseHandler(Handler):
         """Set up the handler."""
         self.context.logger.info(f"{self.__class__.__name__}: setup method called.")
 
-    def cleanup_dialogues(self) -> None:
-        """Clean up all dialogues."""
+    def evict_dialogues(self) -> None:
+        """Evict a batch of the completed or expired dialogues of every handler."""
         for handler_name in self.context.handlers.__dict__.keys():
             dialogues_name = handler_name.replace("_handler", "_dialogues")
-            dialogues = getattr(self.context, dialogues_name)
-            dialogues.cleanup()
+            dialogues = cast(EvictableDialogues, getattr(self.context, dialogues_name))
+            dialogues.evict(
+                ttl=self.params.dialogue_ttl,
+                batch_size=self.params.dialogue_eviction_batch_size,
+            )
+
+    def get_dialogue_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of the dialogues, and of their messages, of every handler."""
+        stats = {}
+        for handler_name in self.context.handlers.__dict__.keys():
+            dialogues_name = handler_name.replace("_handler", "_dialogues")
+            dialogues = cast(EvictableDialogues, getattr(self.context, dialogues_name))
+            stats[dialogues_name] = dialogues.stats
+        return stats
 
     @property
     def params(self) -> Params:
@@ -71,11 +84,11 @@ class BaseHandler(Handler):
     def on_message_handled(self, _message: Message) -> None:
         """Callback after a message has been handled."""
         self.params.request_count += 1
-        if self.params.request_count % self.params.cleanup_freq == 0:
+        self.evict_dialogues()
+        if self.params.request_count % self.params.dialogue_stats_freq == 0:
             self.context.logger.info(
-                f"{self.params.request_count} requests processed. Cleaning up dialogues."
+                f"{self.params.request_count} requests processed. Dialogues: {self.get_dialogue_stats()}"
             )
-            self.cleanup_dialogues()
 
 
 class AcnHandler(BaseHandler):
@@ -103,16 +116,37 @@ class IpfsHandler(BaseHandler):
         """
         self.context.logger.info(f"Received message: {message}")
         ipfs_msg = cast(IpfsMessage, message)
+        dialogue = self.context.ipfs_dialogues.update(ipfs_msg)
+        nonce = (
+            dialogue.dialogue_label.dialogue_reference[0]
+            if dialogue is not None
+            else None
+        )
         if ipfs_msg.performative == IpfsMessage.Performative.ERROR:
             self.context.logger.warning(
                 f"IPFS Message performative not recognized: {ipfs_msg.performative}"
             )
-            self.params.in_flight_req = False
+            # the request has failed, so it is handled as if its response was lost
+            if self.params.upload_to_callback.fail(nonce):
+                # an upload runs in the background, it does not affect the in flight request
+                return
+            if not self.params.req_to_callback.fail(nonce):
+                self.params.in_flight_req = False
+            return
+
+        upload_callback = self.params.upload_to_callback.pop(nonce)
+        if upload_callback is not None:
+            upload_callback(ipfs_msg, dialogue)
+            self.on_message_handled(message)
             return
 
-        dialogue = self.context.ipfs_dialogues.update(ipfs_msg)
-        nonce = dialogue.dialogue_label.dialogue_reference[0]
         callback = self.params.req_to_callback.pop(nonce)
+        if callback is None:
+            self.context.logger.warning(
+                f"Received the response to the ipfs request with nonce {nonce} after it had expired. Ignoring it."
+            )
+            self.on_message_handled(message)
+            return
         callback(ipfs_msg, dialogue)
         self.params.in_flight_req = False
         self.on_message_handled(message)
@@ -167,6 +201,10 @@ class ContractHandler(BaseHandler):
 
     def _handle_get_undelivered_reqs(self, body: Dict[str, Any]) -> None:
         """Handle get undelivered reqs."""
+        for request_id in body.get("delivered_request_ids", []):
+            # delivered by another mech while waiting for the priority window
+            self.params.marketplace_scheduler.cancel(request_id)
+
         reqs = body.get("data", [])
         if len(reqs) == 0:
             # for healthcheck metrics
@@ -174,16 +212,12 @@ class ContractHandler(BaseHandler):
             return
 
         self.params.from_block = max([req["block_number"] for req in reqs]) + 1
-        self.context.logger.info(f"Received {len(reqs)} new requests.")
+        num_new = self.params.request_ingestion.push(reqs)
+        self.context.logger.info(
+            f"Received {len(reqs)} requests, {num_new} of which are new."
+        )
         # for healthcheck metrics
         self.set_last_successful_read(self.params.from_block)
-        reqs = [
-            req
-            for req in reqs
-            if req["block_number"] % self.params.num_agents == self.params.agent_index
-        ]
-        self.context.logger.info(f"Processing only {len(reqs)} of the new requests.")
-        self.pending_tasks.extend(reqs)
         self.context.logger.info(
             f"Monitoring new reqs from block {self.params.from_block}"
         )
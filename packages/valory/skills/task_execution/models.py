@@ -19,13 +19,41 @@
 
 """This module contains the shared state for the abci skill of Mech."""
 import dataclasses
-from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from aea.exceptions import enforce
 from aea.skills.base import Model
 
 from packages.valory.skills.abstract_round_abci.utils import check_type
+from packages.valory.skills.task_execution.utils.acn import (
+    AcnBatcher,
+    DEFAULT_MAX_BATCH_DELAY,
+    DEFAULT_MAX_BATCH_SIZE,
+)
+from packages.valory.skills.task_execution.utils.artifacts import ArtifactExtractor
+from packages.valory.skills.task_execution.utils.batch import (
+    DEFAULT_MAX_TOOL_BATCH_SIZE,
+    DEFAULT_TOOL_BATCH_WINDOW,
+)
+from packages.valory.skills.task_execution.utils.ingestion import (
+    DEFAULT_MAX_SEEN_REQUESTS,
+    RequestIngestion,
+)
+from packages.valory.skills.task_execution.utils.registry import (
+    DEFAULT_MAX_SIZE,
+    RequestRegistry,
+)
+from packages.valory.skills.task_execution.utils.scheduler import DeadlineScheduler
+from packages.valory.skills.task_execution.utils.shared import (
+    DEFAULT_SHARED_VALUE_THRESHOLD,
+)
+from packages.valory.skills.task_execution.utils.upload import (
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_IN_FLIGHT,
+    UploadQueue,
+)
 
 
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
@@ -55,7 +83,23 @@ class Params(Model):
         """Initialize the parameters object."""
         self.in_flight_req: bool = False
         self.from_block: Optional[int] = None
-        self.req_to_callback: Dict[str, Callable] = {}
+        # maps the nonce of each in flight ipfs request to the callback of its response, until the response expires
+        self.req_to_callback = RequestRegistry(
+            max_size=kwargs.get("max_tracked_requests", DEFAULT_MAX_SIZE)
+        )
+        self.response_timeout: float = kwargs.get("response_timeout", 120.0)
+        # maps the nonce of each upload of a result to the callback of its response,
+        # the uploads run in the background, so they are tracked apart from the in flight request
+        self.upload_to_callback = RequestRegistry(
+            max_size=kwargs.get("max_tracked_requests", DEFAULT_MAX_SIZE)
+        )
+        # keeps the results until their upload to ipfs is confirmed, only then they are delivered on-chain
+        self.upload_queue = UploadQueue(
+            max_in_flight=kwargs.get("max_concurrent_uploads", DEFAULT_MAX_IN_FLIGHT),
+            max_attempts=kwargs.get("max_upload_attempts", DEFAULT_MAX_ATTEMPTS),
+            backoff_base=kwargs.get("upload_backoff_base", DEFAULT_BACKOFF_BASE),
+            backoff_max=kwargs.get("upload_backoff_max", DEFAULT_BACKOFF_MAX),
+        )
         self.api_keys: Dict[str, List[str]] = self._ensure_get(
             "api_keys", kwargs, Dict[str, List[str]]
         )
@@ -64,15 +108,37 @@ class Params(Model):
         )
         self.polling_interval = kwargs.get("polling_interval", 30.0)
         self.task_deadline = kwargs.get("task_deadline", 240.0)
+        # the tasks of a tool with a `batch_callable` are executed together, a batch size of 1 disables the batching
+        self.max_tool_batch_size: int = kwargs.get(
+            "max_tool_batch_size", DEFAULT_MAX_TOOL_BATCH_SIZE
+        )
+        self.tool_batch_window: float = kwargs.get(
+            "tool_batch_window", DEFAULT_TOOL_BATCH_WINDOW
+        )
+        # the tasks of a tool with an async callable are executed as concurrent coroutines, 1 disables the concurrency
+        self.max_concurrent_async_tasks: int = kwargs.get(
+            "max_concurrent_async_tasks", DEFAULT_MAX_TOOL_BATCH_SIZE
+        )
+        # the CPU seconds, and the bytes of memory, that each task may use in its worker, 0 disables the limit
+        self.max_task_cpu_time: int = kwargs.get("max_task_cpu_time", 0)
+        self.max_task_memory: int = kwargs.get("max_task_memory", 0)
         self.num_agents = self._ensure_get("num_agents", kwargs, int)
         self.request_count: int = 0
-        self.cleanup_freq = kwargs.get("cleanup_freq", 50)
+        # the dialogues are evicted in batches, once they are completed or inactive for longer than the ttl
+        self.dialogue_ttl: float = kwargs.get("dialogue_ttl", 3600.0)
+        self.dialogue_eviction_batch_size: int = kwargs.get(
+            "dialogue_eviction_batch_size", 10
+        )
+        self.dialogue_stats_freq: int = kwargs.get("dialogue_stats_freq", 50)
         self.agent_index: int = self._ensure_get("agent_index", kwargs, int)
         self.from_block_range: int = self._ensure_get("from_block_range", kwargs, int)
         self.timeout_limit: int = self._ensure_get("timeout_limit", kwargs, int)
         self.max_block_window: int = self._ensure_get("max_block_window", kwargs, int)
-        # maps the request id to the number of times it has timed out
-        self.request_id_to_num_timeouts: Dict[int, int] = defaultdict(lambda: 0)
+        # maps the request id to the number of times it has timed out, until the request is done or forgotten
+        self.request_id_to_num_timeouts = RequestRegistry(
+            max_size=kwargs.get("max_tracked_requests", DEFAULT_MAX_SIZE)
+        )
+        self.timeout_count_ttl: float = kwargs.get("timeout_count_ttl", 86400.0)
         mech_to_config_dict: Dict[str, Dict[str, bool]] = self._ensure_get(
             "mech_to_config", kwargs, Dict[str, Dict[str, bool]]
         )
@@ -88,6 +154,31 @@ class Params(Model):
             self.mech_marketplace_address is not None
             and self.mech_marketplace_address != ZERO_ADDRESS
         )
+        # without a multicall3 contract on the chain, the priority of the requests is checked request by request
+        self.multicall_address: Optional[str] = kwargs.get("multicall_address", None)
+        self.priority_check_chunk_size: int = kwargs.get(
+            "priority_check_chunk_size", 250
+        )
+        # keeps the marketplace requests until their priority window passes
+        self.marketplace_scheduler = DeadlineScheduler()
+        # groups the data delivered to the same requester via ACN, a batch size of 1 disables the batching
+        self.acn_batcher = AcnBatcher(
+            max_batch_size=kwargs.get("acn_max_batch_size", DEFAULT_MAX_BATCH_SIZE),
+            max_batch_delay=kwargs.get("acn_max_batch_delay", DEFAULT_MAX_BATCH_DELAY),
+        )
+        # stores the binary, and optionally the long text, outputs of the tools as separate files
+        self.artifact_extractor = ArtifactExtractor(
+            text_threshold=kwargs.get("artifact_text_threshold", 0),
+            compress=kwargs.get("compress_artifacts", False),
+        )
+        # the values of the results of the tools which are at least this long are passed through shared memory
+        self.shared_value_threshold: int = kwargs.get(
+            "shared_value_threshold", DEFAULT_SHARED_VALUE_THRESHOLD
+        )
+        # merges the pushed and the polled requests, without duplicates
+        self.request_ingestion = RequestIngestion(
+            max_seen=kwargs.get("max_seen_requests", DEFAULT_MAX_SEEN_REQUESTS)
+        )
         super().__init__(*args, **kwargs)
 
     @classmethod
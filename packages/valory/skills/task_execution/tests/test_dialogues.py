@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the eviction of the dialogues."""
+
+from typing import Any, Tuple
+
+from aea.protocols.base import Address, Message
+from aea.protocols.dialogue.base import Dialogue as BaseDialogue
+
+from packages.valory.protocols.default.dialogues import DefaultDialogue
+from packages.valory.protocols.default.dialogues import (
+    DefaultDialogues as BaseDefaultDialogues,
+)
+from packages.valory.protocols.default.message import DefaultMessage
+from packages.valory.skills.task_execution.dialogues import EvictableDialogues
+
+
+SELF_ADDRESS = "agent"
+PEER_ADDRESS = "peer"
+TTL = 1e9
+
+
+class DefaultDialogues(EvictableDialogues, BaseDefaultDialogues):
+    """Default dialogues which are evicted by age."""
+
+    def __init__(self, self_address: str) -> None:
+        """Initialize the dialogues."""
+        self._init_eviction()
+
+        def role_from_first_message(  # pylint: disable=unused-argument
+            message: Message, receiver_address: Address
+        ) -> BaseDialogue.Role:
+            """Infer the role of the agent from an incoming/outgoing first message."""
+            return DefaultDialogue.Role.AGENT
+
+        BaseDefaultDialogues.__init__(
+            self,
+            self_address=self_address,
+            role_from_first_message=role_from_first_message,
+        )
+
+
+def create(dialogues: DefaultDialogues) -> Tuple[Message, BaseDialogue]:
+    """Start a dialogue with the peer."""
+    return dialogues.create(
+        counterparty=PEER_ADDRESS,
+        performative=DefaultMessage.Performative.BYTES,
+        content=b"request",
+    )
+
+
+def reply(dialogue: BaseDialogue, performative: Any, **kwargs: Any) -> Message:
+    """Get the reply of the peer to the first message of a dialogue, which the peer identifies with its own nonce."""
+    first_message = dialogue.last_message
+    message = DefaultMessage(
+        dialogue_reference=(first_message.dialogue_reference[0], "peer_nonce"),
+        # the messages of the peer, which did not start the dialogue, have negative ids
+        message_id=-1,
+        target=first_message.message_id,
+        performative=performative,
+        **kwargs,
+    )
+    message.sender = PEER_ADDRESS
+    message.to = SELF_ADDRESS
+    return message
+
+
+def test_evict_keeps_a_live_dialogue_started_by_the_peer() -> None:
+    """Test that a dialogue started by the peer, which is indexed by its complete label, is not evicted."""
+    dialogues = DefaultDialogues(SELF_ADDRESS)
+    message = DefaultMessage(
+        dialogue_reference=("peer_nonce", ""),
+        performative=DefaultMessage.Performative.BYTES,
+        content=b"request",
+    )
+    message.sender = PEER_ADDRESS
+    message.to = SELF_ADDRESS
+    dialogue = dialogues.update(message)
+    assert dialogue is not None
+
+    assert dialogues.evict(TTL, batch_size=10) == 0
+    assert dialogues.get_dialogue(message) is dialogue
+    assert dialogues.stats == {"dialogues": 1, "messages": 1, "evicted": 0}
+
+
+def test_evict_keeps_a_live_dialogue_after_a_reply() -> None:
+    """Test that a dialogue which is live after the reply of the peer is not evicted."""
+    dialogues = DefaultDialogues(SELF_ADDRESS)
+    _, dialogue = create(dialogues)
+    message = reply(dialogue, DefaultMessage.Performative.BYTES, content=b"response")
+    assert dialogues.update(message) is dialogue
+
+    assert dialogues.evict(TTL, batch_size=10) == 0
+    assert dialogues.get_dialogue(message) is dialogue
+    assert dialogues.stats == {"dialogues": 1, "messages": 2, "evicted": 0}
+
+
+def test_evict_removes_a_completed_dialogue() -> None:
+    """Test that a dialogue is evicted once the peer has ended it, even before it expires."""
+    dialogues = DefaultDialogues(SELF_ADDRESS)
+    _, live_dialogue = create(dialogues)
+    _, dialogue = create(dialogues)
+    message = reply(dialogue, DefaultMessage.Performative.END)
+    assert dialogues.update(message) is dialogue
+
+    # the live dialogue, which is the least recently active, does not hold back the completed one
+    assert dialogues.evict(TTL, batch_size=2) == 1
+    assert dialogues.get_dialogue(message) is None
+    assert dialogues.get_dialogue(live_dialogue.last_message) is live_dialogue
+    assert dialogues.stats == {"dialogues": 1, "messages": 1, "evicted": 1}
+
+
+def test_evict_removes_an_expired_dialogue() -> None:
+    """Test that a live dialogue is evicted once it has been inactive for longer than the ttl."""
+    dialogues = DefaultDialogues(SELF_ADDRESS)
+    create(dialogues)
+
+    assert dialogues.evict(TTL, batch_size=10, now=0.0) == 0
+    assert dialogues.evict(ttl=1.0, batch_size=10, now=float("inf")) == 1
+    assert dialogues.stats == {"dialogues": 0, "messages": 0, "evicted": 1}
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the deduplication of the requests from the websocket subscription and the polling."""
+
+from packages.valory.skills.task_execution.utils.ingestion import (
+    RequestIngestion,
+    get_request_key,
+)
+
+
+TX_HASH = "5f" * 32
+
+
+def test_get_request_key() -> None:
+    """Test that a request is identified by its log, regardless of the format of its tx hash."""
+    pushed = {"requestId": 1, "tx_hash": "0x" + TX_HASH.upper(), "log_index": 3}
+    polled = {"requestId": 1, "tx_hash": bytes.fromhex(TX_HASH).hex(), "log_index": 3}
+    assert get_request_key(pushed) == (TX_HASH, 3)
+    assert get_request_key(polled) == (TX_HASH, 3)
+
+
+def test_get_request_key_without_log() -> None:
+    """Test that a request which is not coming from a log is identified by its id."""
+    assert get_request_key({"requestId": 12}) == ("12", None)
+
+
+def test_push_deduplicates() -> None:
+    """Test that a request is ingested only once, whether it is pushed or polled."""
+    ingestion = RequestIngestion()
+    first = {"requestId": 1, "tx_hash": "0x" + TX_HASH, "log_index": 0}
+    second = {"requestId": 2, "tx_hash": "0x" + TX_HASH, "log_index": 1}
+    assert ingestion.push([first]) == 1
+    assert ingestion.push([{**first, "tx_hash": TX_HASH}, second]) == 1
+    assert len(ingestion) == 2
+    assert ingestion.num_duplicates == 1
+    assert ingestion.drain() == [first, second]
+    assert len(ingestion) == 0
+    # the drained requests are still remembered
+    assert ingestion.push([first, second]) == 0
+    assert ingestion.num_duplicates == 3
+
+
+def test_push_evicts_the_oldest_keys() -> None:
+    """Test that only the keys of the most recent `max_seen` requests are remembered."""
+    ingestion = RequestIngestion(max_seen=2)
+    requests = [{"requestId": request_id} for request_id in range(3)]
+    assert ingestion.push(requests) == 3
+    ingestion.drain()
+    # the first request has been evicted, so it is ingested again, unlike the others
+    assert ingestion.push(requests[::-1]) == 1
+    assert ingestion.drain() == [requests[0]]
+    assert ingestion.num_duplicates == 2
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the batching of the results which are delivered via ACN."""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+
+DEFAULT_MAX_BATCH_SIZE = 1
+DEFAULT_MAX_BATCH_DELAY = 5.0
+
+
+class AcnBatcher:
+    """
+    Groups the results which are delivered to the same requester via ACN.
+
+    The results of each requester are kept until either `max_batch_size` of them are collected,
+    or the oldest of them has waited for `max_batch_delay` seconds, and are then delivered in a single message.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
+    ) -> None:
+        """Initialize the batcher."""
+        if max_batch_size <= 0:
+            raise ValueError(
+                f"The max batch size must be positive, got {max_batch_size}."
+            )
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        # maps each requester to the time its oldest result was added, and to its results by request id
+        self._batches: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        self.num_results = 0
+        self.num_batches = 0
+
+    def __len__(self) -> int:
+        """Get the number of the results which are waiting to be delivered."""
+        return sum(len(contents) for _, contents in self._batches.values())
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check whether the results are batched, i.e., more than one result can be delivered in a message."""
+        return self._max_batch_size > 1
+
+    def add(self, counterparty: str, request_id: str, content: str, now: float) -> None:
+        """Add the result of a request, to be delivered to the requester."""
+        _, contents = self._batches.setdefault(counterparty, (now, {}))
+        contents[request_id] = content
+        self.num_results += 1
+
+    def pop_ready(self, now: float) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Remove and return the batches which are ready to be delivered.
+
+        :param now: the current timestamp.
+        :return: the requester and the results by request id of every ready batch.
+        """
+        ready = []
+        for counterparty, (added_at, contents) in list(self._batches.items()):
+            is_full = len(contents) >= self._max_batch_size
+            if is_full or added_at + self._max_batch_delay <= now:
+                del self._batches[counterparty]
+                ready.append((counterparty, contents))
+        self.num_batches += len(ready)
+        return ready
+
+    def pop_all(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Remove and return all the batches, e.g., on teardown."""
+        ready = [
+            (counterparty, contents)
+            for counterparty, (_, contents) in self._batches.items()
+        ]
+        self._batches.clear()
+        self.num_batches += len(ready)
+        return ready
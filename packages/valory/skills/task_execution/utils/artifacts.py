@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the extraction of the large artifacts of a response into separate files."""
+
+import base64
+import gzip
+import mmap
+from typing import Any, Dict, Tuple
+
+
+BASE64_ENCODING = "base64"
+GZIP_BASE64_ENCODING = "gzip+base64"
+UTF8_ENCODING = "utf-8"
+
+
+class ArtifactExtractor:
+    """
+    Moves the large artifacts of a response to separate files, which are stored next to the response.
+
+    The binary artifacts, i.e., the `bytes` returned by a tool, are always stored as separate files,
+    as they cannot be part of the JSON response. They are base64 encoded, since the files are stored as text.
+    The text fields longer than `text_threshold` characters are stored as separate files as well,
+    gzip compressed if `compress` is set. A threshold of 0 keeps all the text fields in the response.
+    Each artifact is replaced in the response by a reference to its file, e.g.,
+    `{"artifact": "<request id>.0", "encoding": "base64", "size": 1024}`.
+    """
+
+    def __init__(self, text_threshold: int = 0, compress: bool = False) -> None:
+        """Initialize the extractor."""
+        if text_threshold < 0:
+            raise ValueError(
+                f"The text threshold must not be negative, got {text_threshold}."
+            )
+        self._text_threshold = text_threshold
+        self._compress = compress
+
+    def extract(self, result: Any, request_id: str) -> Tuple[Any, Dict[str, str]]:
+        """
+        Extract the artifacts of the result of a request.
+
+        :param result: the result, which may be nested in dicts and lists.
+        :param request_id: the id of the request, which prefixes the names of the files.
+        :return: the result with the artifacts replaced by their references, and the files by name.
+        """
+        files: Dict[str, str] = {}
+        return self._extract(result, request_id, files), files
+
+    def _extract(self, value: Any, request_id: str, files: Dict[str, str]) -> Any:
+        """Extract the artifacts of a value, recursively."""
+        if isinstance(value, dict):
+            return {
+                key: self._extract(item, request_id, files)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [self._extract(item, request_id, files) for item in value]
+        if isinstance(value, (bytes, bytearray, mmap.mmap)):
+            # a memory-mapped value is encoded straight from the shared memory
+            return self._add_file(
+                files,
+                request_id,
+                base64.b64encode(value).decode(),
+                BASE64_ENCODING,
+                len(value),
+            )
+        if isinstance(value, str) and 0 < self._text_threshold < len(value):
+            if not self._compress:
+                return self._add_file(
+                    files, request_id, value, UTF8_ENCODING, len(value)
+                )
+            # without a timestamp, so that the same text is always stored under the same hash
+            compressed = base64.b64encode(
+                gzip.compress(value.encode(), mtime=0)
+            ).decode()
+            return self._add_file(
+                files, request_id, compressed, GZIP_BASE64_ENCODING, len(value)
+            )
+        return value
+
+    @staticmethod
+    def _add_file(
+        files: Dict[str, str], request_id: str, content: str, encoding: str, size: int
+    ) -> Dict[str, Any]:
+        """Add the file of an artifact, and get the reference to it."""
+        filename = f"{request_id}.{len(files)}"
+        files[filename] = content
+        return {"artifact": filename, "encoding": encoding, "size": size}
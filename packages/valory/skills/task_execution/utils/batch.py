@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the batching of the tasks of the tools which declare a batch entry point."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_MAX_TOOL_BATCH_SIZE = 1
+DEFAULT_TOOL_BATCH_WINDOW = 2.0
+
+BATCH_CALLABLE_KEY = "batch_callable"
+MAX_BATCH_SIZE_KEY = "max_batch_size"
+
+
+def get_max_batch_size(component_yaml: Dict[str, Any], max_batch_size: int) -> int:
+    """
+    Get the max number of the tasks of a tool which are executed in a single call.
+
+    :param component_yaml: the component.yaml of the tool.
+    :param max_batch_size: the max batch size of the mech.
+    :return: the max batch size, or 1 if the tool does not declare a `batch_callable`.
+    """
+    if component_yaml.get(BATCH_CALLABLE_KEY, None) is None:
+        return 1
+    tool_max_batch_size = component_yaml.get(MAX_BATCH_SIZE_KEY, max_batch_size)
+    return max(1, min(max_batch_size, tool_max_batch_size))
+
+
+class ToolBatch:
+    """
+    The tasks of a tool, which are collected to be executed in a single call of its `batch_callable`.
+
+    A batch is executed once it is full, or once `window` seconds have passed since its first task was added.
+    """
+
+    def __init__(self, tool: str, max_size: int, opened_at: float) -> None:
+        """Initialize the batch."""
+        self.tool = tool
+        self.max_size = max_size
+        self.opened_at = opened_at
+        # the executing task, along with its data as downloaded from ipfs, of every task of the batch
+        self.tasks: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        """Get the number of the tasks of the batch."""
+        return len(self.tasks)
+
+    @property
+    def is_full(self) -> bool:
+        """Check whether the batch is full."""
+        return len(self.tasks) >= self.max_size
+
+    def add(self, executing_task: Dict[str, Any], task_data: Dict[str, Any]) -> None:
+        """Add a task to the batch."""
+        self.tasks.append((executing_task, task_data))
+
+    def is_due(self, now: float, window: float) -> bool:
+        """Check whether the batch should be executed."""
+        return self.is_full or self.opened_at + window <= now
+
+
+def split_batch_result(result: Any, num_tasks: int) -> Optional[List[Any]]:
+    """
+    Split the result of a batch call to the results of its tasks.
+
+    :param result: the result of the `batch_callable`, which is expected to be a list with a result per task.
+    :param num_tasks: the number of the tasks of the batch.
+    :return: the result of every task, in the order of the tasks, or None if the result is invalid.
+    """
+    if result is None or isinstance(result, Exception):
+        # the batch has failed as a whole, e.g., it has timed out
+        return [result] * num_tasks
+    if not isinstance(result, (list, tuple)) or len(result) != num_tasks:
+        return None
+    return list(result)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2023-2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the ingestion of the requests from both the websocket subscription and the polling."""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_MAX_SEEN_REQUESTS = 10000
+
+RequestKey = Tuple[str, Optional[int]]
+
+
+def get_request_key(request: Dict[str, Any]) -> RequestKey:
+    """
+    Get the key which identifies the log of a request, i.e., its tx hash and log index.
+
+    The requests that are not coming from a log are identified by their id instead.
+    """
+    tx_hash = request.get("tx_hash", None)
+    if tx_hash is None:
+        return str(request["requestId"]), None
+    tx_hash = str(tx_hash).lower()
+    if tx_hash.startswith("0x"):
+        tx_hash = tx_hash[2:]
+    return tx_hash, request.get("log_index", None)
+
+
+class RequestIngestion:
+    """
+    Merges the requests received from the websocket subscription and from the polling into a single stream.
+
+    The websocket subscription delivers the requests with low latency, while the polling backfills whatever
+    the subscription has missed, e.g., while it was reconnecting. The same request is therefore usually
+    received twice, so the requests are deduplicated by the log that emitted them.
+    The keys of the most recent requests are remembered, up to `max_seen`, which bounds the memory used.
+    """
+
+    def __init__(self, max_seen: int = DEFAULT_MAX_SEEN_REQUESTS) -> None:
+        """Initialize the ingestion."""
+        self._max_seen = max_seen
+        self._seen: "OrderedDict[RequestKey, None]" = OrderedDict()
+        self._pending: List[Dict[str, Any]] = []
+        self.num_duplicates = 0
+
+    def __len__(self) -> int:
+        """Get the number of requests which are waiting to be drained."""
+        return len(self._pending)
+
+    def push(self, requests: List[Dict[str, Any]]) -> int:
+        """
+        Add requests, dropping the ones that have already been received.
+
+        :param requests: the requests, in the format of the `get_request_events` of the contracts.
+        :return: the number of the new requests.
+        """
+        num_new = 0
+        for request in requests:
+            key = get_request_key(request)
+            if key in self._seen:
+                self.num_duplicates += 1
+                continue
+            self._seen[key] = None
+            if len(self._seen) > self._max_seen:
+                self._seen.popitem(last=False)
+            self._pending.append(request)
+            num_new += 1
+        return num_new
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Get all the new requests, in the order they were received."""
+        requests, self._pending = self._pending, []
+        return requests
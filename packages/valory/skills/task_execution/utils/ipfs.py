@@ -17,10 +17,13 @@
 #
 # ------------------------------------------------------------------------------
 """This module contains helpers for IPFS interaction."""
+import os
+import tempfile
 from typing import Any, Dict, Optional, Tuple
 
 import yaml
 from aea.helpers.cid import CID
+from aea.helpers.ipfs.base import IPFSHashOnly
 from multibase import multibase
 from multicodec import multicodec
 
@@ -45,6 +48,21 @@ def get_ipfs_file_hash(data: bytes) -> Optional[str]:
         return None
 
 
+def get_ipfs_hash_of_files(files: Dict[str, str]) -> str:
+    """Compute the v1 CID of files in a directory, as ipfs stores them, without uploading them."""
+    if len(files) == 1:
+        # a single file is wrapped in a directory, which can be hashed in memory
+        ((filename, content),) = files.items()
+        return IPFSHashOnly.hash_bytes(
+            content.encode(), wrap=True, cid_v1=True, file_name_if_wrap=filename
+        )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for filename, content in files.items():
+            with open(os.path.join(temp_dir, filename), "w", encoding="utf-8") as file:
+                file.write(content)
+        return IPFSHashOnly.hash_directory(temp_dir, wrap=False, cid_v1=True)
+
+
 def to_multihash(hash_string: str) -> str:
     """To multihash string."""
     # Decode the Base32 CID to bytes
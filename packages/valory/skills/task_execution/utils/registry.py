@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the registry which tracks the entries of the requests until they complete or expire."""
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+
+DEFAULT_MAX_SIZE = 1000
+
+ExpiryCallback = Callable[[Hashable, Any], None]
+
+
+class _Entry(NamedTuple):
+    """An entry of the registry."""
+
+    seq: int
+    deadline: float
+    value: Any
+    on_expire: Optional[ExpiryCallback]
+
+
+class RequestRegistry:
+    """
+    Tracks an entry per request, e.g., the callback of a response, until it is popped or its deadline passes.
+
+    Every entry has a deadline. The entries whose deadline has passed are removed by `expire`,
+    and their expiry callback is called, so that a lost response is detected instead of waited for forever.
+    At most `max_size` entries are kept; the oldest ones are evicted, and their expiry callback is called, to make room.
+    The deadlines are kept in a heap, which is pruned lazily, like the one of the `DeadlineScheduler`.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize the registry."""
+        if max_size <= 0:
+            raise ValueError(f"The max size must be positive, got {max_size}.")
+        self._max_size = max_size
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+        self.num_registered = 0
+        self.num_popped = 0
+        self.num_expired = 0
+        self.num_evicted = 0
+
+    def __len__(self) -> int:
+        """Get the number of the tracked entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether an entry is tracked."""
+        return key in self._entries
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the size metrics of the registry."""
+        return {
+            "size": len(self._entries),
+            "heap_size": len(self._heap),
+            "max_size": self._max_size,
+            "registered": self.num_registered,
+            "popped": self.num_popped,
+            "expired": self.num_expired,
+            "evicted": self.num_evicted,
+        }
+
+    def register(
+        self,
+        key: Hashable,
+        value: Any,
+        timeout: float,
+        on_expire: Optional[ExpiryCallback] = None,
+    ) -> None:
+        """
+        Track an entry, replacing the existing one with the same key, if any.
+
+        :param key: the key of the entry, e.g., the nonce of a dialogue.
+        :param value: the value of the entry, e.g., the callback of the response.
+        :param timeout: the seconds after which the entry expires.
+        :param on_expire: called with the key and the value of the entry if it expires, or is evicted.
+        """
+        self._entries.pop(key, None)
+        seq = next(self._seq)
+        deadline = time.time() + timeout
+        self._entries[key] = _Entry(seq, deadline, value, on_expire)
+        heapq.heappush(self._heap, (deadline, seq, key))
+        self.num_registered += 1
+
+        while len(self._entries) > self._max_size:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self.num_evicted += 1
+            self._notify(evicted_key, evicted)
+        self._compact()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the value of an entry, without removing it."""
+        entry = self._entries.get(key, None)
+        return default if entry is None else entry.value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry, e.g., because its response has arrived, and get its value."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.num_popped += 1
+        self._compact()
+        return entry.value
+
+    def fail(self, key: Hashable) -> bool:
+        """
+        Remove an entry and call its expiry callback right away, e.g., because its request has failed.
+
+        :param key: the key of the entry.
+        :return: whether the entry was tracked.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.num_expired += 1
+        self._compact()
+        self._notify(key, entry)
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        """Get the deadline of the entry that is going to expire next."""
+        self._drop_stale()
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0][0]
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Remove the entries whose deadline has passed, the earliest first, and call their expiry callbacks.
+
+        :param now: the current timestamp, defaults to the current time.
+        :return: the number of the expired entries.
+        """
+        now = time.time() if now is None else now
+        num_expired = 0
+        self._drop_stale()
+        while len(self._heap) > 0 and self._heap[0][0] <= now:
+            _, _, key = heapq.heappop(self._heap)
+            entry = self._entries.pop(key)
+            num_expired += 1
+            self._notify(key, entry)
+            self._drop_stale()
+        self.num_expired += num_expired
+        return num_expired
+
+    @staticmethod
+    def _notify(key: Hashable, entry: _Entry) -> None:
+        """Call the expiry callback of an entry."""
+        if entry.on_expire is not None:
+            entry.on_expire(key, entry.value)
+
+    def _drop_stale(self) -> None:
+        """Drop the heap entries of the removed or replaced entries from the top of the heap."""
+        while len(self._heap) > 0:
+            _, seq, key = self._heap[0]
+            entry = self._entries.get(key, None)
+            if entry is not None and entry.seq == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        """Rebuild the heap once the stale entries, which are only dropped from its top, dominate it."""
+        if len(self._heap) <= 2 * len(self._entries) + 16:
+            return
+        self._heap = [
+            (entry.deadline, entry.seq, key) for key, entry in self._entries.items()
+        ]
+        heapq.heapify(self._heap)
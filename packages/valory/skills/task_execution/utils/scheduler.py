@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2023-2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the scheduling of requests that can only be served after a deadline."""
+
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class DeadlineScheduler:
+    """
+    Keeps requests until their deadline passes.
+
+    Every request is recorded once along with its deadline, and is released as soon as the deadline has passed.
+    The deadlines are kept in a heap, so that the next one is always known without scanning the scheduled requests.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._heap: List[Tuple[float, int]] = []
+        # maps the id of each scheduled request to its deadline and the request itself
+        self._requests: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        """Get the number of scheduled requests."""
+        return len(self._requests)
+
+    def __contains__(self, request_id: int) -> bool:
+        """Check whether a request is scheduled."""
+        return request_id in self._requests
+
+    def schedule(self, request: Dict[str, Any], deadline: float) -> bool:
+        """
+        Schedule a request to be released once the deadline passes.
+
+        :param request: the request, which is identified by its `requestId`.
+        :param deadline: the timestamp after which the request is released.
+        :return: whether the request was scheduled, i.e., it was not already.
+        """
+        request_id = request["requestId"]
+        if request_id in self._requests:
+            return False
+        self._requests[request_id] = (deadline, request)
+        heapq.heappush(self._heap, (deadline, request_id))
+        return True
+
+    def cancel(self, request_id: int) -> None:
+        """Cancel a scheduled request, e.g., because it has been delivered by another mech."""
+        # the heap entry is dropped lazily, once it reaches the top
+        self._requests.pop(request_id, None)
+
+    def next_deadline(self) -> Optional[float]:
+        """Get the deadline of the request that is going to be released next."""
+        self._drop_cancelled()
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0][0]
+
+    def pop_due(self, now: float) -> List[Dict[str, Any]]:
+        """Release the requests whose deadline has passed, the earliest first."""
+        due = []
+        self._drop_cancelled()
+        while len(self._heap) > 0 and self._heap[0][0] <= now:
+            _, request_id = heapq.heappop(self._heap)
+            _, request = self._requests.pop(request_id)
+            due.append(request)
+            self._drop_cancelled()
+        return due
+
+    def _drop_cancelled(self) -> None:
+        """Drop the entries of cancelled requests from the top of the heap."""
+        while len(self._heap) > 0:
+            deadline, request_id = self._heap[0]
+            scheduled = self._requests.get(request_id, None)
+            if scheduled is not None and scheduled[0] == deadline:
+                return
+            # either cancelled, or cancelled and then scheduled again with another deadline
+            heapq.heappop(self._heap)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the transfer of the large values of the results of the tools through memory-mapped files."""
+
+import glob
+import mmap
+import os
+import tempfile
+from typing import Any, Optional, Union
+
+
+DEFAULT_SHARED_VALUE_THRESHOLD = 1024 * 1024
+# the files are backed by memory where possible, so that the values are not written to disk
+_DEV_SHM = "/dev/shm"  # nosec
+SHARED_MEMORY_DIR: Optional[str] = _DEV_SHM if os.path.isdir(_DEV_SHM) else None
+SHARED_VALUE_PREFIX = "mech_result_"
+
+
+def _get_prefix(parent_pid: int) -> str:
+    """Get the prefix of the files of the values shared with a parent process."""
+    return f"{SHARED_VALUE_PREFIX}{parent_pid}_"
+
+
+class SharedValue:
+    """
+    A handle to a large str or bytes value, which is passed to the parent process through a memory-mapped file.
+
+    Only the handle is pickled through the pipe of the process pool. The parent maps the file, and removes it right away.
+    """
+
+    def __init__(self, path: str, is_text: bool) -> None:
+        """Initialize the handle."""
+        self.path = path
+        self.is_text = is_text
+
+    @classmethod
+    def share(cls, value: Union[str, bytes]) -> Union["SharedValue", str, bytes]:
+        """
+        Write a value to a file for the parent process.
+
+        :param value: the value.
+        :return: the handle to the value, or the value itself if it cannot be written, e.g., there is no space left.
+        """
+        data = value.encode() if isinstance(value, str) else value
+        prefix = _get_prefix(os.getppid())
+        file = tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+            prefix=prefix, dir=SHARED_MEMORY_DIR, delete=False
+        )
+        try:
+            with file:
+                file.write(data)
+        except OSError:
+            os.remove(file.name)
+            return value
+        return cls(file.name, isinstance(value, str))
+
+    def load(self) -> Union[str, mmap.mmap]:
+        """
+        Map the file of the value, and remove it.
+
+        :return: the text, decoded straight from the mapped memory, or the mapped memory itself for a bytes value.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            # the mapped memory stays valid until it is closed
+            os.remove(self.path)
+        if not self.is_text:
+            return mapped
+        with mapped:
+            return str(mapped, "utf-8")
+
+
+def share_large_values(value: Any, threshold: int) -> Any:
+    """
+    Replace the str and bytes values which are at least `threshold` long with handles to shared files, recursively.
+
+    :param value: the value, e.g., the result of a tool.
+    :param threshold: the minimum length of the shared values, 0 disables the sharing.
+    :return: the value, with the large values replaced.
+    """
+    if threshold <= 0:
+        return value
+    if isinstance(value, dict):
+        return {key: share_large_values(item, threshold) for key, item in value.items()}
+    if isinstance(value, list):
+        return [share_large_values(item, threshold) for item in value]
+    if isinstance(value, tuple):
+        return tuple(share_large_values(item, threshold) for item in value)
+    if isinstance(value, (str, bytes)) and len(value) >= threshold:
+        return SharedValue.share(value)
+    return value
+
+
+def load_shared_values(value: Any) -> Any:
+    """Replace the handles to shared files with their values, recursively."""
+    if isinstance(value, SharedValue):
+        return value.load()
+    if isinstance(value, dict):
+        return {key: load_shared_values(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [load_shared_values(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(load_shared_values(item) for item in value)
+    return value
+
+
+def remove_shared_values() -> int:
+    """
+    Remove the files of the values which were shared with this process, but never loaded, e.g., of timed out tasks.
+
+    :return: the number of the removed files.
+    """
+    pattern = os.path.join(
+        SHARED_MEMORY_DIR or tempfile.gettempdir(), f"{_get_prefix(os.getpid())}*"
+    )
+    num_removed = 0
+    for path in glob.glob(pattern):
+        try:
+            os.remove(path)
+            num_removed += 1
+        except OSError:
+            continue
+    return num_removed
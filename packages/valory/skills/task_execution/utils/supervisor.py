@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the supervision of the worker process which executes the tasks."""
+
+import math
+import multiprocessing
+import resource
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Dict, Optional, Tuple, cast
+
+
+# the seconds that a worker is given to exit, once it is asked to
+WORKER_EXIT_TIMEOUT = 5.0
+# the unit of ru_maxrss, which is kilobytes on linux and bytes on macos
+_MAX_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class CpuTimeLimitExceeded(Exception):
+    """Raised in the worker when a task exceeds its CPU time limit."""
+
+
+class TaskFuture(Future):
+    """The future of a task which is executed by the worker, along with the resources that the task used."""
+
+    def __init__(self) -> None:
+        """Initialize the future."""
+        super().__init__()
+        self.usage: Optional[Dict[str, Any]] = None
+
+
+def _raise_cpu_time_limit_exceeded(_signum: int, _frame: Any) -> None:
+    """Interrupt the task which has exceeded its CPU time limit, on SIGXCPU."""
+    raise CpuTimeLimitExceeded("The task exceeded its CPU time limit.")
+
+
+def _get_cpu_time() -> float:
+    """Get the CPU time that this process has used, in seconds."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _get_address_space() -> Optional[int]:
+    """Get the size of the virtual memory of this process in bytes, where it is known."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as file:
+            return int(file.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _set_soft_limit(limit: int, value: Optional[int]) -> None:
+    """Set the soft limit of a resource, up to its hard limit, or back to the hard limit if the value is None."""
+    _, hard = resource.getrlimit(limit)
+    if value is None or (hard != resource.RLIM_INFINITY and value > hard):
+        value = hard
+    resource.setrlimit(limit, (value, hard))
+
+
+def _run_worker(connection: Connection, max_cpu_time: int, max_memory: int) -> None:
+    """
+    Execute the tasks which are received through the connection, one at a time, until it is closed.
+
+    The limits are set before every task, on top of what the worker has used so far,
+    since rlimits apply to the process as a whole, and not to each of its tasks.
+
+    :param connection: the connection to the supervisor.
+    :param max_cpu_time: the CPU seconds of each task, 0 for no limit.
+    :param max_memory: the bytes of memory that each task may allocate, 0 for no limit.
+    """
+    signal.signal(signal.SIGXCPU, _raise_cpu_time_limit_exceeded)
+    # the worker is stopped by the supervisor, and not by the interrupts of the agent
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        fn, args, kwargs = task
+        started_at, cpu_time = time.monotonic(), _get_cpu_time()
+        if max_cpu_time > 0:
+            _set_soft_limit(resource.RLIMIT_CPU, math.ceil(cpu_time) + max_cpu_time)
+        address_space = _get_address_space()
+        if max_memory > 0 and address_space is not None:
+            # rlimits cannot cap the resident memory on linux, so the address space is capped instead
+            _set_soft_limit(resource.RLIMIT_AS, address_space + max_memory)
+        try:
+            outcome: Tuple[bool, Any] = (True, fn(*args, **kwargs))
+        except BaseException as e:  # pylint: disable=broad-except
+            outcome = (False, e)
+        finally:
+            _set_soft_limit(resource.RLIMIT_CPU, None)
+            _set_soft_limit(resource.RLIMIT_AS, None)
+
+        usage = {
+            "cpu_time": round(_get_cpu_time() - cpu_time, 3),
+            "wall_time": round(time.monotonic() - started_at, 3),
+            # the peak of the worker, as the peak of a single task cannot be measured
+            "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            * _MAX_RSS_UNIT,
+        }
+        try:
+            connection.send((*outcome, usage))
+        except Exception as e:  # pylint: disable=broad-except
+            # e.g., the result cannot be pickled
+            connection.send((False, RuntimeError(f"{type(e).__name__}: {e}"), usage))
+
+
+class TaskSupervisor:
+    """
+    Executes the tasks, one at a time, in a worker process which is reused across the tasks.
+
+    Unlike the workers of a process pool, which cannot be stopped once a task hangs,
+    the supervisor knows the worker of the running task, and kills it when the task times out.
+    A new worker is started only then, for the next task.
+    Each task is limited to `max_cpu_time` CPU seconds and `max_memory` bytes of allocated memory,
+    and the future of each task reports the resources that the task used.
+    """
+
+    def __init__(self, max_cpu_time: int = 0, max_memory: int = 0) -> None:
+        """Initialize the supervisor, the worker is started along with the first task."""
+        self._max_cpu_time = max_cpu_time
+        self._max_memory = max_memory
+        self._process: Optional[BaseProcess] = None
+        self._connection: Optional[Connection] = None
+        self._running: Optional[TaskFuture] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Get the pid of the worker, if it is alive."""
+        if self._process is None or not self._process.is_alive():
+            return None
+        return self._process.pid
+
+    @property
+    def is_busy(self) -> bool:
+        """Check whether the worker is executing a task."""
+        return self._running is not None and not self._running.done()
+
+    def _start_worker(self) -> Tuple[BaseProcess, Connection]:
+        """Start a new worker."""
+        connection, worker_connection = multiprocessing.Pipe()
+        # a daemon, so that the worker never outlives the agent
+        process = multiprocessing.Process(
+            target=_run_worker,
+            args=(worker_connection, self._max_cpu_time, self._max_memory),
+            daemon=True,
+        )
+        process.start()
+        worker_connection.close()
+        self._process, self._connection = process, connection
+        return process, connection
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> TaskFuture:
+        """
+        Execute a task in the worker, starting a new worker if there is none, or it has died.
+
+        :param fn: the picklable function of the task.
+        :param args: the args of the function.
+        :param kwargs: the kwargs of the function.
+        :return: the future of the result of the task.
+        """
+        if self._process is None or not self._process.is_alive():
+            # there was no task yet, or the worker of the previous task has been killed, or has died
+            process, connection = self._start_worker()
+        elif self.is_busy:
+            raise ValueError("The worker is already executing a task.")
+        else:
+            process, connection = self._process, cast(Connection, self._connection)
+
+        future = TaskFuture()
+        future.set_running_or_notify_cancel()
+        self._running = future
+        try:
+            connection.send((fn, args, kwargs))
+        except Exception as e:  # pylint: disable=broad-except
+            # e.g., the args cannot be pickled
+            future.set_exception(e)
+            return future
+        threading.Thread(
+            target=self._wait_for_result,
+            args=(process.pid, connection, future),
+            daemon=True,
+        ).start()
+        return future
+
+    @staticmethod
+    def _wait_for_result(pid: int, connection: Connection, future: TaskFuture) -> None:
+        """Wait for the result of a task, or for its worker to die."""
+        try:
+            success, result, usage = connection.recv()
+        except (EOFError, OSError):
+            future.set_exception(
+                BrokenProcessPool(f"The worker {pid} died while executing the task.")
+            )
+            return
+        future.usage = usage
+        if success:
+            future.set_result(result)
+        else:
+            future.set_exception(result)
+
+    def kill(self) -> Optional[int]:
+        """
+        Kill the worker, e.g., when its task has timed out, so that it stops using resources right away.
+
+        :return: the pid of the killed worker, or None if there was no worker.
+        """
+        process = self._process
+        if process is None:
+            return None
+        process.kill()
+        process.join(WORKER_EXIT_TIMEOUT)
+        # the connection is closed once the thread which waits for the result of the task gets its end
+        self._process, self._connection, self._running = None, None, None
+        return process.pid
+
+    def shutdown(self) -> None:
+        """Stop the worker, which is killed if it is executing a task, or does not exit in time."""
+        if self._process is None:
+            return
+        if self.is_busy:
+            self.kill()
+            return
+        try:
+            cast(Connection, self._connection).send(None)
+        except OSError:
+            pass
+        self._process.join(WORKER_EXIT_TIMEOUT)
+        self.kill()
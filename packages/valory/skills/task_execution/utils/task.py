@@ -19,17 +19,117 @@
 
 """This package contains a custom Loader for the ipfs connection."""
 
-from typing import Any
+import ast
+import asyncio
+import inspect
+from typing import Any, Coroutine, Dict, List, Optional
+
+from packages.valory.skills.task_execution.utils.shared import (
+    DEFAULT_SHARED_VALUE_THRESHOLD,
+    share_large_values,
+)
+
+
+# the errors with which an async tool runs out of time, before python 3.11 the asyncio one is not the builtin one
+TIMEOUT_ERRORS = (asyncio.TimeoutError, TimeoutError)
+
+# the event loop of the worker process, which is reused by all the async tools that the worker executes
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop of the worker process, creating it the first time."""
+    global _event_loop  # pylint: disable=global-statement
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop
+
+
+def is_async_callable(tool_py: str, callable_method: Optional[str]) -> bool:
+    """Check whether the callable of a tool is a coroutine function, without executing the tool."""
+    if callable_method is None:
+        return False
+    try:
+        module = ast.parse(tool_py)
+    except SyntaxError:
+        return False
+    return any(
+        isinstance(node, ast.AsyncFunctionDef) and node.name == callable_method
+        for node in module.body
+    )
+
+
+async def _run_with_timeout(coroutine: Coroutine, timeout: Optional[float]) -> Any:
+    """Run a coroutine, which is cancelled once the timeout passes."""
+    return await asyncio.wait_for(coroutine, timeout)
+
+
+def _as_error(exception: BaseException) -> Exception:
+    """Get a picklable form of an exception raised by a tool, which keeps whether it was a timeout."""
+    if isinstance(exception, TIMEOUT_ERRORS):
+        return TimeoutError(str(exception))
+    return RuntimeError(f"{type(exception).__name__}: {exception}")
 
 
 class AnyToolAsTask:
     """AnyToolAsTask"""
 
+    @staticmethod
+    def _load(tool_py: str, callable_method: str) -> Any:
+        """Load the callable of a tool."""
+        local_namespace: Any = {}
+        exec(tool_py, local_namespace)  # pylint: disable=W0122  # nosec
+        return local_namespace[callable_method]
+
     def execute(self, *args: Any, **kwargs: Any) -> Any:
         """Execute the task."""
         tool_py = kwargs.pop("tool_py")
         callable_method = kwargs.pop("callable_method")
-        local_namespace: Any = {}
-        exec(tool_py, local_namespace)  # pylint: disable=W0122  # nosec
-        method = local_namespace[callable_method]
-        return method(*args, **kwargs)
+        shared_value_threshold = kwargs.pop(
+            "shared_value_threshold", DEFAULT_SHARED_VALUE_THRESHOLD
+        )
+        timeout = kwargs.pop("timeout", None)
+        method = self._load(tool_py, callable_method)
+        result = method(*args, **kwargs)
+        if inspect.iscoroutine(result):
+            # an async tool is cancelled when it runs out of time, so the worker is free for the next task
+            result = get_event_loop().run_until_complete(
+                _run_with_timeout(result, timeout)
+            )
+        # the large values of the result are passed to the parent through shared memory, instead of the pipe
+        return share_large_values(result, shared_value_threshold)
+
+    def execute_concurrently(
+        self,
+        tool_py: str,
+        callable_method: str,
+        requests: List[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        shared_value_threshold: int = DEFAULT_SHARED_VALUE_THRESHOLD,
+    ) -> List[Any]:
+        """
+        Execute the async callable of a tool for several requests, as concurrent coroutines.
+
+        :param tool_py: the source of the tool.
+        :param callable_method: the name of the async callable.
+        :param requests: the kwargs of the callable for each request.
+        :param timeout: the seconds after which each request is cancelled.
+        :param shared_value_threshold: the min length of the values which are passed through shared memory.
+        :return: the result of each request, or the exception it raised, e.g., a timeout error, in the order of the requests.
+        """
+        method = self._load(tool_py, callable_method)
+
+        async def _run_all() -> List[Any]:
+            return await asyncio.gather(
+                *(
+                    _run_with_timeout(method(**request), timeout)
+                    for request in requests
+                ),
+                return_exceptions=True,
+            )
+
+        results = [
+            _as_error(result) if isinstance(result, BaseException) else result
+            for result in get_event_loop().run_until_complete(_run_all())
+        ]
+        return share_large_values(results, shared_value_threshold)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the queue of the results which are uploaded to ipfs in the background."""
+
+import random
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_BACKOFF_BASE = 2.0
+DEFAULT_BACKOFF_MAX = 60.0
+
+
+class Upload:
+    """A result which is waiting for its upload to ipfs to be confirmed."""
+
+    def __init__(
+        self,
+        cid: str,
+        files: Dict[str, str],
+        done_task: Dict[str, Any],
+        sender_address: str,
+        task: Dict[str, Any],
+    ) -> None:
+        """
+        Initialize the upload.
+
+        :param cid: the locally computed cid of the files.
+        :param files: the files to upload, by name.
+        :param done_task: the task which is delivered once the upload is confirmed.
+        :param sender_address: the address of the requester, who has been sent the cid via ACN.
+        :param task: the executed task, which is executed again if the upload is dropped.
+        """
+        self.cid = cid
+        self.files = files
+        self.done_task = done_task
+        self.sender_address = sender_address
+        self.task = task
+        self.num_attempts = 0
+        self.next_attempt_at = 0.0
+
+
+class UploadQueue:
+    """
+    Keeps the results which are uploaded to ipfs until their upload is confirmed.
+
+    At most `max_in_flight` uploads are attempted at the same time, the oldest first.
+    A failed, or lost, upload is attempted again after an exponential backoff with full jitter,
+    and is dropped once it has been attempted `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ) -> None:
+        """Initialize the queue."""
+        if max_in_flight <= 0:
+            raise ValueError(
+                f"The max number of uploads in flight must be positive, got {max_in_flight}."
+            )
+        if max_attempts <= 0:
+            raise ValueError(
+                f"The max number of attempts must be positive, got {max_attempts}."
+            )
+        self._max_in_flight = max_in_flight
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        # the uploads which wait to be attempted, by cid, in the order they were added or failed
+        self._waiting: "OrderedDict[str, Upload]" = OrderedDict()
+        self._in_flight: Dict[str, Upload] = {}
+        self.num_confirmed = 0
+        self.num_retried = 0
+        self.num_dropped = 0
+
+    def __len__(self) -> int:
+        """Get the number of the uploads which are not confirmed yet."""
+        return len(self._waiting) + len(self._in_flight)
+
+    def __contains__(self, cid: str) -> bool:
+        """Check whether an upload is not confirmed yet."""
+        return cid in self._waiting or cid in self._in_flight
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the metrics of the queue."""
+        return {
+            "waiting": len(self._waiting),
+            "in_flight": len(self._in_flight),
+            "confirmed": self.num_confirmed,
+            "retried": self.num_retried,
+            "dropped": self.num_dropped,
+        }
+
+    def add(self, upload: Upload) -> bool:
+        """
+        Add an upload to the queue.
+
+        :param upload: the upload.
+        :return: whether the upload was added, i.e., the same files are not already being uploaded.
+        """
+        if upload.cid in self:
+            return False
+        self._waiting[upload.cid] = upload
+        return True
+
+    def pop_due(self, now: float) -> List[Upload]:
+        """
+        Mark the uploads which are due as in flight, as long as there is room, and return them.
+
+        :param now: the current timestamp.
+        :return: the uploads to attempt.
+        """
+        due = []
+        for cid, upload in list(self._waiting.items()):
+            if len(self._in_flight) >= self._max_in_flight:
+                break
+            if upload.next_attempt_at > now:
+                continue
+            del self._waiting[cid]
+            upload.num_attempts += 1
+            self._in_flight[cid] = upload
+            due.append(upload)
+        return due
+
+    def confirm(self, cid: str) -> Optional[Upload]:
+        """Remove an upload in flight, because it has been stored, and return it."""
+        upload = self._in_flight.pop(cid, None)
+        if upload is not None:
+            self.num_confirmed += 1
+        return upload
+
+    def fail(self, cid: str, now: float) -> bool:
+        """
+        Attempt an upload in flight again after a backoff, because it has failed or its response was lost.
+
+        :param cid: the cid of the upload.
+        :param now: the current timestamp.
+        :return: whether the upload is attempted again, i.e., it has not run out of attempts.
+        """
+        upload = self._in_flight.pop(cid, None)
+        if upload is None:
+            return False
+        if upload.num_attempts >= self._max_attempts:
+            self.num_dropped += 1
+            return False
+        delay = min(self._backoff_max, self._backoff_base * 2**upload.num_attempts)
+        upload.next_attempt_at = now + random.uniform(0, delay)  # nosec
+        self._waiting[cid] = upload
+        self.num_retried += 1
+        return True
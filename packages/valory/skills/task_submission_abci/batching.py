@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the gas-aware planning of delivery batches."""
+from typing import Any, Dict, List, Tuple, Union
+
+
+# gas charged by the evm for each byte of calldata
+CALLDATA_ZERO_BYTE_GAS = 4
+CALLDATA_NONZERO_BYTE_GAS = 16
+# every multisend entry is packed as operation (1) + to (20) + value (32) + data length (32)
+MULTISEND_ENTRY_HEADER_SIZE = 85
+# the selector, followed by the request ids, or the staking instance and the service id, and the offset and length of the data
+DELIVER_CALLDATA_HEADER_SIZE = 4 + 5 * 32
+WORD_SIZE = 32
+
+
+def calldata_gas(data: Union[bytes, str, None]) -> int:
+    """Get the intrinsic gas charged for the provided calldata."""
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    zero_bytes = data.count(0)
+    return (
+        zero_bytes * CALLDATA_ZERO_BYTE_GAS
+        + (len(data) - zero_bytes) * CALLDATA_NONZERO_BYTE_GAS
+    )
+
+
+def estimate_delivery_gas(task: Dict[str, Any], deliver_base_gas: int) -> int:
+    """
+    Estimate the gas that the delivery of a done task is going to consume in a multisend.
+
+    The estimation only depends on the task itself, so that all the agents reach the same plan.
+    The deliver calldata is priced as if every byte was non-zero, which makes it an upper bound.
+
+    :param task: the done task.
+    :param deliver_base_gas: the execution gas of a single deliver call.
+    :return: the estimated gas.
+    """
+    task_result = task.get("task_result", "") or ""
+    result_size = len(task_result) // 2
+    padded_result_size = -(-result_size // WORD_SIZE) * WORD_SIZE
+    deliver_size = (
+        MULTISEND_ENTRY_HEADER_SIZE + DELIVER_CALLDATA_HEADER_SIZE + padded_result_size
+    )
+    gas = deliver_base_gas + deliver_size * CALLDATA_NONZERO_BYTE_GAS
+
+    response_tx = task.get("transaction", None)
+    if response_tx is not None:
+        # the response tx of the tool is sent in the same multisend
+        response_data = response_tx.get("data", None)
+        gas += (
+            deliver_base_gas
+            + MULTISEND_ENTRY_HEADER_SIZE * CALLDATA_NONZERO_BYTE_GAS
+            + calldata_gas(response_data)
+        )
+    return gas
+
+
+def task_age_key(task: Dict[str, Any]) -> Tuple[int, Any]:
+    """Sorting key which puts the oldest requests first."""
+    block_number = task.get("block_number", None)
+    if block_number is None:
+        # tasks which do not carry a block number are treated as the oldest
+        block_number = 0
+    return block_number, task["request_id"]
+
+
+def plan_delivery_batch(
+    tasks: List[Dict[str, Any]],
+    gas_ceiling: int,
+    deliver_base_gas: int,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Pack the oldest done tasks into a batch that fits under the gas ceiling.
+
+    The oldest task is always part of the batch, even if its estimation exceeds the ceiling on its own,
+    so that a single large delivery cannot block the queue forever.
+
+    :param tasks: the done tasks to be delivered.
+    :param gas_ceiling: the gas available for the deliveries of the batch.
+    :param deliver_base_gas: the execution gas of a single deliver call.
+    :return: the tasks to deliver in this batch, and the tasks deferred to a later one.
+    """
+    batch: List[Dict[str, Any]] = []
+    deferred: List[Dict[str, Any]] = []
+    used_gas = 0
+    for task in sorted(tasks, key=task_age_key):
+        task_gas = estimate_delivery_gas(task, deliver_base_gas)
+        if len(deferred) == 0 and (
+            len(batch) == 0 or used_gas + task_gas <= gas_ceiling
+        ):
+            batch.append(task)
+            used_gas += task_gas
+            continue
+        # keep the age ordering: once a task is deferred, every newer task is deferred too
+        deferred.append(task)
+    return batch, deferred
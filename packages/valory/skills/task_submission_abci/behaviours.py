@@ -39,10 +39,8 @@ from packages.valory.contracts.gnosis_safe.contract import (
     SafeOperation,
 )
 from packages.valory.contracts.hash_checkpoint.contract import HashCheckpointContract
-from packages.valory.contracts.multisend.contract import (
-    MultiSendContract,
-    MultiSendOperation,
-)
+from packages.valory.contracts.multicall3.contract import Multicall3Contract
+from packages.valory.contracts.multisend.contract import MultiSendOperation
 from packages.valory.contracts.service_registry.contract import ServiceRegistryContract
 from packages.valory.protocols.contract_api import ContractApiMessage
 from packages.valory.protocols.ledger_api import LedgerApiMessage
@@ -61,6 +59,19 @@ from packages.valory.skills.task_submission_abci.rounds import (
     TaskSubmissionAbciApp,
     TransactionPreparationRound,
 )
+from packages.valory.skills.task_submission_abci.safe_tx import (
+    encode_multisend_data,
+    get_safe_tx_hash,
+)
+from packages.valory.skills.task_submission_abci.usage import (
+    NUM_DELTAS_KEY,
+    USAGE_KEY,
+    ZERO_IPFS_HASH,
+    add_usage,
+    build_usage_delta,
+    count_usage,
+    walk_usage_log,
+)
 from packages.valory.skills.transaction_settlement_abci.payload_tools import (
     hash_payload_to_hex,
 )
@@ -71,9 +82,10 @@ AUTO_GAS = SAFE_GAS = 0
 DONE_TASKS = "ready_tasks"
 DONE_TASKS_LOCK = "lock"
 NO_DATA = b""
-ZERO_IPFS_HASH = (
-    "f017012200000000000000000000000000000000000000000000000000000000000000000"
-)
+CHECKPOINT_HASH_PREFIX = "f01701220"
+MAX_CACHED_USAGE_DOCS = 2
+# the usage checkpoints which are downloaded per period ahead of the transaction preparation
+MAX_USAGE_DOC_PREFETCHES = 10
 FILENAME = "usage"
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 LAST_TX = "last_tx"
@@ -175,7 +187,170 @@ class TaskExecutionBaseBehaviour(BaseBehaviour, ABC):
         )
 
 
-class TaskPoolingBehaviour(TaskExecutionBaseBehaviour, ABC):
+class DeliverBehaviour(TaskExecutionBaseBehaviour, ABC):
+    """Behaviour for tracking task delivery by the agents."""
+
+    def _get_latest_usage_hash(self) -> Generator[None, None, Optional[str]]:
+        """Get the hash of the latest usage checkpoint."""
+        contract_api_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=self.params.hash_checkpoint_address,
+            contract_id=str(HashCheckpointContract.contract_id),
+            contract_callable="get_latest_hash",
+            sender_address=self.synchronized_data.safe_contract_address,
+        )
+        if contract_api_msg.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                f"get_latest_hash unsuccessful!: {contract_api_msg}"
+            )
+            return None
+        latest_ipfs_hash = cast(str, contract_api_msg.state.body["data"])
+        self.context.logger.debug(f"Latest IPFS hash: {latest_ipfs_hash}")
+        return latest_ipfs_hash
+
+    def _download_usage_doc(
+        self, checkpoint_hash: str
+    ) -> Generator[None, None, Optional[Dict[str, Any]]]:
+        """Download a usage checkpoint from IPFS."""
+        # format the hash
+        ipfs_hash = str(CID.from_string(checkpoint_hash))
+        usage_doc = yield from self.get_from_ipfs(
+            ipfs_hash, filetype=SupportedFiletype.JSON
+        )
+        if usage_doc is None:
+            self.context.logger.warning(
+                f"Could not get usage data from IPFS: {checkpoint_hash}"
+            )
+            return None
+        return cast(Dict[str, Any], usage_doc)
+
+    def _get_usage_totals(
+        self, checkpoint_hash: str, max_downloads: Optional[int] = None
+    ) -> Generator[None, None, Optional[Tuple[Dict[str, Any], int]]]:
+        """
+        Reconstruct the usage totals of a checkpoint, and cache them.
+
+        :param checkpoint_hash: the hash of the checkpoint, as stored on-chain.
+        :param max_downloads: the maximum number of checkpoints to download, None for no limit.
+        :return: the usage totals, and the number of deltas since the latest snapshot.
+        :yield: None
+        """
+        mutable_params = self.params.task_mutable_params
+        usage_totals = yield from walk_usage_log(
+            checkpoint_hash,
+            mutable_params.usage_by_hash,
+            mutable_params.usage_doc_by_hash,
+            self._download_usage_doc,
+            max_downloads,
+        )
+        if usage_totals is None:
+            return None
+
+        totals, num_deltas = usage_totals
+        self._cache_usage(checkpoint_hash, totals, num_deltas)
+        # the totals are cached now, so the downloaded checkpoints are not needed anymore
+        mutable_params.usage_doc_by_hash.clear()
+        return deepcopy(totals), num_deltas
+
+    def prefetch_usage(self) -> Generator:
+        """
+        Download a part of the usage log of the latest checkpoint, ahead of the transaction preparation.
+
+        Then, an agent with a cold cache, e.g., after a restart, does not have to download the whole log,
+        of up to `usage_snapshot_interval` checkpoints, while preparing the transaction.
+        At most `MAX_USAGE_DOC_PREFETCHES` checkpoints are downloaded per call, the next calls resume from them.
+        """
+        latest_ipfs_hash = yield from self._get_latest_usage_hash()
+        if latest_ipfs_hash is None:
+            return
+        usage_totals = yield from self._get_usage_totals(
+            latest_ipfs_hash, MAX_USAGE_DOC_PREFETCHES
+        )
+        if usage_totals is None:
+            self.context.logger.info(
+                f"The usage log of {latest_ipfs_hash} is partially downloaded, "
+                f"the rest of it is downloaded in the next periods."
+            )
+
+    def _get_current_delivery_report(
+        self,
+    ) -> Generator[None, None, Optional[Dict[str, Any]]]:
+        """Get the current usage, as checkpointed on-chain."""
+        latest_ipfs_hash = yield from self._get_latest_usage_hash()
+        if latest_ipfs_hash is None:
+            return None
+
+        usage_totals = yield from self._get_usage_totals(latest_ipfs_hash)
+        if usage_totals is None:
+            return None
+
+        current_usage, num_deltas = usage_totals
+        mutable_params = self.params.task_mutable_params
+        mutable_params.latest_usage_hash = latest_ipfs_hash
+        mutable_params.num_usage_deltas = num_deltas
+        return current_usage
+
+    def _cache_usage(
+        self, checkpoint_hash: str, usage: Dict[str, Any], num_deltas: int
+    ) -> None:
+        """Cache the usage totals of a checkpoint, keeping only the most recent ones."""
+        usage_by_hash = self.params.task_mutable_params.usage_by_hash
+        usage_by_hash.pop(checkpoint_hash, None)
+        usage_by_hash[checkpoint_hash] = {
+            USAGE_KEY: deepcopy(usage),
+            NUM_DELTAS_KEY: num_deltas,
+        }
+        while len(usage_by_hash) > MAX_CACHED_USAGE_DOCS:
+            oldest_hash = next(iter(usage_by_hash))
+            usage_by_hash.pop(oldest_hash)
+
+    def _update_current_delivery_report(
+        self,
+        current_usage: Dict[str, Any],
+        done_tasks: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Update the usage of the tool on IPFS."""
+        return add_usage(current_usage, done_tasks)
+
+    def get_delivery_report(self) -> Generator[None, None, Optional[Dict[str, Any]]]:
+        """
+        Get the task delivery report.
+
+        This method returns a dictionary of the form:
+        {
+            "agent_address": {
+                "tool_name": num_delivered_tasks
+            }
+        }
+
+        Note that the report contains the tasks that are being delivered on-chain in the current period.
+        The report is computed once per period, subsequent calls in the same period return a copy of it.
+
+        :return: the delivery report:
+        :yield: None
+        """
+        mutable_params = self.params.task_mutable_params
+        period_count = self.synchronized_data.period_count
+        if (
+            mutable_params.delivery_report is not None
+            and mutable_params.delivery_report_period_count == period_count
+        ):
+            return deepcopy(mutable_params.delivery_report)
+
+        current_usage = yield from self._get_current_delivery_report()
+        if current_usage is None:
+            # something went wrong
+            self.context.logger.warning("Could not get current usage.")
+            return None
+
+        done_tasks = self.synchronized_data.done_tasks
+        updated_usage = self._update_current_delivery_report(current_usage, done_tasks)
+        mutable_params.delivery_report = deepcopy(updated_usage)
+        mutable_params.delivery_report_period_count = period_count
+        return updated_usage
+
+
+class TaskPoolingBehaviour(DeliverBehaviour, ABC):
     """TaskPoolingBehaviour"""
 
     matching_round: Type[AbstractRound] = TaskPoolingRound
@@ -185,6 +360,8 @@ class TaskPoolingBehaviour(TaskExecutionBaseBehaviour, ABC):
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
             # clean up the queue based on the outcome of the previous period
             self.handle_submitted_tasks()
+            # so that the usage is ready by the time the transaction is prepared
+            yield from self.prefetch_usage()
 
             # sync new tasks
             payload_content = yield from self.get_payload_content()
@@ -248,83 +425,6 @@ class TaskPoolingBehaviour(TaskExecutionBaseBehaviour, ABC):
                 return (False, "")
 
 
-class DeliverBehaviour(TaskExecutionBaseBehaviour, ABC):
-    """Behaviour for tracking task delivery by the agents."""
-
-    def _get_current_delivery_report(
-        self,
-    ) -> Generator[None, None, Optional[Dict[str, Any]]]:
-        """Get the current ."""
-        contract_api_msg = yield from self.get_contract_api_response(
-            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-            contract_address=self.params.hash_checkpoint_address,
-            contract_id=str(HashCheckpointContract.contract_id),
-            contract_callable="get_latest_hash",
-            sender_address=self.synchronized_data.safe_contract_address,
-        )
-        if contract_api_msg.performative != ContractApiMessage.Performative.STATE:
-            self.context.logger.warning(
-                f"get_latest_hash unsuccessful!: {contract_api_msg}"
-            )
-            return None
-        latest_ipfs_hash = cast(str, contract_api_msg.state.body["data"])
-        self.context.logger.debug(f"Latest IPFS hash: {latest_ipfs_hash}")
-        if latest_ipfs_hash == ZERO_IPFS_HASH:
-            return {}
-        # format the hash
-        ipfs_hash = str(CID.from_string(latest_ipfs_hash))
-        usage_data = yield from self.get_from_ipfs(
-            ipfs_hash, filetype=SupportedFiletype.JSON
-        )
-        if usage_data is None:
-            self.context.logger.warning(
-                f"Could not get usage data from IPFS: {latest_ipfs_hash}"
-            )
-            return None
-        return cast(Dict[str, Any], usage_data)
-
-    def _update_current_delivery_report(
-        self,
-        current_usage: Dict[str, Any],
-        done_tasks: List[Dict[str, Any]],
-    ) -> Dict[str, Any]:
-        """Update the usage of the tool on IPFS."""
-        for task in done_tasks:
-            agent, tool = task["task_executor_address"], task["tool"]
-            if agent not in current_usage:
-                current_usage[agent] = {}
-            if tool not in current_usage[agent]:
-                current_usage[agent][tool] = 0
-            current_usage[agent][tool] += 1
-        return current_usage
-
-    def get_delivery_report(self) -> Generator[None, None, Optional[Dict[str, Any]]]:
-        """
-        Get the task delivery report.
-
-        This method returns a dictionary of the form:
-        {
-            "agent_address": {
-                "tool_name": num_delivered_tasks
-            }
-        }
-
-        Note that the report contains the tasks that are being delivered on-chain in the current period.
-
-        :return: the delivery report:
-        :yield: None
-        """
-        current_usage = yield from self._get_current_delivery_report()
-        if current_usage is None:
-            # something went wrong
-            self.context.logger.warning("Could not get current usage.")
-            return None
-
-        done_tasks = self.synchronized_data.done_tasks
-        updated_usage = self._update_current_delivery_report(current_usage, done_tasks)
-        return updated_usage
-
-
 class FundsSplittingBehaviour(DeliverBehaviour, ABC):
     """FundsSplittingBehaviour"""
 
@@ -384,17 +484,21 @@ class FundsSplittingBehaviour(DeliverBehaviour, ABC):
             return []
 
         self.context.logger.info(f"Splitting profits {self.mech_addresses}.")
+        agents = self.synchronized_data.all_participants
+        # the balances of all the mechs and the agents are read in a single call
+        balances = yield from self._get_balances([*self.mech_addresses, *agents])
+        if balances is None:
+            self.context.logger.error(
+                "Could not get the balances of the mechs and the agents. Don't split profits."
+            )
+            return None
+
+        agent_balances = {agent: balances[agent] for agent in agents}
         txs = []
         for mech_address in self.mech_addresses:
-            profits = yield from self._get_balance(mech_address)
-            if profits is None:
-                self.context.logger.error(
-                    f"Could not get profits from mech {mech_address}. Don't split profits."
-                )
-                return None
-
+            profits = balances[mech_address]
             self.context.logger.info(f"Got {profits} profits from mech {mech_address}")
-            split_funds = yield from self._split_funds(profits)
+            split_funds = yield from self._split_funds(profits, agent_balances)
             if split_funds is None:
                 self.context.logger.error(
                     f"Could not split profits from mech {mech_address}. Don't split profits."
@@ -423,25 +527,38 @@ class FundsSplittingBehaviour(DeliverBehaviour, ABC):
             return None
         return txs
 
-    def _get_balance(self, address: str) -> Generator[None, None, Optional[int]]:
-        """Get the balance for the provided address."""
-        ledger_api_response = yield from self.get_ledger_api_response(
-            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
-            ledger_callable="get_balance",
-            account=address,
+    def _get_balances(
+        self, addresses: List[str]
+    ) -> Generator[None, None, Optional[Dict[str, int]]]:
+        """Get the balances of the provided addresses, using a single multicall."""
+        contract_api_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=self.params.multicall_address,
+            contract_id=str(Multicall3Contract.contract_id),
+            contract_callable="get_eth_balances",
+            accounts=addresses,
         )
-        if ledger_api_response.performative != LedgerApiMessage.Performative.STATE:
+        if contract_api_msg.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                f"get_eth_balances unsuccessful!: {contract_api_msg}"
+            )
             return None
-        balance = cast(int, ledger_api_response.state.body.get("get_balance_result"))
-        return balance
+
+        balances = cast(Dict[str, int], contract_api_msg.state.body["balances"])
+        for address in addresses:
+            if address not in balances:
+                self.context.logger.warning(f"Could not get balance for {address}.")
+                return None
+        return balances
 
     def _split_funds(
-        self, profits: int
+        self, profits: int, agent_balances: Dict[str, int]
     ) -> Generator[None, None, Optional[Dict[str, int]]]:
         """
         Split the funds among the operators based on the number of txs their agents have made.
 
         :param profits: the amount of funds to split.
+        :param agent_balances: the balances of the agents.
         :returns: a dictionary mapping operator addresses to the amount of funds they should receive.
         :yields: None
         """
@@ -454,13 +571,7 @@ class FundsSplittingBehaviour(DeliverBehaviour, ABC):
             return None
 
         funds_by_address = {}
-        agent_funding_amounts = yield from self._get_agent_funding_amounts()
-        if agent_funding_amounts is None:
-            self.context.logger.warning(
-                "Could not get agent funding amounts. Don't split profits."
-            )
-            return None
-
+        agent_funding_amounts = self._get_agent_funding_amounts(agent_balances)
         funds_by_address.update(agent_funding_amounts)
         total_required_amount_for_agents = sum(agent_funding_amounts.values())
         if total_required_amount_for_agents > profits:
@@ -622,32 +733,11 @@ class FundsSplittingBehaviour(DeliverBehaviour, ABC):
                 reqs_by_operator[operator] += reqs
         return reqs_by_operator
 
-    def _get_agent_balances(self) -> Generator[None, None, Optional[Dict[str, int]]]:
-        """Get the agent balances."""
-        balances = {}
-        for agent in self.synchronized_data.all_participants:
-            balance = yield from self._get_balance(agent)
-            if balance is None:
-                self.context.logger.warning(
-                    f"Could not get balance for agent {agent}. Skipping re-funding."
-                )
-                return None
-            balances[agent] = balance
-
-        return balances
-
     def _get_agent_funding_amounts(
-        self,
-    ) -> Generator[None, None, Optional[Dict[str, int]]]:
-        """Get the agent balances."""
+        self, agent_balances: Dict[str, int]
+    ) -> Dict[str, int]:
+        """Get the amounts the agents need to be funded with."""
         agent_funding_amounts = {}
-        agent_balances = yield from self._get_agent_balances()
-        if agent_balances is None:
-            self.context.logger.warning(
-                "Could not get agent balances. Skipping re-funding."
-            )
-            return None
-
         for agent, balance in agent_balances.items():
             if balance < self.params.minimum_agent_balance:
                 agent_funding_amounts[agent] = self.params.agent_funding_amount
@@ -687,17 +777,42 @@ class TrackingBehaviour(DeliverBehaviour, ABC):
         }
 
     def _save_usage_to_ipfs(
-        self, current_usage: Dict[str, Any]
+        self, usage_doc: Dict[str, Any]
     ) -> Generator[None, None, Optional[str]]:
         """Save usage to ipfs."""
         ipfs_hash = yield from self.send_to_ipfs(
-            FILENAME, current_usage, filetype=SupportedFiletype.JSON
+            FILENAME, usage_doc, filetype=SupportedFiletype.JSON
         )
         if ipfs_hash is None:
             self.context.logger.warning("Could not update usage.")
             return None
         return ipfs_hash
 
+    def _get_usage_checkpoint(
+        self, updated_usage: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Get the usage checkpoint to store for this period.
+
+        A delta with this period's increments is stored, unless a snapshot is due.
+
+        :param updated_usage: the usage totals, including this period's deliveries.
+        :return: the checkpoint, and the number of deltas since the latest snapshot it results in.
+        """
+        mutable_params = self.params.task_mutable_params
+        previous_hash = mutable_params.latest_usage_hash
+        num_deltas = mutable_params.num_usage_deltas + 1
+        if (
+            previous_hash is None
+            or previous_hash == ZERO_IPFS_HASH
+            or num_deltas >= self.params.usage_snapshot_interval
+        ):
+            # compact the log into a snapshot
+            return updated_usage, 0
+
+        increments = count_usage(self.synchronized_data.done_tasks)
+        return build_usage_delta(previous_hash, increments), num_deltas
+
     def get_update_usage_tx(self) -> Generator:
         """Get a tx to update the usage."""
         updated_usage = yield from self.get_delivery_report()
@@ -706,7 +821,8 @@ class TrackingBehaviour(DeliverBehaviour, ABC):
             self.context.logger.warning("Could not get current usage.")
             return None
 
-        ipfs_hash = yield from self._save_usage_to_ipfs(updated_usage)
+        usage_doc, num_deltas = self._get_usage_checkpoint(updated_usage)
+        ipfs_hash = yield from self._save_usage_to_ipfs(usage_doc)
         if ipfs_hash is None:
             # something went wrong
             self.context.logger.warning("Could not save usage to IPFS.")
@@ -714,6 +830,10 @@ class TrackingBehaviour(DeliverBehaviour, ABC):
 
         self.context.logger.info(f"Saved updated usage to IPFS: {ipfs_hash}")
         ipfs_hash = self.to_multihash(to_v1(ipfs_hash))
+        # once the checkpoint is settled, the next period reads the usage from the cache
+        self._cache_usage(
+            f"{CHECKPOINT_HASH_PREFIX}{ipfs_hash}", updated_usage, num_deltas
+        )
         tx = yield from self._get_checkpoint_tx(
             self.params.hash_checkpoint_address, ipfs_hash
         )
@@ -881,24 +1001,7 @@ class TransactionPreparationBehaviour(
             }
             multi_send_txs.append(transaction)
 
-        response = yield from self.get_contract_api_response(
-            performative=ContractApiMessage.Performative.GET_RAW_TRANSACTION,  # type: ignore
-            contract_address=self.params.multisend_address,
-            contract_id=str(MultiSendContract.contract_id),
-            contract_callable="get_tx_data",
-            multi_send_txs=multi_send_txs,
-        )
-        if response.performative != ContractApiMessage.Performative.RAW_TRANSACTION:
-            self.context.logger.error(
-                f"Couldn't compile the multisend tx. "
-                f"Expected performative {ContractApiMessage.Performative.RAW_TRANSACTION.value}, "  # type: ignore
-                f"received {response.performative.value}."
-            )
-            return None
-
-        # strip "0x" from the response
-        multisend_data_str = cast(str, response.raw_transaction.body["data"])[2:]
-        tx_data = bytes.fromhex(multisend_data_str)
+        tx_data = encode_multisend_data(multi_send_txs)
         tx_hash = yield from self._get_safe_tx_hash(tx_data)
         if tx_hash is None:
             # something went wrong
@@ -915,38 +1018,99 @@ class TransactionPreparationBehaviour(
         )
         return payload_data
 
+    def _get_safe_nonce(self) -> Generator[None, None, Optional[int]]:
+        """Get the nonce of the safe, fetching it at most once per period."""
+        mutable_params = self.params.task_mutable_params
+        period_count = self.synchronized_data.period_count
+        if (
+            mutable_params.safe_nonce is not None
+            and mutable_params.safe_nonce_period_count == period_count
+        ):
+            return mutable_params.safe_nonce
+
+        response = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=self.synchronized_data.safe_contract_address,
+            contract_id=str(GnosisSafeContract.contract_id),
+            contract_callable="get_safe_nonce",
+        )
+        if response.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.error(
+                f"Couldn't get safe nonce. "
+                f"Expected response performative {ContractApiMessage.Performative.STATE.value}, "  # type: ignore
+                f"received {response.performative.value}."
+            )
+            return None
+
+        safe_nonce = cast(int, response.state.body["safe_nonce"])
+        mutable_params.safe_nonce = safe_nonce
+        mutable_params.safe_nonce_period_count = period_count
+        return safe_nonce
+
+    def _get_safe_chain_id(self) -> Generator[None, None, Optional[int]]:
+        """Get the id of the chain of the safe, reading the chain of the ledger only once."""
+        mutable_params = self.params.task_mutable_params
+        if mutable_params.ledger_chain_id is None:
+            # `eth.chain_id` is a property, so its `eth_chainId` method is called instead
+            response = yield from self.get_ledger_api_response(
+                performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+                ledger_callable="_chain_id",
+                chain_id=self.params.default_chain_id,
+            )
+            if response.performative != LedgerApiMessage.Performative.STATE:
+                self.context.logger.error(
+                    f"Couldn't get the chain id of the ledger. "
+                    f"Expected response performative {LedgerApiMessage.Performative.STATE.value}, "  # type: ignore
+                    f"received {response.performative.value}."
+                )
+                return None
+            mutable_params.ledger_chain_id = cast(
+                int, response.state.body["_chain_id_result"]
+            )
+
+        chain_id = mutable_params.ledger_chain_id
+        safe_chain_id = self.params.safe_chain_id
+        if safe_chain_id is not None and safe_chain_id != chain_id:
+            # the owners would sign a hash which the safe does not accept
+            self.context.logger.error(
+                f"`safe_chain_id` is set to {safe_chain_id}, but the ledger is connected to the chain {chain_id}. "
+                "Please set `safe_chain_id` to the chain of the safe, or unset it."
+            )
+            return None
+        return chain_id
+
     def _get_safe_tx_hash(self, data: bytes) -> Generator[None, None, Optional[str]]:
         """
         Prepares and returns the safe tx hash.
 
         This hash will be signed later by the agents, and submitted to the safe contract.
         Note that this is the transaction that the safe will execute, with the provided data.
+        The hash is computed locally, only the chain id and the safe nonce are read from the chain.
 
         :param data: the safe tx data.
         :return: the tx hash
+        :yield: None
         """
-        response = yield from self.get_contract_api_response(
-            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-            contract_address=self.synchronized_data.safe_contract_address,
-            contract_id=str(GnosisSafeContract.contract_id),
-            contract_callable="get_raw_safe_transaction_hash",
+        safe_chain_id = yield from self._get_safe_chain_id()
+        if safe_chain_id is None:
+            # something went wrong
+            return None
+
+        safe_nonce = yield from self._get_safe_nonce()
+        if safe_nonce is None:
+            # something went wrong
+            return None
+
+        tx_hash = get_safe_tx_hash(
+            chain_id=safe_chain_id,
+            safe_address=self.synchronized_data.safe_contract_address,
             to_address=self.params.multisend_address,  # we send the tx to the multisend address
             value=ZERO_ETHER_VALUE,
             data=data,
-            safe_tx_gas=SAFE_GAS,
             operation=SafeOperation.DELEGATE_CALL.value,
+            safe_tx_gas=SAFE_GAS,
+            nonce=safe_nonce,
         )
-
-        if response.performative != ContractApiMessage.Performative.STATE:
-            self.context.logger.error(
-                f"Couldn't get safe hash. "
-                f"Expected response performative {ContractApiMessage.Performative.STATE.value}, "  # type: ignore
-                f"received {response.performative.value}."
-            )
-            return None
-
-        # strip "0x" from the response hash
-        tx_hash = cast(str, response.state.body["tx_hash"])[2:]
         return tx_hash
 
     def _get_agent_mech_deliver_tx(
@@ -18,7 +18,7 @@
 # ------------------------------------------------------------------------------
 
 """This module contains the shared state for the abci skill of TaskExecutionAbciApp."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional, Type
 
 from aea.exceptions import enforce
@@ -49,6 +49,17 @@ class MutableParams(TypeCheckMixin):
     """Collection for the mutable parameters."""
 
     latest_metadata_hash: Optional[bytes] = None
+    safe_nonce: Optional[int] = None
+    safe_nonce_period_count: Optional[int] = None
+    ledger_chain_id: Optional[int] = None
+    delivery_report: Optional[Dict[str, Any]] = None
+    delivery_report_period_count: Optional[int] = None
+    latest_usage_hash: Optional[str] = None
+    num_usage_deltas: int = 0
+    # maps the checkpointed ipfs hash to the usage totals it results in
+    usage_by_hash: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # the usage docs fetched by a walk of the log which has not completed yet
+    usage_doc_by_hash: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 class Params(BaseParams):
@@ -60,6 +71,7 @@ class Params(BaseParams):
         self.task_wait_timeout = self._ensure("task_wait_timeout", kwargs, float)
         self.service_endpoint_base = self._ensure("service_endpoint_base", kwargs, str)
         self.multisend_address = self._ensure_get("multisend_address", kwargs, str)
+        self.multicall_address = self._ensure_get("multicall_address", kwargs, str)
         self.agent_registry_address = self._ensure(
             "agent_registry_address", kwargs, str
         )
@@ -67,6 +79,21 @@ class Params(BaseParams):
         self.metadata_hash: str = self._ensure("metadata_hash", kwargs, str)
         self.task_mutable_params = MutableParams()
         self.manual_gas_limit = self._ensure_get("manual_gas_limit", kwargs, int)
+        self.delivery_gas_ceiling: int = self._ensure(
+            "delivery_gas_ceiling", kwargs, int
+        )
+        enforce(
+            self.delivery_gas_ceiling <= self.manual_gas_limit,
+            "`delivery_gas_ceiling` cannot be greater than `manual_gas_limit`.",
+        )
+        self.deliver_base_gas: int = self._ensure("deliver_base_gas", kwargs, int)
+        # the chain of the ledger is used if it is not set, otherwise it must match it
+        self.safe_chain_id: Optional[int] = self._ensure_get(
+            "safe_chain_id", kwargs, Optional[int]
+        )
+        self.usage_snapshot_interval: int = self._ensure(
+            "usage_snapshot_interval", kwargs, int
+        )
         self.service_owner_share = self._ensure("service_owner_share", kwargs, float)
         self.profit_split_freq = self._ensure("profit_split_freq", kwargs, int)
         mech_to_config_dict: Dict[str, Dict[str, bool]] = self._ensure_get(
@@ -33,6 +33,7 @@ from packages.valory.skills.abstract_round_abci.base import (
     EventToTimeout,
     get_name,
 )
+from packages.valory.skills.task_submission_abci.batching import plan_delivery_batch
 from packages.valory.skills.task_submission_abci.payloads import (
     TaskPoolingPayload,
     TransactionPayload,
@@ -110,13 +111,24 @@ class TaskPoolingRound(CollectionRound):
                     unique_ids.add(request_id)
                     unique_objects.append(obj)
 
-            unique_done_tasks = sorted(unique_objects, key=lambda x: x["request_id"])
+            # deliver the oldest tasks first, as many as fit under the gas ceiling
+            # the deferred tasks stay in the local queues and get pooled again next period
+            unique_done_tasks, deferred_tasks = plan_delivery_batch(
+                unique_objects,
+                self.context.params.delivery_gas_ceiling,
+                self.context.params.deliver_base_gas,
+            )
+            if len(deferred_tasks) > 0:
+                self.context.logger.info(
+                    f"Deferring {len(deferred_tasks)} tasks to the next period, "
+                    f"the gas ceiling was reached with {len(unique_done_tasks)} tasks."
+                )
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=SynchronizedData,
                 **{
                     get_name(SynchronizedData.done_tasks): unique_done_tasks,
                     get_name(SynchronizedData.final_tx_hash): None,
-                }
+                },
             )
             if len(unique_done_tasks) > 0:
                 return synchronized_data, Event.DONE
@@ -144,7 +156,7 @@ class TransactionPreparationRound(CollectSameUntilThresholdRound):
                         synchronized_data_class=SynchronizedData,
                         **{
                             get_name(SynchronizedData.done_tasks): [],
-                        }
+                        },
                     ),
                     Event.ERROR,
                 )
@@ -155,7 +167,7 @@ class TransactionPreparationRound(CollectSameUntilThresholdRound):
                     get_name(
                         SynchronizedData.most_voted_tx_hash
                     ): self.most_voted_payload,
-                }
+                },
             )
             return state, Event.DONE
         if not self.is_majority_possible(
@@ -167,7 +179,7 @@ class TransactionPreparationRound(CollectSameUntilThresholdRound):
                     synchronized_data_class=SynchronizedData,
                     **{
                         get_name(SynchronizedData.done_tasks): [],
-                    }
+                    },
                 ),
                 Event.NO_MAJORITY,
             )
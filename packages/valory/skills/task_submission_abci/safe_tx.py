@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the local encoding of MultiSend payloads and Safe tx hashes."""
+from typing import Any, Dict, List, Union
+
+from eth_abi import encode
+from eth_utils import keccak
+
+
+NULL_ADDRESS = "0x0000000000000000000000000000000000000000"
+MULTISEND_SELECTOR = keccak(text="multiSend(bytes)")[:4]
+# EIP-712 domain of the Safe contracts, starting from v1.3.0
+DOMAIN_SEPARATOR_TYPEHASH = keccak(
+    text="EIP712Domain(uint256 chainId,address verifyingContract)"
+)
+SAFE_TX_TYPEHASH = keccak(
+    text="SafeTx(address to,uint256 value,bytes data,uint8 operation,uint256 safeTxGas,"
+    "uint256 baseGas,uint256 gasPrice,address gasToken,address refundReceiver,uint256 nonce)"
+)
+
+
+def to_bytes(data: Union[bytes, str, None]) -> bytes:
+    """Convert tx data, given either as bytes or as a hex string, to bytes."""
+    if data is None:
+        return b""
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    return bytes(data)
+
+
+def encode_multisend_data(multi_send_txs: List[Dict[str, Any]]) -> bytes:
+    """
+    Encode the call of `multiSend` for the given txs.
+
+    Each tx is packed as `operation (uint8) | to (address) | value (uint256) | data length (uint256) | data`,
+    which is the layout that the MultiSend contract expects.
+
+    :param multi_send_txs: the txs to send, with the keys `operation`, `to`, `value` and `data`.
+    :return: the calldata of the multisend tx.
+    """
+    packed_txs = b""
+    for tx in multi_send_txs:
+        operation = getattr(tx["operation"], "value", tx["operation"])
+        data = to_bytes(tx.get("data", b""))
+        packed_txs += (
+            int(operation).to_bytes(1, "big")
+            + to_bytes(tx["to"])
+            + int(tx["value"]).to_bytes(32, "big")
+            + len(data).to_bytes(32, "big")
+            + data
+        )
+    return MULTISEND_SELECTOR + encode(["bytes"], [packed_txs])
+
+
+def get_domain_separator(chain_id: int, safe_address: str) -> bytes:
+    """Get the EIP-712 domain separator of a safe."""
+    return keccak(
+        encode(
+            ["bytes32", "uint256", "address"],
+            [DOMAIN_SEPARATOR_TYPEHASH, chain_id, safe_address],
+        )
+    )
+
+
+def get_safe_tx_hash(  # pylint: disable=too-many-arguments
+    chain_id: int,
+    safe_address: str,
+    to_address: str,
+    value: int,
+    data: bytes,
+    operation: int,
+    safe_tx_gas: int,
+    nonce: int,
+    base_gas: int = 0,
+    gas_price: int = 0,
+    gas_token: str = NULL_ADDRESS,
+    refund_receiver: str = NULL_ADDRESS,
+) -> str:
+    """
+    Get the hash of a safe tx, as computed by `getTransactionHash` of the Safe contract.
+
+    :param chain_id: the id of the chain the safe is deployed on.
+    :param safe_address: the address of the safe.
+    :param to_address: the tx receiver.
+    :param value: the value of the tx.
+    :param data: the data of the tx.
+    :param operation: the safe operation.
+    :param safe_tx_gas: the gas that should be used for the safe tx.
+    :param nonce: the nonce of the safe.
+    :param base_gas: the gas costs for the data used to trigger the safe tx.
+    :param gas_price: the gas price used for the refund.
+    :param gas_token: the token used for the refund.
+    :param refund_receiver: the address of the refund receiver.
+    :return: the hex representation of the safe tx hash, without the "0x" prefix.
+    """
+    safe_tx_struct_hash = keccak(
+        encode(
+            [
+                "bytes32",
+                "address",
+                "uint256",
+                "bytes32",
+                "uint8",
+                "uint256",
+                "uint256",
+                "uint256",
+                "address",
+                "address",
+                "uint256",
+            ],
+            [
+                SAFE_TX_TYPEHASH,
+                to_address,
+                value,
+                keccak(data),
+                operation,
+                safe_tx_gas,
+                base_gas,
+                gas_price,
+                gas_token,
+                refund_receiver,
+                nonce,
+            ],
+        )
+    )
+    domain_separator = get_domain_separator(chain_id, safe_address)
+    return keccak(b"\x19\x01" + domain_separator + safe_tx_struct_hash).hex()
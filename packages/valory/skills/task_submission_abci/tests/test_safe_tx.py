@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the local encoding of MultiSend payloads and Safe tx hashes."""
+
+from enum import Enum
+
+from packages.valory.skills.task_submission_abci.safe_tx import (
+    encode_multisend_data,
+    get_safe_tx_hash,
+)
+
+
+SAFE_ADDRESS = "0x1234567890123456789012345678901234567890"
+MULTISEND_ADDRESS = "0xA238CBeb142c10Ef7Ad8442C6D1f9E89e07e7761"
+FIRST_RECEIVER = "0x1111111111111111111111111111111111111111"
+SECOND_RECEIVER = "0x2222222222222222222222222222222222222222"
+SAFE_TX_DATA = bytes.fromhex("8d80ff0a00000000")
+
+# the calldata of `multiSend` for a call with a value of 1 and the data 0xabcd,
+# and a delegate call without a value or data, as packed by the MultiSend contract
+MULTISEND_DATA = (
+    "8d80ff0a"
+    "0000000000000000000000000000000000000000000000000000000000000020"
+    "00000000000000000000000000000000000000000000000000000000000000ac"
+    "00"
+    "1111111111111111111111111111111111111111"
+    "0000000000000000000000000000000000000000000000000000000000000001"
+    "0000000000000000000000000000000000000000000000000000000000000002"
+    "abcd"
+    "01"
+    "2222222222222222222222222222222222222222"
+    "0000000000000000000000000000000000000000000000000000000000000000"
+    "0000000000000000000000000000000000000000000000000000000000000000"
+    "0000000000000000000000000000000000000000"
+)
+# the EIP-712 hashes of a delegate call of the safe to the multisend contract, with the nonce 7
+SAFE_TX_HASH_GNOSIS = "e1b67d69164145af9b94542656d3dbd1dc987e2303b0111fd44bd81ab8c1bc89"
+SAFE_TX_HASH_ETHEREUM = (
+    "e64c9bb964142f736182a028d337d478f10033e2749f3de01bc74884ee9ced7a"
+)
+
+
+class SafeOperation(Enum):
+    """The operations of a safe tx."""
+
+    CALL = 0
+    DELEGATE_CALL = 1
+
+
+def test_encode_multisend_data() -> None:
+    """Test that the txs are packed as the MultiSend contract expects."""
+    multisend_data = encode_multisend_data(
+        [
+            {
+                "operation": SafeOperation.CALL,
+                "to": FIRST_RECEIVER,
+                "value": 1,
+                "data": "0xabcd",
+            },
+            {
+                "operation": SafeOperation.DELEGATE_CALL.value,
+                "to": SECOND_RECEIVER,
+                "value": 0,
+                "data": b"",
+            },
+        ]
+    )
+    assert multisend_data.hex() == MULTISEND_DATA
+
+
+def test_encode_multisend_data_without_txs() -> None:
+    """Test the encoding of an empty multisend."""
+    multisend_data = encode_multisend_data([])
+    assert multisend_data.hex() == "8d80ff0a" + f"{32:064x}" + f"{0:064x}"
+
+
+def test_get_safe_tx_hash() -> None:
+    """Test that the safe tx hash is the EIP-712 hash that the safe expects."""
+    safe_tx_hash = get_safe_tx_hash(
+        chain_id=100,
+        safe_address=SAFE_ADDRESS,
+        to_address=MULTISEND_ADDRESS,
+        value=0,
+        data=SAFE_TX_DATA,
+        operation=SafeOperation.DELEGATE_CALL.value,
+        safe_tx_gas=0,
+        nonce=7,
+    )
+    assert safe_tx_hash == SAFE_TX_HASH_GNOSIS
+
+
+def test_get_safe_tx_hash_depends_on_chain() -> None:
+    """Test that the same safe tx has a different hash on another chain."""
+    safe_tx_hash = get_safe_tx_hash(
+        chain_id=1,
+        safe_address=SAFE_ADDRESS,
+        to_address=MULTISEND_ADDRESS,
+        value=0,
+        data=SAFE_TX_DATA,
+        operation=SafeOperation.DELEGATE_CALL.value,
+        safe_tx_gas=0,
+        nonce=7,
+    )
+    assert safe_tx_hash == SAFE_TX_HASH_ETHEREUM
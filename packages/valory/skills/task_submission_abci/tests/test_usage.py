@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the usage checkpoints, and the reconstruction of their totals."""
+
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from packages.valory.skills.task_submission_abci.usage import (
+    NUM_DELTAS_KEY,
+    USAGE_KEY,
+    ZERO_IPFS_HASH,
+    add_usage,
+    build_usage_delta,
+    count_usage,
+    get_delta_increments,
+    get_previous_hash,
+    is_usage_delta,
+    merge_usage,
+    walk_usage_log,
+)
+
+
+AGENT = "0x1111111111111111111111111111111111111111"
+OTHER_AGENT = "0x2222222222222222222222222222222222222222"
+
+SNAPSHOT = {AGENT: {"tool_a": 3}}
+FIRST_DELTA = build_usage_delta("snapshot", {AGENT: {"tool_a": 1, "tool_b": 2}})
+SECOND_DELTA = build_usage_delta("first", {OTHER_AGENT: {"tool_a": 5}})
+# the log of the checkpoints by hash, from the latest to the snapshot
+USAGE_LOG = {"second": SECOND_DELTA, "first": FIRST_DELTA, "snapshot": SNAPSHOT}
+TOTALS = {AGENT: {"tool_a": 4, "tool_b": 2}, OTHER_AGENT: {"tool_a": 5}}
+
+
+class Downloader:
+    """Downloads the checkpoints of a log, and records the downloads."""
+
+    def __init__(self, usage_log: Dict[str, Dict[str, Any]]) -> None:
+        """Initialize the downloader."""
+        self.usage_log = usage_log
+        self.downloads: List[str] = []
+
+    def download(
+        self, checkpoint_hash: str
+    ) -> Generator[None, None, Optional[Dict[str, Any]]]:
+        """Download a checkpoint, as the behaviours do from IPFS."""
+        yield
+        self.downloads.append(checkpoint_hash)
+        return self.usage_log.get(checkpoint_hash, None)
+
+
+def run(generator: Generator[None, None, Any]) -> Any:
+    """Run a generator to its end, and return its result."""
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def walk(
+    downloader: Downloader,
+    usage_by_hash: Optional[Dict[str, Dict[str, Any]]] = None,
+    usage_doc_by_hash: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_downloads: Optional[int] = None,
+    checkpoint_hash: str = "second",
+) -> Optional[Tuple[Dict[str, Any], int]]:
+    """Walk the log of the downloader back from a checkpoint."""
+    return run(
+        walk_usage_log(
+            checkpoint_hash,
+            {} if usage_by_hash is None else usage_by_hash,
+            {} if usage_doc_by_hash is None else usage_doc_by_hash,
+            downloader.download,
+            max_downloads,
+        )
+    )
+
+
+def test_count_usage() -> None:
+    """Test that the usage of the done tasks is counted by agent and tool."""
+    done_tasks = [
+        {"task_executor_address": AGENT, "tool": "tool_a"},
+        {"task_executor_address": AGENT, "tool": "tool_a"},
+        {"task_executor_address": OTHER_AGENT, "tool": "tool_b"},
+    ]
+    assert count_usage(done_tasks) == {
+        AGENT: {"tool_a": 2},
+        OTHER_AGENT: {"tool_b": 1},
+    }
+    usage = {AGENT: {"tool_a": 1}}
+    assert add_usage(usage, done_tasks) is usage
+    assert usage == {AGENT: {"tool_a": 3}, OTHER_AGENT: {"tool_b": 1}}
+
+
+def test_merge_usage() -> None:
+    """Test that the increments of a delta are added to the usage, in place."""
+    usage = {AGENT: {"tool_a": 3}}
+    assert merge_usage(usage, get_delta_increments(FIRST_DELTA)) is usage
+    assert usage == {AGENT: {"tool_a": 4, "tool_b": 2}}
+
+
+def test_usage_delta() -> None:
+    """Test the format of the deltas, and that the snapshots are told apart from them."""
+    assert FIRST_DELTA == {
+        "type": "usage_delta",
+        "previous": "snapshot",
+        "usage": {AGENT: {"tool_a": 1, "tool_b": 2}},
+    }
+    assert is_usage_delta(FIRST_DELTA)
+    assert get_previous_hash(FIRST_DELTA) == "snapshot"
+    assert not is_usage_delta(SNAPSHOT)
+    assert get_previous_hash(SNAPSHOT) is None
+
+
+def test_walk_usage_log() -> None:
+    """Test that the deltas are applied on top of the latest snapshot."""
+    downloader = Downloader(USAGE_LOG)
+    usage_doc_by_hash: Dict[str, Dict[str, Any]] = {}
+    assert walk(downloader, usage_doc_by_hash=usage_doc_by_hash) == (TOTALS, 2)
+    assert downloader.downloads == ["second", "first", "snapshot"]
+    assert usage_doc_by_hash == USAGE_LOG
+    # the checkpoints are not modified
+    assert SNAPSHOT == {AGENT: {"tool_a": 3}}
+
+
+def test_walk_usage_log_from_the_start() -> None:
+    """Test that the log starts from the zero hash, with no usage."""
+    downloader = Downloader({"first": build_usage_delta(ZERO_IPFS_HASH, SNAPSHOT)})
+    assert walk(downloader, checkpoint_hash="first") == (SNAPSHOT, 1)
+    assert walk(downloader, checkpoint_hash=ZERO_IPFS_HASH) == ({}, 0)
+
+
+def test_walk_usage_log_stops_at_cached_totals() -> None:
+    """Test that the walk stops at a checkpoint whose totals are cached."""
+    downloader = Downloader(USAGE_LOG)
+    usage_by_hash = {
+        "first": {USAGE_KEY: {AGENT: {"tool_a": 4, "tool_b": 2}}, NUM_DELTAS_KEY: 1}
+    }
+    assert walk(downloader, usage_by_hash=usage_by_hash) == (TOTALS, 2)
+    assert downloader.downloads == ["second"]
+    # the cached totals are not modified
+    assert usage_by_hash["first"][USAGE_KEY] == {AGENT: {"tool_a": 4, "tool_b": 2}}
+
+
+def test_walk_usage_log_resumes() -> None:
+    """Test that a walk which reaches the maximum downloads resumes from the downloaded checkpoints."""
+    downloader = Downloader(USAGE_LOG)
+    usage_doc_by_hash: Dict[str, Dict[str, Any]] = {}
+    assert (
+        walk(downloader, usage_doc_by_hash=usage_doc_by_hash, max_downloads=2) is None
+    )
+    assert downloader.downloads == ["second", "first"]
+    assert walk(downloader, usage_doc_by_hash=usage_doc_by_hash, max_downloads=2) == (
+        TOTALS,
+        2,
+    )
+    assert downloader.downloads == ["second", "first", "snapshot"]
+
+
+def test_walk_usage_log_with_missing_checkpoint() -> None:
+    """Test that the walk fails if a checkpoint cannot be downloaded."""
+    downloader = Downloader({"second": SECOND_DELTA})
+    assert walk(downloader) is None
+    assert downloader.downloads == ["second", "first"]
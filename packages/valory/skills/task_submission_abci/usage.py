@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the format of the usage checkpoints.
+
+The usage is checkpointed as a log. Every checkpoint is one of:
+- a snapshot, which is the full `{agent: {tool: count}}` usage (the format that was always used), or
+- a delta, which references the previous checkpoint and carries only the increments of its period.
+
+The totals of a checkpoint are the totals of the latest snapshot plus all the deltas after it.
+"""
+from copy import deepcopy
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+
+USAGE_DELTA_TYPE = "usage_delta"
+TYPE_KEY = "type"
+PREVIOUS_KEY = "previous"
+USAGE_KEY = "usage"
+NUM_DELTAS_KEY = "num_deltas"
+# the checkpoint hash before the first checkpoint
+ZERO_IPFS_HASH = (
+    "f017012200000000000000000000000000000000000000000000000000000000000000000"
+)
+
+
+def count_usage(done_tasks: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Count the usage of the tools by agent for the given done tasks."""
+    return add_usage({}, done_tasks)
+
+
+def add_usage(
+    usage: Dict[str, Dict[str, int]], done_tasks: List[Dict[str, Any]]
+) -> Dict[str, Dict[str, int]]:
+    """Add the usage of the given done tasks to the provided usage, in place."""
+    for task in done_tasks:
+        agent, tool = task["task_executor_address"], task["tool"]
+        if agent not in usage:
+            usage[agent] = {}
+        if tool not in usage[agent]:
+            usage[agent][tool] = 0
+        usage[agent][tool] += 1
+    return usage
+
+
+def merge_usage(
+    usage: Dict[str, Dict[str, int]], increments: Dict[str, Dict[str, int]]
+) -> Dict[str, Dict[str, int]]:
+    """Merge the increments of a delta into the provided usage, in place."""
+    for agent, tool_usage in increments.items():
+        agent_usage = usage.setdefault(agent, {})
+        for tool, count in tool_usage.items():
+            agent_usage[tool] = agent_usage.get(tool, 0) + count
+    return usage
+
+
+def build_usage_delta(
+    previous_hash: str, increments: Dict[str, Dict[str, int]]
+) -> Dict[str, Any]:
+    """Build a delta checkpoint on top of the previous checkpoint."""
+    return {
+        TYPE_KEY: USAGE_DELTA_TYPE,
+        PREVIOUS_KEY: previous_hash,
+        USAGE_KEY: increments,
+    }
+
+
+def is_usage_delta(usage_doc: Dict[str, Any]) -> bool:
+    """Check whether a usage checkpoint is a delta or a snapshot."""
+    return usage_doc.get(TYPE_KEY, None) == USAGE_DELTA_TYPE
+
+
+def get_previous_hash(usage_doc: Dict[str, Any]) -> Optional[str]:
+    """Get the checkpoint hash a delta builds on."""
+    return usage_doc.get(PREVIOUS_KEY, None)
+
+
+def get_delta_increments(usage_doc: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Get the increments carried by a delta."""
+    return usage_doc.get(USAGE_KEY, {})
+
+
+def walk_usage_log(
+    checkpoint_hash: str,
+    usage_by_hash: Dict[str, Dict[str, Any]],
+    usage_doc_by_hash: Dict[str, Dict[str, Any]],
+    download: Callable[[str], Generator[None, None, Optional[Dict[str, Any]]]],
+    max_downloads: Optional[int] = None,
+) -> Generator[None, None, Optional[Tuple[Dict[str, Any], int]]]:
+    """
+    Reconstruct the usage totals of a checkpoint.
+
+    The log is walked back from the checkpoint until a snapshot, or a checkpoint whose totals are cached,
+    and the deltas after it are applied, oldest first.
+    The downloaded checkpoints are kept, so that an interrupted walk resumes from them.
+
+    :param checkpoint_hash: the hash of the checkpoint, as stored on-chain.
+    :param usage_by_hash: the cached totals, along with the number of deltas since the latest snapshot, by checkpoint hash.
+    :param usage_doc_by_hash: the downloaded checkpoints, by hash.
+    :param download: downloads a checkpoint by its hash, returns None if it fails.
+    :param max_downloads: the maximum number of checkpoints to download, None for no limit.
+    :return: the usage totals, and the number of deltas since the latest snapshot,
+        or None if a download failed, or the maximum number of downloads was reached.
+    :yield: None
+    """
+    deltas: List[Dict[str, Any]] = []
+    current_hash: Optional[str] = checkpoint_hash
+    num_downloads = 0
+    while True:
+        if current_hash is None or current_hash == ZERO_IPFS_HASH:
+            totals: Dict[str, Any] = {}
+            num_deltas = 0
+            break
+
+        cached = usage_by_hash.get(current_hash, None)
+        if cached is not None:
+            totals = deepcopy(cached[USAGE_KEY])
+            num_deltas = cached[NUM_DELTAS_KEY]
+            break
+
+        usage_doc = usage_doc_by_hash.get(current_hash, None)
+        if usage_doc is None:
+            if max_downloads is not None and num_downloads >= max_downloads:
+                return None
+            num_downloads += 1
+            usage_doc = yield from download(current_hash)
+            if usage_doc is None:
+                return None
+            # the checkpoints are content addressed, so they never change
+            usage_doc_by_hash[current_hash] = usage_doc
+
+        if not is_usage_delta(usage_doc):
+            totals = deepcopy(usage_doc)
+            num_deltas = 0
+            break
+        deltas.append(usage_doc)
+        current_hash = get_previous_hash(usage_doc)
+
+    for delta in reversed(deltas):
+        merge_usage(totals, get_delta_increments(delta))
+        num_deltas += 1
+    return totals, num_deltas
@@ -34,6 +34,7 @@ from packages.valory.connections.websocket_client.connection import (
 )
 from packages.valory.connections.websocket_client.connection import WebSocketClient
 from packages.valory.protocols.websocket_client.message import WebsocketClientMessage
+from packages.valory.skills.websocket_client.buffer import SubscriptionBuffer
 from packages.valory.skills.websocket_client.dialogues import (
     WebsocketClientDialogue,
     WebsocketClientDialogues,
@@ -77,12 +78,19 @@ class SubscriptionBehaviour(SimpleBehaviour):
         )
 
     @property
-    def subscription_data(self) -> List[str]:
-        """Returns subscription status"""
+    def subscription_data(self) -> Optional[SubscriptionBuffer]:
+        """Returns the buffer of the data received from the subscription"""
         return self.context.shared_state.get(WEBSOCKET_SUBSCRIPTIONS, {}).get(
-            self.params.subscription_id, []
+            self.params.subscription_id, None
         )
 
+    def drain_subscription_data(self, max_items: Optional[int] = None) -> List[str]:
+        """Remove and return a batch of the data received from the subscription, the oldest first."""
+        buffer = self.subscription_data
+        if buffer is None:
+            return []
+        return buffer.drain(max_items)
+
     @property
     def subscribed(self) -> bool:
         return (
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the buffer of the data received from a subscription."""
+
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, List, Optional
+
+
+DEFAULT_CAPACITY = 1000
+
+
+class DropPolicy(Enum):
+    """Which data to drop when the buffer is full."""
+
+    OLDEST = "oldest"
+    NEWEST = "newest"
+
+
+class SubscriptionBuffer:
+    """
+    A bounded buffer of the data received from a subscription.
+
+    When the buffer is full, either the oldest data is evicted to make room for the new,
+    or the new data is rejected, depending on the drop policy.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        drop_policy: DropPolicy = DropPolicy.OLDEST,
+    ) -> None:
+        """Initialize the buffer."""
+        if capacity <= 0:
+            raise ValueError(f"The capacity must be positive, got {capacity}.")
+        self._capacity = capacity
+        self._drop_policy = drop_policy
+        self._data: Deque[Any] = deque(maxlen=capacity)
+        self.num_received = 0
+        self.num_dropped = 0
+        self._overflowing = False
+
+    def __len__(self) -> int:
+        """Get the number of the buffered data."""
+        return len(self._data)
+
+    @property
+    def capacity(self) -> int:
+        """Get the capacity of the buffer."""
+        return self._capacity
+
+    @property
+    def is_full(self) -> bool:
+        """Check whether the buffer is full."""
+        return len(self._data) == self._capacity
+
+    def append(self, data: Any) -> bool:
+        """
+        Add data to the buffer.
+
+        :param data: the received data.
+        :return: whether the buffer was full, and data had to be dropped, for the first time since it was last drained.
+        """
+        self.num_received += 1
+        is_full = self.is_full
+        if is_full:
+            self.num_dropped += 1
+        if not is_full or self._drop_policy == DropPolicy.OLDEST:
+            # the deque evicts the oldest data by itself
+            self._data.append(data)
+
+        started_overflowing = is_full and not self._overflowing
+        self._overflowing = self._overflowing or is_full
+        return started_overflowing
+
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        """Remove and return the buffered data, the oldest first, up to `max_items` if provided."""
+        num_items = len(self._data)
+        if max_items is not None:
+            num_items = min(max_items, num_items)
+        batch = [self._data.popleft() for _ in range(num_items)]
+        self._overflowing = False
+        return batch
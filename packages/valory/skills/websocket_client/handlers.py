@@ -29,6 +29,8 @@ from web3 import Web3
 from web3.types import TxReceipt
 from typing import Callable, cast
 from packages.valory.protocols.websocket_client.message import WebsocketClientMessage
+from packages.valory.skills.websocket_client.buffer import SubscriptionBuffer
+from packages.valory.skills.websocket_client.models import Params
 from enum import Enum
 
 JOB_QUEUE = "pending_tasks"
@@ -67,7 +69,8 @@ class WebSocketHandler(Handler):
 
         :param message: the message
         """
-        self.context.logger.info(f"Received message: {message}")
+        # the message is logged in full only when debugging, since it may carry a large payload
+        self.context.logger.debug(f"Received message: {message}")
         handler = cast(
             Callable[[WebsocketClientMessage], None],
             getattr(self, f"handle_{message.performative.value}"),
@@ -92,16 +95,28 @@ class WebSocketHandler(Handler):
 
     def handle_recv(self, message: WebsocketClientMessage) -> None:
         """Handler `WebsocketClientMessage.Performative.RECV` response"""
-        self.context.logger.info(
+        self.context.logger.debug(
             f"Received {message.data} from subscription {message.subscription_id}"
         )
         subscription_id = message.subscription_id
         if subscription_id not in self.context.shared_state[WEBSOCKET_SUBSCRIPTIONS]:
-            self.context.shared_state[WEBSOCKET_SUBSCRIPTIONS][subscription_id] = []
-
-        self.context.shared_state[WEBSOCKET_SUBSCRIPTIONS][subscription_id].append(
-            message.data
+            params = cast(Params, self.context.params)
+            self.context.shared_state[WEBSOCKET_SUBSCRIPTIONS][
+                subscription_id
+            ] = SubscriptionBuffer(
+                capacity=params.subscription_buffer_capacity,
+                drop_policy=params.subscription_buffer_drop_policy,
+            )
+
+        buffer = cast(
+            SubscriptionBuffer,
+            self.context.shared_state[WEBSOCKET_SUBSCRIPTIONS][subscription_id],
         )
+        if buffer.append(message.data):
+            self.context.logger.warning(
+                f"The buffer of subscription {subscription_id} is full, data is being dropped; "
+                f"received: {buffer.num_received}, dropped: {buffer.num_dropped}"
+            )
 
     def handle_error(self, message: WebsocketClientMessage) -> None:
         """Handler `WebsocketClientMessage.Performative.ERROR` response"""
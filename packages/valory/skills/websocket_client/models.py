@@ -22,6 +22,8 @@ from typing import Any
 
 from aea.skills.base import Model
 
+from packages.valory.skills.websocket_client.buffer import DEFAULT_CAPACITY, DropPolicy
+
 DEFAULT_WEBSOCKET_PROVIDER = "ws://localhost:8001"
 DEFAULT_SUBSCRIPTION_ID = "websocket-subscription"
 
@@ -36,4 +38,10 @@ class Params(Model):
             "websocket_provider", DEFAULT_WEBSOCKET_PROVIDER
         )
         self.subscription_id = kwargs.get("subscription_id", DEFAULT_SUBSCRIPTION_ID)
+        self.subscription_buffer_capacity = kwargs.get(
+            "subscription_buffer_capacity", DEFAULT_CAPACITY
+        )
+        self.subscription_buffer_drop_policy = DropPolicy(
+            kwargs.get("subscription_buffer_drop_policy", DropPolicy.OLDEST.value)
+        )
         super().__init__(*args, **kwargs)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""
+This script benchmarks the requests of the http_client connection against a local aiohttp server.
+
+It compares:
+- creating a new session for every request, which is how the connection used to perform the requests, and
+- a single pooled session, which keeps the connections alive, as the connection does now.
+
+Usage: python scripts/benchmark_http_client.py --requests 1000 --concurrency 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+BODY = b"x" * 1024
+
+
+async def _handle(_: web.Request) -> web.Response:
+    """Respond with a fixed body."""
+    return web.Response(body=BODY)
+
+
+async def _request_with_new_session(url: str, _: aiohttp.ClientSession) -> None:
+    """Perform a request with a session that is created for it."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as resp:
+            await resp.read()
+
+
+async def _request_with_pooled_session(
+    url: str, session: aiohttp.ClientSession
+) -> None:
+    """Perform a request with the pooled session."""
+    async with session.get(url) as resp:
+        await resp.read()
+
+
+async def _run(
+    url: str,
+    request: Callable[[str, aiohttp.ClientSession], Awaitable[None]],
+    num_requests: int,
+    concurrency: int,
+) -> List[float]:
+    """Perform the requests, with the given concurrency, and return their latencies."""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=15.0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def _timed() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await request(url, session)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(_timed() for _ in range(num_requests)))
+    return latencies
+
+
+def _report(name: str, latencies: List[float], elapsed: float) -> None:
+    """Print the statistics of a run."""
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<16} {len(latencies) / elapsed:>10.1f} req/s "
+        f"mean {statistics.mean(latencies) * 1000:>7.2f} ms "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms "
+        f"p99 {p99 * 1000:>7.2f} ms"
+    )
+
+
+async def main(num_requests: int, concurrency: int) -> None:
+    """Run the benchmark."""
+    app = web.Application()
+    app.router.add_get("/", _handle)
+    server = TestServer(app)
+    await server.start_server()
+    url = str(server.make_url("/"))
+    try:
+        for name, request in (
+            ("new session", _request_with_new_session),
+            ("pooled session", _request_with_pooled_session),
+        ):
+            start = time.perf_counter()
+            latencies = await _run(url, request, num_requests, concurrency)
+            _report(name, latencies, time.perf_counter() - start)
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))